@@ -0,0 +1,46 @@
+# Lockam - PC Intrusion Detection & Auto-Lock Software
+# benchmarks/bench_auth.py
+# Password hashing and UserManager hot paths (unlock, setup, export)
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+from lockam.core import utils
+from lockam.core.user_manager import UserManager
+
+from .harness import benchmark
+
+PASSWORD = "Correct-Horse-9"
+
+
+@benchmark("auth.hash_password", max_number=20)
+def hash_password(tmp):
+    yield lambda: utils.hash_password(PASSWORD)
+
+
+@benchmark("auth.verify_password", max_number=20)
+def verify_password(tmp):
+    stored = utils.hash_password(PASSWORD)
+    yield lambda: utils.verify_password(PASSWORD, stored)
+
+
+@benchmark("user_manager.authenticate", max_number=20)
+def authenticate(tmp):
+    um = UserManager(tmp / "lockam.db")
+    um.save_user("admin", PASSWORD)
+    yield lambda: um.authenticate(PASSWORD)
+    um.close()
+
+
+@benchmark("user_manager.save_user", max_number=20)
+def save_user(tmp):
+    um = UserManager(tmp / "lockam.db")
+    yield lambda: um.save_user("admin", PASSWORD)
+    um.close()
+
+
+@benchmark("user_manager.export_user_info")
+def export_user_info(tmp):
+    um = UserManager(tmp / "lockam.db")
+    um.save_user("admin", PASSWORD)
+    yield um.export_user_info
+    um.close()
@@ -0,0 +1,105 @@
+# Lockam - PC Intrusion Detection & Auto-Lock Software
+# benchmarks/bench_journal.py
+# Event journal throughput: group commit vs. one commit per event
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+'''
+# Usage: python -m benchmarks.bench_journal [--events N] [--threads T]
+# Reports how long record() blocks the caller (what the detection loop pays)
+# and sustained write throughput, next to a naive insert-and-commit baseline.
+# The suite (python -m benchmarks.suite) runs the journal.record_1k case.
+'''
+
+import argparse
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from lockam.core.db import ConnectionManager
+from lockam.core.journal import EventJournal
+
+from .harness import benchmark
+
+
+def bench_journal(db_path: Path, events: int, threads: int) -> dict:
+    db = ConnectionManager(db_path)
+    journal = EventJournal(db)
+    journal.start()
+    per_thread = events // threads
+    record_times = []
+
+    def produce():
+        start = time.perf_counter()
+        for i in range(per_thread):
+            journal.record("face.unknown", {"frame": i, "score": 0.42}, source="bench")
+        record_times.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    workers = [threading.Thread(target=produce) for _ in range(threads)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    journal.flush()
+    elapsed = time.perf_counter() - start
+
+    result = {
+        "events": per_thread * threads,
+        "events_per_sec": per_thread * threads / elapsed,
+        "record_us": max(record_times) / per_thread * 1e6,
+        "batches": journal.batches_written,
+    }
+    journal.close()
+    db.close()
+    return result
+
+
+def bench_naive(db_path: Path, events: int) -> dict:
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE events (id INTEGER PRIMARY KEY, ts REAL, kind TEXT, source TEXT, details TEXT)")
+    start = time.perf_counter()
+    for i in range(events):
+        conn.execute("INSERT INTO events (ts, kind, source, details) VALUES (?, ?, ?, ?)",
+                     (time.time(), "face.unknown", "bench", '{"frame": %d}' % i))
+        conn.commit()
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return {"events": events, "events_per_sec": events / elapsed, "record_us": elapsed / events * 1e6}
+
+
+@benchmark("journal.record_1k")
+def record_1k(tmp):
+    db = ConnectionManager(tmp / "journal.db")
+    journal = EventJournal(db)
+
+    def run():
+        for i in range(1000):
+            journal.record("face.unknown", {"frame": i}, source="bench")
+        journal.flush()
+    yield run
+    journal.close()
+    db.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = bench_journal(Path(tmp) / "journal.db", args.events, args.threads)
+        naive = bench_naive(Path(tmp) / "naive.db", min(args.events, 2000))
+
+    print(f"group commit : {journal['events_per_sec']:>10.0f} events/s, "
+          f"record() {journal['record_us']:.1f} us/event, {journal['batches']} batches")
+    print(f"commit/event : {naive['events_per_sec']:>10.0f} events/s, "
+          f"record() {naive['record_us']:.1f} us/event")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+# Lockam - PC Intrusion Detection & Auto-Lock Software
+# benchmarks/bench_metrics.py
+# Cost of instrumentation with metrics disabled vs. enabled
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+from lockam.core.metrics import MetricsRegistry, instrument
+
+from .harness import benchmark
+
+CALLS = 10_000
+
+
+def _noop():
+    return None
+
+
+def _instrumented(enabled):
+    registry = MetricsRegistry(enabled=enabled)
+    fn = instrument("bench", registry)(_noop)
+    counter = registry.counter("bench_total")
+
+    def run():
+        for _ in range(CALLS):
+            fn()
+            counter.inc()
+    return run
+
+
+@benchmark("metrics.baseline_10k")
+def baseline(tmp):
+    def run():
+        for _ in range(CALLS):
+            _noop()
+    yield run
+
+
+@benchmark("metrics.disabled_10k")
+def disabled(tmp):
+    yield _instrumented(False)
+
+
+@benchmark("metrics.enabled_10k")
+def enabled(tmp):
+    yield _instrumented(True)
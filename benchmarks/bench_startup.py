@@ -0,0 +1,25 @@
+# Lockam - PC Intrusion Detection & Auto-Lock Software
+# benchmarks/bench_startup.py
+# create_app() cold start in a fresh interpreter
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+import subprocess
+import sys
+from pathlib import Path
+
+from .harness import benchmark
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@benchmark("startup.python_baseline", max_number=10)
+def python_baseline(tmp):
+    # interpreter start-up alone, to subtract from the cold start below
+    yield lambda: subprocess.run([sys.executable, "-c", "pass"], cwd=ROOT, check=True)
+
+
+@benchmark("startup.create_app_cold", max_number=10)
+def create_app_cold(tmp):
+    cmd = [sys.executable, "-c", "import lockam; lockam.create_app()"]
+    yield lambda: subprocess.run(cmd, cwd=ROOT, check=True)
@@ -0,0 +1,52 @@
+# Lockam - PC Intrusion Detection & Auto-Lock Software
+# benchmarks/bench_validation.py
+# Wizard input validation and country lookups
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+import datetime
+
+from lockam.core import countries
+from lockam.core.validators import validate_inputs, validate_many
+
+from .harness import benchmark
+
+BATCH = 10_000
+
+
+def _records(n):
+    for i in range(n):
+        yield {
+            "fullname": f"User Number {i}",
+            "email": f"user{i}@example.com" if i % 10 else f"broken{i}@",
+            "username": f"user_{i}",
+            "password": "Secret123!",
+            "dob": datetime.date(1990, 1, 1),
+        }
+
+
+@benchmark("validators.validate_inputs_10k", max_number=5)
+def validate_inputs_batch(tmp):
+    records = list(_records(BATCH))
+
+    def run():
+        for r in records:
+            validate_inputs(r["fullname"], r["email"], r["username"], r["password"], r["dob"])
+    yield run
+
+
+@benchmark("validators.validate_many_10k", max_number=5)
+def validate_many_batch(tmp):
+    records = list(_records(BATCH))
+    yield lambda: sum(1 for ok, _ in validate_many(records) if ok)
+
+
+@benchmark("countries.get_country_code")
+def country_code(tmp):
+    names = countries.get_country_list()
+    yield lambda: [countries.get_country_code(name) for name in names]
+
+
+@benchmark("countries.search_countries")
+def search(tmp):
+    yield lambda: [countries.search_countries(prefix) for prefix in ("a", "Ni", "united", "zz")]
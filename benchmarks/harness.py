@@ -0,0 +1,152 @@
+# Lockam - PC Intrusion Detection & Auto-Lock Software
+# benchmarks/harness.py
+# Benchmark registry, timing loop, JSON results and baseline comparison
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+'''
+# A benchmark is a generator function registered with @benchmark(name). It gets
+# a fresh temp directory, does its setup, yields the operation to time (a
+# no-argument callable) and cleans up after the yield:
+#
+#     @benchmark("auth.verify_password")
+#     def verify(tmp):
+#         stored = hash_password("pw")
+#         yield lambda: verify_password("pw", stored)
+#
+# Each operation is auto-ranged like timeit (number of calls grows until one
+# repeat takes min_time), repeated `repeat` times, and the median per-call
+# time is what gets compared against a baseline.
+'''
+
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCHMARKS = {}
+
+MIN_TIME = 0.2      # seconds one repeat should take (auto-ranged)
+REPEAT = 5
+THRESHOLD = 0.15    # median slower than baseline by more than this is a regression
+
+
+def benchmark(name: str, max_number: int | None = None):
+    """Register a setup-yield-teardown generator as benchmark `name`."""
+    def register(fn):
+        if name in BENCHMARKS:
+            raise ValueError(f"Duplicate benchmark name: {name}")
+        BENCHMARKS[name] = (fn, max_number)
+        return fn
+    return register
+
+
+def _autorange(op, min_time: float, max_number: int | None) -> int:
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            op()
+        if time.perf_counter() - start >= min_time or (max_number and number >= max_number):
+            return number
+        number *= 2
+        if max_number:
+            number = min(number, max_number)
+
+
+def run_one(name: str, min_time: float = MIN_TIME, repeat: int = REPEAT) -> dict:
+    fn, max_number = BENCHMARKS[name]
+    with tempfile.TemporaryDirectory(prefix="lockam-bench-") as tmp:
+        gen = fn(Path(tmp))
+        op = next(gen)
+        try:
+            number = _autorange(op, min_time, max_number)
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                for _ in range(number):
+                    op()
+                timings.append((time.perf_counter() - start) / number)
+        finally:
+            gen.close()  # runs the code after `yield`
+    median = statistics.median(timings)
+    return {
+        "median_s": median,
+        "min_s": min(timings),
+        "stdev_s": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        "ops_per_sec": 1.0 / median if median else float("inf"),
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def run_all(pattern: str | None = None, min_time: float = MIN_TIME, repeat: int = REPEAT, progress=None) -> dict:
+    """Run every registered benchmark whose name contains pattern."""
+    results = {}
+    for name in sorted(BENCHMARKS):
+        if pattern and pattern not in name:
+            continue
+        results[name] = run_one(name, min_time, repeat)
+        if progress:
+            progress(name, results[name])
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "timestamp": time.time(),
+            "argv": sys.argv[1:],
+        },
+        "results": results,
+    }
+
+
+def save(report: dict, path: Path):
+    Path(path).write_text(json.dumps(report, indent=2, sort_keys=True))
+
+
+def load(path: Path) -> dict:
+    return json.loads(Path(path).read_text())
+
+
+def compare(current: dict, baseline: dict, threshold: float = THRESHOLD) -> list:
+    """
+    Compare median per-call times. Returns one dict per benchmark with
+    status "regression", "improvement", "ok", "new" (no baseline) or
+    "missing" (in the baseline only). ratio is current / baseline.
+    """
+    cur, base = current["results"], baseline["results"]
+    rows = []
+    for name in sorted(set(cur) | set(base)):
+        if name not in base:
+            rows.append({"name": name, "status": "new", "current_s": cur[name]["median_s"]})
+            continue
+        if name not in cur:
+            rows.append({"name": name, "status": "missing", "baseline_s": base[name]["median_s"]})
+            continue
+        ratio = cur[name]["median_s"] / base[name]["median_s"] if base[name]["median_s"] else float("inf")
+        if ratio > 1 + threshold:
+            status = "regression"
+        elif ratio < 1 - threshold:
+            status = "improvement"
+        else:
+            status = "ok"
+        rows.append({
+            "name": name,
+            "status": status,
+            "ratio": ratio,
+            "current_s": cur[name]["median_s"],
+            "baseline_s": base[name]["median_s"],
+        })
+    return rows
+
+
+def format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e3), ("us", 1e6)):
+        if seconds * scale >= 1:
+            return f"{seconds * scale:.2f} {unit}"
+    return f"{seconds * 1e9:.0f} ns"
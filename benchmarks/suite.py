@@ -0,0 +1,80 @@
+# Lockam - PC Intrusion Detection & Auto-Lock Software
+# benchmarks/suite.py
+# Run all benchmarks, write JSON results, compare against a baseline
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+'''
+# Usage:
+#   python -m benchmarks.suite                              # run everything, print a table
+#   python -m benchmarks.suite -k auth --json out.json      # subset, machine-readable output
+#   python -m benchmarks.suite --save-baseline base.json    # record a baseline
+#   python -m benchmarks.suite --compare base.json          # exit 1 on regressions
+# Timings are only comparable on the same machine and Python build.
+'''
+
+import argparse
+import importlib
+import sys
+
+from . import harness
+
+MODULES = ("bench_auth", "bench_journal", "bench_metrics", "bench_startup", "bench_validation")
+
+
+def load_benchmarks():
+    for module in MODULES:
+        importlib.import_module(f"{__package__}.{module}")
+
+
+def print_results(report):
+    for name, r in report["results"].items():
+        print(f"{name:<36} {harness.format_time(r['median_s']):>12}  (min {harness.format_time(r['min_s'])}, "
+              f"{r['number']} x {r['repeat']})")
+
+
+def print_comparison(rows, threshold):
+    print(f"\nAgainst baseline (threshold {threshold:.0%}):")
+    for row in rows:
+        if "ratio" in row:
+            detail = (f"{harness.format_time(row['baseline_s'])} -> {harness.format_time(row['current_s'])} "
+                      f"({row['ratio'] - 1:+.1%})")
+        else:
+            detail = ""
+        print(f"  {row['status'].upper():<12} {row['name']:<36} {detail}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Lockam benchmark suite")
+    parser.add_argument("-k", dest="pattern", help="only run benchmarks whose name contains this")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--save-baseline", help="write results as a baseline file")
+    parser.add_argument("--compare", help="baseline file to compare against")
+    parser.add_argument("--threshold", type=float, default=harness.THRESHOLD)
+    parser.add_argument("--repeat", type=int, default=harness.REPEAT)
+    parser.add_argument("--min-time", type=float, default=harness.MIN_TIME)
+    parser.add_argument("--quick", action="store_true", help="short runs for smoke testing")
+    args = parser.parse_args(argv)
+    if args.quick:
+        args.repeat, args.min_time = 3, 0.02
+
+    load_benchmarks()
+    report = harness.run_all(
+        args.pattern, args.min_time, args.repeat,
+        progress=lambda name, r: print(f"  {name} ... {harness.format_time(r['median_s'])}", file=sys.stderr),
+    )
+    print_results(report)
+    for path in (args.json, args.save_baseline):
+        if path:
+            harness.save(report, path)
+
+    if args.compare:
+        rows = harness.compare(report, harness.load(args.compare), args.threshold)
+        print_comparison(rows, args.threshold)
+        if any(row["status"] == "regression" for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,20 +9,118 @@ from lockam.core.validators import validate_inputs
 
 from PyQt5.QtWidgets import (
     QApplication, QWizard, QWizardPage, QLabel, QLineEdit,
-    QDateEdit, QComboBox, QPushButton, QVBoxLayout, QMessageBox
+    QDateEdit, QComboBox, QPushButton, QVBoxLayout, QMessageBox, QProgressDialog, QProgressBar
 )
-from PyQt5.QtCore import QDate
+from PyQt5.QtCore import QDate, QThread, Qt, pyqtSignal
 from lockam.core.install_marker import mark_installed
 from lockam.core.countries import get_country_list, get_country_code
-import requests
+from lockam.core import metrics, profiling
+from lockam.core.device_info import get_device_info
+from lockam.core.outbox import Outbox, OutboxSender
+import threading
 import sys
 
-SERVER_URI = "https://lockam.sanni.com.ng/api/register_device"  # Server endpoint
+ENROLL_FRAMES = 30  # frames captured while enrolling a face
+
+
+class EnrollmentWorker(QThread):
+    """ Capture and embed face frames off the GUI thread. """
+
+    progress = pyqtSignal(str, int, int)  # (stage, done, total)
+    enrolled = pyqtSignal(object)         # template (numpy array)
+    failed = pyqtSignal(str)
+
+    def __init__(self):
+        super().__init__()
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        """Stop capturing at the next batch (e.g. the wizard is closing)."""
+        self._cancel.set()
+
+    def run(self):
+        source = None
+        try:
+            # Heavy/optional dependencies (numpy, OpenCV, face_recognition) load only here
+            from lockam.core.enrollment import EnrollmentPipeline, face_recognition_models
+            from lockam.core.webcam import OpenCVSource
+
+            detector, embedder = face_recognition_models()
+            source = OpenCVSource()
+            pipeline = EnrollmentPipeline(
+                source, embedder, detector=detector, frames=ENROLL_FRAMES,
+                progress=lambda stage, done, total: self.progress.emit(stage, done, total),
+            )
+            self.enrolled.emit(pipeline.run(self._cancel))
+        except Exception as e:
+            if not self._cancel.is_set():  # EnrollmentCancelled: nobody is waiting for a template any more
+                self.failed.emit(str(e))
+        finally:
+            if source is not None:
+                source.close()
+
+
+class RegistrationWorker(QThread):
+    """ Save the user, queue the registration and try a first sync, off the GUI thread. """
+
+    progress = pyqtSignal(str)
+    succeeded = pyqtSignal(bool)  # True if the registration already reached the server
+    failed = pyqtSignal(str, str)  # (title, message)
+
+    def __init__(self, user_manager, outbox, sender, username, password, payload, face_template=None):
+        super().__init__()
+        self.user_manager = user_manager
+        self.face_template = face_template
+        self.outbox = outbox
+        self.sender = sender
+        self.username = username
+        self.password = password
+        self.payload = payload
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        """Skip (or stop) the first sync; the queued items are sent later."""
+        self._cancel.set()
+
+    @metrics.instrument("wizard_submit")
+    def run(self):
+        try:
+            # 1. Save minimal info locally (username, password, face),
+            #    hashed with a cost tuned to this machine's CPU
+            self.progress.emit("Securing your credentials...")
+            self.user_manager.calibrate_kdf()
+            self.user_manager.save_user(self.username, self.password)
+            if self.face_template is not None:
+                from lockam.core.face_store import FaceTemplateStore
+
+                FaceTemplateStore().add(self.username, self.face_template, {"username": self.username})
+
+            # 2. Queue extended info for the server; it is durable from here on,
+            #    so setup can finish even when offline. Device probes can block
+            #    on a cold cache, which is why they run here and not in the GUI.
+            self.outbox.enqueue("register_device", {**self.payload, "device_info": get_device_info()})
+            self.outbox.enqueue("user_info", self.user_manager.export_user_info())
+        except Exception as e:
+            self.failed.emit("Setup Failed", str(e))
+            return
+
+        # 3. Best-effort first sync; whatever is left (or cancelled) goes out later
+        if not self._cancel.is_set():
+            self.progress.emit("Contacting server...")
+            try:
+                self.sender.drain(self._cancel)
+            except Exception:
+                pass
+        self.succeeded.emit(self.outbox.pending_count() == 0)
+
 
 class SetupWizard(QWizard):
-    def __init__(self, user_manager):
+    def __init__(self, user_manager, outbox=None, sender=None):
         super().__init__()
         self.user_manager = user_manager
+        self.outbox = outbox or Outbox(user_manager.db)
+        self.sender = sender or OutboxSender(self.outbox)
+        self.worker = None
 
         self.setWindowTitle("Lockam - One Time Setup")
         self.resize(500, 550)
@@ -113,14 +211,55 @@ class SetupWizard(QWizard):
         page.setTitle("Face Enrollment")
 
         layout = QVBoxLayout()
-        layout.addWidget(QLabel("Capture your face (stub for now)..."))
+        self.face_status = QLabel("Look at the camera and press Capture.")
+        self.face_progress = QProgressBar()
+        self.face_progress.setRange(0, ENROLL_FRAMES)
+
+        self.capture_btn = QPushButton("Capture Face")
+        self.capture_btn.clicked.connect(self.start_face_enrollment)
+
+        # Template stays on this machine; it is saved with the user in finalize_setup()
+        self.face_template = None
+        self.enroll_worker = None
 
-        # TODO: integrate actual recognition enrollment
-        self.face_data = "dummy_face_encoded_data"
+        layout.addWidget(self.face_status)
+        layout.addWidget(self.face_progress)
+        layout.addWidget(self.capture_btn)
 
         page.setLayout(layout)
         return page
 
+    def start_face_enrollment(self):
+        if self.enroll_worker is not None and self.enroll_worker.isRunning():
+            return
+        self.capture_btn.setEnabled(False)
+        self.face_progress.setValue(0)
+        self.face_status.setText("Starting camera...")
+
+        self.enroll_worker = EnrollmentWorker()
+        self.enroll_worker.progress.connect(self.on_enroll_progress)
+        self.enroll_worker.enrolled.connect(self.on_face_enrolled)
+        self.enroll_worker.failed.connect(self.on_enroll_failed)
+        self.enroll_worker.start()
+
+    def on_enroll_progress(self, stage, done, total):
+        if stage == "capture":
+            self.face_progress.setValue(done)
+            self.face_status.setText(f"Capturing... {done}/{total}")
+        elif stage == "embed":
+            self.face_status.setText("Building your face template...")
+
+    def on_face_enrolled(self, template):
+        self.face_template = template
+        self.face_progress.setValue(ENROLL_FRAMES)
+        self.face_status.setText("Face captured successfully.")
+        self.capture_btn.setText("Capture Again")
+        self.capture_btn.setEnabled(True)
+
+    def on_enroll_failed(self, message):
+        self.face_status.setText(f"Face enrollment failed: {message}\nYou can retry or continue without it.")
+        self.capture_btn.setEnabled(True)
+
     def create_summary_page(self):
         page = QWizardPage()
         page.setTitle("Summary & Consent")
@@ -146,7 +285,10 @@ class SetupWizard(QWizard):
         return page
 
     def finalize_setup(self):
-        """ Validate, save user locally, send to server, mark installation complete. """
+        """ Validate, then save user locally and send to server on a worker thread. """
+        if self.worker is not None and self.worker.isRunning():
+            return
+
         # CENTRAL VALIDATION
         valid, message = validate_inputs(
             fullname = self.fullname.text(),
@@ -168,41 +310,61 @@ class SetupWizard(QWizard):
             QMessageBox.warning(self, "Validation Error", "Please select a gender.")
             return
 
-        try:
-            # 1. Save minimal info locally (username, password, face)
-            self.user_manager.save_user(self.username.text(), self.password.text())
-
-            # 2. Send extended info to server
-            payload = {
-                "fullname": self.fullname.text().strip(),
-                "dob": self.dob.date().toString("yyyy-MM-dd"),
-                "country": self.country.currentText(),
-                "gender": self.gender.currentText(),
-                "username": self.username.text().strip(),
-                "email": self.email.text().strip(),
-                "face_data": self.face_data,
-                "device_info": "stub-device-info"  # TODO: detect real device info
-            }
-            try:
-                r = requests.post(SERVER_URI, json=payload, timeout=10)
-                r.raise_for_status()
-            except Exception as e:
-                QMessageBox.warning(self, "Network Error", f"Could not connect to server.\n\n{e}")
-                return
-
-            # 3. Mark installation complete
-            mark_installed()
-
-            QMessageBox.information(self, "Setup Complete",
-                                    "Lockam has been installed successfully.\nYou are registered as the Admin.")
-            self.close()
-
-        except Exception as e:
-            QMessageBox.critical(self, "Setup Failed", str(e))
-
-def run_setup_wizard(user_manager):
+        payload = {
+            "fullname": self.fullname.text().strip(),
+            "dob": self.dob.date().toString("yyyy-MM-dd"),
+            "country": self.country.currentText(),
+            "country_code": get_country_code(self.country.currentText()),
+            "gender": self.gender.currentText(),
+            "username": self.username.text().strip(),
+            "email": self.email.text().strip(),
+            "face_enrolled": self.face_template is not None,  # the template itself never leaves the device
+        }
+
+        self.progress_dialog = QProgressDialog("Preparing...", "Cancel", 0, 0, self)
+        self.progress_dialog.setWindowTitle("Lockam - Registering")
+        self.progress_dialog.setWindowModality(Qt.WindowModal)
+        self.progress_dialog.setMinimumDuration(0)
+
+        self.worker = RegistrationWorker(
+            self.user_manager, self.outbox, self.sender, self.username.text(), self.password.text(), payload,
+            face_template=self.face_template,
+        )
+        self.worker.progress.connect(self.progress_dialog.setLabelText)
+        self.worker.succeeded.connect(self.on_registration_succeeded)
+        self.worker.failed.connect(self.on_registration_failed)
+        self.progress_dialog.canceled.connect(self.worker.cancel)
+        self.worker.start()
+
+    def on_registration_succeeded(self, synced):
+        self.progress_dialog.reset()
+
+        # 4. Mark installation complete
+        mark_installed()
+
+        message = "Lockam has been installed successfully.\nYou are registered as the Admin."
+        if not synced:
+            message += "\n\nYou appear to be offline; your registration will be sent automatically later."
+        QMessageBox.information(self, "Setup Complete", message)
+        self.close()
+
+    def on_registration_failed(self, title, message):
+        self.progress_dialog.reset()
+        QMessageBox.critical(self, title, message)
+
+    def closeEvent(self, event):
+        for worker in (self.worker, self.enroll_worker):
+            if worker is not None:
+                worker.cancel()
+        for worker in (self.worker, self.enroll_worker):
+            if worker is not None:
+                worker.wait()
+        super().closeEvent(event)
+
+def run_setup_wizard(user_manager, outbox=None, sender=None):
     """ Launch the setup wizard. """
     app = QApplication(sys.argv)
-    wizard = SetupWizard(user_manager)
+    wizard = SetupWizard(user_manager, outbox, sender)
+    profiling.checkpoint("wizard")
     wizard.show()
     app.exec_()
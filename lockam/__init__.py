@@ -5,7 +5,6 @@
 
 import os
 from pathlib import Path
-from .core import user_manager
 
 __version__ = "1.0.0"
 __author__ = "Muhammad Sanni"
@@ -13,16 +12,23 @@ __author__ = "Muhammad Sanni"
 
 def create_app():
     """ Application factory for lockam. """
-    # Ensure storage directory exists
+    # Core modules load here, not on `import lockam`, so run.py can start its
+    # startup clock (and profiler) before any of them are imported
+    from .core import outbox, user_manager
+
+    # Storage directory and tables are created on first database access,
+    # so starting up (and deciding whether to show the wizard) does no I/O
     storage_path = Path(__file__).resolve().parent / "storage"
-    storage_path.mkdir(exist_ok=True)
 
     # Database path
     db_path = storage_path / "lockam.db"
 
+    um = user_manager.UserManager(db_path)
+
     # Application context
     app = {
         "db_path": db_path,
-        "user_manager": user_manager.UserManager(db_path),
+        "user_manager": um,
+        "outbox": outbox.Outbox(um.db),  # shares lockam.db and its connections
     }
     return app
@@ -0,0 +1,87 @@
+# Lockam - PC Intrusion Detection & Auto-Lock Software
+# lockam/core/auth.py
+# Authentication helpers - non-blocking password verification
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+'''
+# Password verification runs a slow key derivation. The lock screen and setup
+# wizard hand it to a small worker pool and get a Future back, so the Qt event
+# loop never waits on hashing. A newer attempt on the same channel (the user
+# typed again) cancels the older one.
+'''
+
+import threading
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor
+
+DEFAULT_WORKERS = 2
+
+
+class PasswordVerifier:
+    """ Run a password check callable on a bounded worker pool. """
+
+    def __init__(self, check, max_workers: int = DEFAULT_WORKERS):
+        self._check = check
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="lockam-auth"
+        )
+        self._lock = threading.Lock()
+        self._latest = {}  # channel -> most recent Future
+
+    def submit(self, password: str, channel: str = "default") -> Future:
+        """
+        Queue a verification and return a Future resolving to bool.
+        Any earlier attempt still pending on the same channel is cancelled.
+        """
+        future = Future()
+        with self._lock:
+            previous = self._latest.get(channel)
+            self._latest[channel] = future
+        if previous is not None:
+            previous.cancel()
+
+        future.add_done_callback(lambda f: self._forget(channel, f))
+        self._executor.submit(self._run, future, password)
+        return future
+
+    async def verify_async(self, password: str, channel: str = "default") -> bool:
+        """Coroutine variant of submit(); cancelling the task cancels the attempt."""
+        import asyncio  # only the asyncio callers pay for importing it
+
+        return await asyncio.wrap_future(self.submit(password, channel))
+
+    def cancel(self, channel: str = "default"):
+        """Cancel the outstanding attempt on a channel, if any."""
+        with self._lock:
+            future = self._latest.pop(channel, None)
+        if future is not None:
+            future.cancel()
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            pending, self._latest = list(self._latest.values()), {}
+        for future in pending:
+            future.cancel()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _forget(self, channel, future):
+        with self._lock:
+            if self._latest.get(channel) is future:
+                del self._latest[channel]
+
+    def _run(self, future: Future, password: str):
+        # Superseded before a worker picked it up: skip the hash entirely
+        if future.cancelled():
+            return
+        try:
+            result = self._check(password)
+        except BaseException as e:
+            try:
+                future.set_exception(e)
+            except InvalidStateError:
+                pass
+            return
+        try:
+            future.set_result(result)
+        except InvalidStateError:
+            pass  # cancelled while hashing; result is no longer wanted
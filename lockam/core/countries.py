@@ -4,6 +4,10 @@
 # Copyright (c) 2025 Muhammad Sanni
 # All rights reserved. See LICENSE for details.
 
+import bisect
+import unicodedata
+from functools import lru_cache
+
 COUNTRIES = [
     ("Select Country", ""),
     ("Afghanistan", "AF"),
@@ -203,14 +207,71 @@ COUNTRIES = [
     ("Zimbabwe", "ZW"),
 ]
 
+class CountryRegistry:
+    """ Lookup indexes over COUNTRIES, built once. """
+
+    def __init__(self, countries):
+        entries = [(name, code) for name, code in countries if code]  # skip the placeholder
+
+        self.names = tuple(name for name, _ in countries)
+        self.name_to_code = dict(countries)
+        self.code_to_name = {code: name for name, code in entries}
+
+        # Case/accent-insensitive keys, e.g. "sao tome and principe"
+        self._normalized = {_normalize(name): code for name, code in entries}
+
+        # Sorted (key, name) pairs: a prefix match is a contiguous run found by bisect
+        index = sorted((_normalize(name), name) for name, _ in entries)
+        self._prefix_keys = [key for key, _ in index]
+        self._prefix_names = [name for _, name in index]
+
+    def code_for(self, name: str) -> str | None:
+        code = self.name_to_code.get(name)
+        if code is None:
+            code = self._normalized.get(_normalize(name))
+        return code
+
+    def name_for(self, code: str) -> str | None:
+        return self.code_to_name.get(code.strip().upper())
+
+    def search(self, prefix: str, limit: int = 10) -> list:
+        key = _normalize(prefix)
+        start = bisect.bisect_left(self._prefix_keys, key)
+        matches = []
+        for i in range(start, len(self._prefix_keys)):
+            if len(matches) >= limit or not self._prefix_keys[i].startswith(key):
+                break
+            matches.append(self._prefix_names[i])
+        return matches
+
+
+def _normalize(text: str) -> str:
+    """Casefold and strip accents: 'São Tomé' -> 'sao tome'."""
+    decomposed = unicodedata.normalize("NFKD", text.strip())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
+
+
+@lru_cache(maxsize=None)
+def get_registry() -> CountryRegistry:
+    """Build the indexes on first use and reuse them afterwards."""
+    return CountryRegistry(COUNTRIES)
+
+
 def get_country_list():
-    """Return list of country names."""
-    return [name for name, code in COUNTRIES]
+    """Return country names (placeholder first) as a cached tuple."""
+    return get_registry().names
+
 
 def get_country_code(country_name: str) -> str:
-    """Lookup ISO code for given country name."""
-    for name, code in COUNTRIES:
-        if name == country_name:
-            return code
-    return None
+    """Lookup ISO code for given country name (case and accent insensitive)."""
+    return get_registry().code_for(country_name)
+
+
+def get_country_name(country_code: str) -> str:
+    """Lookup country name for given ISO code."""
+    return get_registry().name_for(country_code)
+
 
+def search_countries(prefix: str, limit: int = 10) -> list:
+    """Type-ahead: country names starting with prefix, alphabetically."""
+    return get_registry().search(prefix, limit)
@@ -0,0 +1,423 @@
+# Lockam - PC Intrusion Detection & Auto-Lock Software
+# lockam/core/daemon.py
+# Headless background service: detection loop, journal, sync, watchdog; no Qt
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+'''
+# `python run.py --daemon` runs LockamDaemon. It owns the long-lived pieces:
+#   - the detection loop, paced by SamplingScheduler (slow while the owner is
+#     active, full rate after a suspicious event)
+#   - EventBus + wire_detection(): lock first, then journal and evidence.
+#     One intrusion locks once: further detections are only counted until
+#     the watchdog sees the session unlocked again (or, where the lock state
+#     can't be read, relock_after seconds have passed). A lock() that fails
+#     is journaled (daemon.lock_failed) and leaves detection armed
+#   - EventJournal and the OutboxSender sync thread, sharing lockam.db
+#   - a watchdog thread that writes storage/daemon.heartbeat, restarts a dead
+#     detection loop and pings systemd (WATCHDOG=1) when NOTIFY_SOCKET is set
+# PyQt5 is never imported here, so the resident daemon stays small.
+# The detector is pluggable (anything with analyse() -> payload | None);
+# default_detector() builds the webcam + motion gate + face match pipeline
+# when numpy, OpenCV and face_recognition are installed, and returns None
+# (no detection loop) otherwise.
+'''
+
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+from .event_bus import CRITICAL, INTRUDER_DETECTED, EventBus, wire_detection
+from .journal import EventJournal
+from .outbox import OutboxSender
+from .scheduler import SamplingScheduler, default_activity_source, logind_properties
+
+STORAGE_DIR = Path(__file__).resolve().parent.parent / "storage"
+HEARTBEAT_FILE = STORAGE_DIR / "daemon.heartbeat"
+HEARTBEAT_INTERVAL = 5.0   # seconds between watchdog beats
+STALL_AFTER = 60.0         # detection loop silent this long counts as stalled
+RELOCK_AFTER = 60.0        # re-arm after a lock when the session state is unknown
+
+
+# ---------------------------------------------------------------------------
+# Locking
+# ---------------------------------------------------------------------------
+
+def lock_workstation() -> bool:
+    """Lock the OS session; returns False if no supported mechanism worked."""
+    if sys.platform == "win32":
+        import ctypes
+
+        return bool(ctypes.windll.user32.LockWorkStation())
+    if sys.platform == "darwin":
+        commands = [["pmset", "displaysleepnow"]]
+    else:
+        commands = [["loginctl", "lock-session"], ["xdg-screensaver", "lock"]]
+    for cmd in commands:
+        try:
+            if subprocess.run(cmd, timeout=5, capture_output=True).returncode == 0:
+                return True
+        except (OSError, subprocess.TimeoutExpired):
+            continue
+    return False
+
+
+def session_locked() -> bool | None:
+    """Whether the OS session is locked right now; None if this platform can't tell."""
+    if sys.platform == "win32":
+        import ctypes
+
+        user32 = ctypes.windll.user32
+        desktop = user32.OpenInputDesktop(0, False, 0x0100)  # DESKTOP_SWITCHDESKTOP
+        if not desktop:
+            return True  # the input desktop is the secure (lock) desktop
+        user32.CloseDesktop(desktop)
+        return False
+    if sys.platform.startswith("linux"):
+        props = logind_properties("LockedHint")
+        return None if props is None else {"yes": True, "no": False}.get(props.get("LockedHint"))
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Detection
+# ---------------------------------------------------------------------------
+
+class CameraDetector:
+    """
+    One frame per analyse(): motion gate -> face detection -> match against
+    enrolled templates. Returns an INTRUDER_DETECTED payload for an unknown
+    face, else None. The payload carries "captured_ns" (perf_counter_ns right
+    after the frame was read) and "stages" ({"detected": ns, "embedded": ns})
+    so the event's latency is measured from the frame, not from publish().
+    """
+
+    def __init__(self, source, detector, embedder, store, gate=None, threshold=None):
+        import numpy as np
+
+        self._np = np
+        self.source = source
+        self.detector = detector
+        self.embedder = embedder
+        self.store = store
+        self.gate = gate
+        self.threshold = threshold
+        self._frame = np.empty(source.shape, dtype=np.uint8)
+
+    def analyse(self):
+        if len(self.store) == 0:
+            return None  # nobody enrolled: every face, the owner's too, would be "unknown"
+        if not self.source.read_into(self._frame):
+            return None
+        captured_ns = time.perf_counter_ns()
+        if self.gate is not None and not self.gate.check(self._frame):
+            return None
+        frames = self._frame[None]
+        boxes = self.detector(frames)
+        if self._np.isnan(boxes[0]).any():  # no face in view
+            return None
+        detected_ns = time.perf_counter_ns()
+        embedding = self.embedder(frames, boxes)[0]
+        embedded_ns = time.perf_counter_ns()
+        match_args = () if self.threshold is None else (self.threshold,)
+        user, score = self.store.match(embedding, *match_args)
+        if user is not None:
+            return None
+        return {
+            "frame": self._frame.copy(),
+            "score": score,
+            "source": "webcam",
+            "captured_ns": captured_ns,
+            "stages": {"detected": detected_ns, "embedded": embedded_ns},
+        }
+
+    def close(self):
+        self.source.close()
+
+
+def default_detector():
+    """CameraDetector on the default webcam, or None if a dependency is missing."""
+    try:
+        from .enrollment import face_recognition_models
+        from .face_store import FaceTemplateStore
+        from .motion import MotionGate
+        from .webcam import OpenCVSource
+
+        detector, embedder = face_recognition_models()
+        source = OpenCVSource()
+    except ImportError:
+        return None
+    return CameraDetector(source, detector, embedder, FaceTemplateStore(), MotionGate(source.shape, bgr=True))
+
+
+def _sd_notify(message: str):
+    """Send a systemd notification if we run under a notify-type unit."""
+    address = os.getenv("NOTIFY_SOCKET")
+    if not address or not hasattr(socket, "AF_UNIX"):
+        return
+    if address.startswith("@"):
+        address = "\0" + address[1:]
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+            sock.sendto(message.encode(), address)
+    except OSError:
+        pass
+
+
+def read_heartbeat(path: Path = HEARTBEAT_FILE, max_age: float = 3 * HEARTBEAT_INTERVAL) -> dict | None:
+    """The daemon's last heartbeat if it is fresh, else None (not running or hung)."""
+    try:
+        beat = json.loads(Path(path).read_text())
+    except (OSError, ValueError):
+        return None
+    return beat if time.time() - beat.get("ts", 0) <= max_age else None
+
+
+# ---------------------------------------------------------------------------
+# Daemon
+# ---------------------------------------------------------------------------
+
+class LockamDaemon:
+    """ Long-running headless service built on the create_app() context. """
+
+    def __init__(
+        self,
+        app: dict,
+        detector=None,
+        lock=lock_workstation,
+        evidence=None,
+        transport=None,
+        sync: bool = True,
+        scheduler: SamplingScheduler | None = None,
+        heartbeat_path: Path = HEARTBEAT_FILE,
+        heartbeat_interval: float = HEARTBEAT_INTERVAL,
+        stall_after: float = STALL_AFTER,
+        relock_after: float = RELOCK_AFTER,
+        session_state=session_locked,
+    ):
+        self.app = app
+        self.user_manager = app["user_manager"]
+        self.db = self.user_manager.db
+        self.detector = detector
+        self.lock = lock
+        self.evidence = evidence
+        self.heartbeat_path = Path(heartbeat_path)
+        self.heartbeat_interval = heartbeat_interval
+        self.stall_after = stall_after
+        self.relock_after = relock_after
+        self.session_state = session_state
+
+        self.journal = EventJournal(self.db)
+        self.bus = EventBus()
+        self.scheduler = scheduler or SamplingScheduler([default_activity_source()])
+        self.sender = OutboxSender(app["outbox"], transport) if sync else None
+
+        self.frames = 0
+        self.detections = 0
+        self.loop_restarts = 0
+        self.suppressed = 0        # detections while already locked
+        self.lock_failures = 0     # lock() calls that returned False or raised
+        self.locked_at = None      # monotonic time of our last lock, None once unlocked
+        self._seen_locked = False  # session_state() has confirmed that lock
+        self.started_at = None
+        self._last_loop = None
+        self._stop = threading.Event()
+        self._loop_thread = None
+        self._watchdog_thread = None
+
+        wire_detection(self.bus, self._lock_session, sessions=self.user_manager.sessions,
+                       journal=self.journal, evidence=self.evidence)
+        self.bus.subscribe(INTRUDER_DETECTED, lambda event: self.scheduler.notify_suspicious(),
+                           priority=CRITICAL + 2, inline=True, name="alert_scheduler")
+
+    # -- lifecycle ------------------------------------------------------------
+
+    def start(self):
+        """Start every background thread; returns immediately."""
+        self._stop.clear()
+        self.started_at = time.time()
+        # Started inside an unlocked OS session: sample slowly while its owner is active
+        self.scheduler.set_authenticated(True)
+        self.journal.start()
+        self.journal.record("daemon.started", {"pid": os.getpid(), "detector": self.detector is not None})
+        if self.sender is not None:
+            self.sender.start()
+        self._start_loop()
+        self._watchdog_thread = threading.Thread(target=self._watchdog, name="lockam-watchdog", daemon=True)
+        self._watchdog_thread.start()
+        _sd_notify("READY=1")
+
+    def stop(self, timeout: float = 10.0):
+        """Stop threads, flush the journal and release resources. Safe to call twice."""
+        if self.started_at is None:
+            return
+        _sd_notify("STOPPING=1")
+        self._stop.set()
+        for thread in (self._loop_thread, self._watchdog_thread):
+            if thread is not None:
+                thread.join(timeout)
+        if self.sender is not None:
+            self.sender.stop(timeout)
+        self.bus.close()
+        if self.evidence is not None:
+            self.evidence.close()
+        if self.detector is not None and hasattr(self.detector, "close"):
+            self.detector.close()
+        self.journal.record("daemon.stopped", {"frames": self.frames, "detections": self.detections})
+        self.journal.close(timeout)
+        self.heartbeat_path.unlink(missing_ok=True)
+        self.started_at = None
+
+    def request_stop(self, *_):
+        """Signal-safe: only sets a flag; run_forever() does the actual shutdown."""
+        self._stop.set()
+
+    def install_signal_handlers(self):
+        """SIGTERM/SIGINT (and SIGBREAK on Windows) stop the daemon cleanly."""
+        for name in ("SIGTERM", "SIGINT", "SIGBREAK"):
+            sig = getattr(signal, name, None)
+            if sig is not None:
+                signal.signal(sig, self.request_stop)
+
+    def run_forever(self, duration: float | None = None):
+        """Start, block until a stop signal (or `duration` seconds), then stop."""
+        self.start()
+        try:
+            self._stop.wait(duration)
+        finally:
+            self.stop()
+
+    # -- detection loop -------------------------------------------------------
+
+    def _analyse(self):
+        self._last_loop = time.monotonic()
+        payload = self.detector.analyse()
+        self.frames += 1
+        if payload is not None:
+            self.detections += 1
+            if self.locked_at is not None:
+                self.suppressed += 1  # already locked for this intrusion
+                return
+            # latency is measured from frame capture when the detector reports it
+            self.bus.publish(
+                INTRUDER_DETECTED, payload, origin_ns=payload.pop("captured_ns", None), stages=payload.pop("stages", None)
+            )
+
+    def _lock_session(self):
+        try:
+            locked = self.lock()
+        except Exception:
+            locked = False
+        if not locked:
+            # stay armed: the next detection tries again
+            self.lock_failures += 1
+            self.journal.record("daemon.lock_failed", {"failures": self.lock_failures})
+            return
+        self.locked_at = time.monotonic()
+        self._seen_locked = False
+        self.scheduler.set_locked(True)
+
+    def unlocked(self):
+        """The session is unlocked again: re-arm detection and leave the locked sampling rate."""
+        if self.locked_at is None:
+            return
+        self.locked_at = None
+        self.scheduler.set_locked(False)
+        self.journal.record("daemon.unlocked", {"suppressed": self.suppressed})
+
+    def _check_unlocked(self):
+        if self.locked_at is None:
+            return
+        state = self.session_state()
+        if state:
+            self._seen_locked = True
+        elif (state is False and self._seen_locked) or time.monotonic() - self.locked_at >= self.relock_after:
+            self.unlocked()
+
+    def _loop(self):
+        self._last_loop = time.monotonic()
+        try:
+            self.scheduler.run(self._analyse, self._stop)
+        except Exception as e:
+            # the thread ends here; the watchdog notices and starts a new loop
+            self.journal.record("daemon.loop_crashed", {"error": repr(e)})
+
+    def _start_loop(self):
+        if self.detector is None:
+            return
+        self._loop_thread = threading.Thread(target=self._loop, name="lockam-detect", daemon=True)
+        self._loop_thread.start()
+
+    # -- watchdog -------------------------------------------------------------
+
+    def loop_healthy(self) -> bool:
+        if self.detector is None:
+            return True
+        if self._loop_thread is None or not self._loop_thread.is_alive():
+            return False
+        return time.monotonic() - self._last_loop < self.stall_after + self.scheduler.next_interval()
+
+    def _beat(self):
+        healthy = self.loop_healthy()
+        beat = {
+            "pid": os.getpid(),
+            "ts": time.time(),
+            "uptime": time.time() - self.started_at,
+            "state": self.scheduler.state(),
+            "frames": self.frames,
+            "detections": self.detections,
+            "loop_healthy": healthy,
+            "loop_restarts": self.loop_restarts,
+            "locked": self.locked_at is not None,
+            "suppressed": self.suppressed,
+            "lock_failures": self.lock_failures,
+            "journal_errors": self.journal.write_errors,
+            "journal_dropped": self.journal.events_dropped,
+        }
+        self.heartbeat_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.heartbeat_path.with_name(self.heartbeat_path.name + ".tmp")
+        tmp.write_text(json.dumps(beat))
+        tmp.replace(self.heartbeat_path)
+        if healthy:
+            _sd_notify("WATCHDOG=1")  # withheld while stalled so systemd can restart us
+        return beat
+
+    def _watchdog(self):
+        while not self._stop.is_set():
+            try:
+                if self._loop_thread is not None and not self._loop_thread.is_alive() and not self._stop.is_set():
+                    # the loop died (detector raised): log it and start a fresh one
+                    self.loop_restarts += 1
+                    self.journal.record("daemon.loop_restarted", {"restarts": self.loop_restarts})
+                    self._start_loop()
+                self._check_unlocked()
+                self._beat()
+            except Exception:
+                pass  # the watchdog itself must never die
+            self._stop.wait(self.heartbeat_interval)
+
+
+def run_daemon(app: dict, duration: float | None = None) -> int:
+    """Entry point for `run.py --daemon`: build the default daemon and run it until signalled."""
+    if read_heartbeat() is not None:
+        print("Lockam daemon is already running.")
+        return 1
+    evidence = None
+    try:
+        from .evidence import EvidenceStore
+
+        evidence = EvidenceStore(app["user_manager"].db)
+    except ImportError:
+        pass  # numpy missing: detections are still locked and journaled
+    daemon = LockamDaemon(app, detector=default_detector(), evidence=evidence)
+    if daemon.detector is None:
+        print("No camera pipeline available (numpy/OpenCV/face_recognition); running without detection.")
+    daemon.install_signal_handlers()
+    daemon.run_forever(duration)
+    return 0
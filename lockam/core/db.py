@@ -0,0 +1,116 @@
+# Lockam - PC Intrusion Detection & Auto-Lock Software
+# lockam/core/db.py
+# Shared SQLite connection layer for lockam.db
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+'''
+# Every component (wizard, detector, lock screen) talks to the same lockam.db.
+# Each thread gets one long-lived connection in WAL mode with a busy timeout,
+# so readers never block the writer and concurrent writers wait instead of
+# failing with "database is locked".
+# Nothing touches the disk until the first connection is requested: components
+# register their schema setup with add_initializer() and it runs then, once.
+'''
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+from . import metrics
+
+BUSY_TIMEOUT = 5.0  # seconds a writer waits for the lock before giving up
+
+
+class ConnectionManager:
+    """ Hands out one persistent connection per thread for a database file. """
+
+    def __init__(self, db_path: Path, busy_timeout: float = BUSY_TIMEOUT):
+        self.db_path = Path(db_path)
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._conns = []
+        self._init_lock = threading.Lock()
+        self._initializers = []
+        self._ready = False
+
+    def add_initializer(self, fn):
+        """
+        Register fn(conn) to run once, inside a write transaction, before the
+        database is first used (e.g. CREATE TABLE IF NOT EXISTS).
+        """
+        with self._init_lock:
+            if not self._ready:
+                self._initializers.append(fn)
+                return
+        # Database already in use: run it straight away
+        self._run_initializers(self.get(), [fn])
+
+    def _run_initializers(self, conn, initializers):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for fn in initializers:
+                fn(conn)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _ensure_ready(self, conn):
+        with self._init_lock:
+            if self._ready:
+                return
+            self._run_initializers(conn, self._initializers)
+            self._initializers = []
+            self._ready = True
+
+    def _connect(self) -> sqlite3.Connection:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # isolation_level=None: autocommit, transactions are explicit (see transaction())
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.busy_timeout,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout * 1000)}")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        if metrics.REGISTRY.enabled:
+            # Count statements per operation (see metrics.instrument); off by default
+            conn.set_trace_callback(metrics.count_sql)
+        return conn
+
+    def get(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._lock:
+                self._conns.append(conn)
+        if not self._ready:
+            self._ensure_ready(conn)
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        """Run a write transaction; takes the write lock up front to avoid upgrade deadlocks."""
+        conn = self.get()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def close(self):
+        """Close every connection opened by this manager (all threads)."""
+        with self._lock:
+            conns, self._conns = self._conns, []
+        for conn in conns:
+            conn.close()
+        self._local = threading.local()
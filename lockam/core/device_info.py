@@ -6,26 +6,134 @@
 
 '''
 # Wire in device info collection so the installer sends real system info to my server during the first-time setup.
+# Each probe runs in its own thread with a strict timeout (a misconfigured
+# resolver can make gethostbyname hang for seconds), and the result is cached
+# in lockam/storage/device.json together with a per-install ID generated once.
+# Later reads are served from the cache; only fields that can change are
+# re-probed, in the background.
 '''
 
+import json
+import os
 import platform
 import socket
+import threading
+import time
 import uuid
-import os
+from pathlib import Path
+
+DEVICE_CACHE = Path(__file__).resolve().parent.parent / "storage" / "device.json"
+PROBE_TIMEOUT = 1.0  # seconds allowed for all probes together
+
+
+def _ip_address():
+    return socket.gethostbyname(socket.gethostname())
+
+
+def _user():
+    return os.getenv("USER") or os.getenv("USERNAME") or "unknown"
+
+
+PROBES = {
+    "hostname": socket.gethostname,
+    "ip_address": _ip_address,
+    "os": platform.system,
+    "os_version": platform.version,
+    "architecture": platform.machine,
+    "processor": platform.processor,
+    "user": _user,
+}
+
+# Fields that can change between runs (DHCP, OS updates, who is logged in)
+VOLATILE_FIELDS = ("ip_address", "os_version", "user")
+
+
+def run_probes(probes: dict, timeout: float = PROBE_TIMEOUT) -> dict:
+    """
+    Run probes in parallel and return {name: value}. A probe that fails or
+    misses the deadline yields None; its (daemon) thread is left behind.
+    """
+    results = dict.fromkeys(probes)
+
+    def run(name, probe):
+        try:
+            results[name] = probe()
+        except Exception:
+            pass
+
+    threads = [threading.Thread(target=run, args=item, daemon=True) for item in probes.items()]
+    for t in threads:
+        t.start()
+    deadline = time.monotonic() + timeout
+    for t in threads:
+        t.join(max(0.0, deadline - time.monotonic()))
+    return {name: results[name] for name in probes}
+
+
+class DeviceFingerprint:
+    """ Cached device info with a stable per-install ID. """
+
+    def __init__(self, cache_path: Path = DEVICE_CACHE, probes: dict | None = None, timeout: float = PROBE_TIMEOUT):
+        self.cache_path = Path(cache_path)
+        self.probes = probes or PROBES
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._info = None
+        self._refresh_thread = None
+
+    def _load(self) -> dict | None:
+        try:
+            return json.loads(self.cache_path.read_text())
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, info: dict):
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(info, indent=2))
+        tmp.replace(self.cache_path)
+
+    def get(self) -> dict:
+        """Return device info instantly from cache; probes only on the very first run."""
+        with self._lock:
+            if self._info is None:
+                cached = self._load()
+                if cached and cached.get("uuid"):
+                    self._info = cached
+                    self.refresh_async()
+                else:
+                    info = run_probes(self.probes, self.timeout)
+                    info["uuid"] = str(uuid.uuid4())  # per-install unique ID, generated once
+                    self._save(info)
+                    self._info = info
+            return dict(self._info)
+
+    def refresh(self, fields=VOLATILE_FIELDS) -> dict:
+        """Re-probe the given fields and update the cache."""
+        fresh = run_probes({name: self.probes[name] for name in fields if name in self.probes}, self.timeout)
+        with self._lock:
+            info = dict(self._info or self._load() or {})
+            # Keep the last known value when a probe times out
+            info.update({name: value for name, value in fresh.items() if value is not None})
+            if info.get("uuid"):
+                self._save(info)
+                self._info = info
+            return dict(info)
+
+    def refresh_async(self) -> threading.Thread:
+        """Refresh volatile fields on a background thread (at most one at a time)."""
+        if self._refresh_thread is None or not self._refresh_thread.is_alive():
+            self._refresh_thread = threading.Thread(target=self.refresh, name="lockam-device-info", daemon=True)
+            self._refresh_thread.start()
+        return self._refresh_thread
+
+
+_default = None
+
 
 def get_device_info():
     """ Collect basic device infor for server registration. """
-    try:
-        info = {
-            "nostname": socket.gethostanme(),
-            "ip_address": socket.gethostbyname(socket.gethostname()),
-            "os": platform.system(),
-            "os_version": platform.version(),
-            "architecture": platform.machine(),
-            "processor": platform.processor(),
-            "uuid": str(uuid.uuid4()), # per-install unique ID
-            "user": os.getenv("USER") or os.getenv("USERNAME") or "unknown",
-        }
-    except Exception as e:
-        info = {"error": str(e)}
-        return info
+    global _default
+    if _default is None:
+        _default = DeviceFingerprint()
+    return _default.get()
@@ -0,0 +1,197 @@
+# Lockam - PC Intrusion Detection & Auto-Lock Software
+# lockam/core/enrollment.py
+# Multi-frame face enrollment pipeline
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+'''
+# Capture `frames` frames in batches, score each batch for quality (sharpness,
+# exposure, face size) with vectorised NumPy, keep the best_n frames seen so
+# far, then embed those together and average them into one template.
+# Runs synchronously (run()) for headless use and tests, or on a background
+# thread (start()) for the setup wizard; progress(stage, done, total) is
+# called as it goes.
+# Sources are the same read_into(buffer) objects as lockam.core.webcam;
+# NpyVideoSource replays a recorded clip saved with np.save. Frames are BGR,
+# as OpenCV captures them (like motion.py with bgr=True and evidence.py);
+# they are converted to RGB only where they enter face_recognition.
+'''
+
+import threading
+
+import numpy as np
+
+from .face_store import _normalize
+
+_LUMA = np.array([0.114, 0.587, 0.299], dtype=np.float32)  # BGR
+
+BLUR_REFERENCE = 100.0  # Laplacian variance that scores 0.5 for sharpness
+FACE_REFERENCE = 0.10   # face box covering 10% of the frame scores full marks
+
+
+def quality_scores(frames, boxes=None):
+    """
+    Score a batch (n, h, w, 3) of uint8 BGR frames in [0, 1].
+    boxes: optional (n, 4) array of face boxes (x, y, w, h); NaN rows mean no face.
+    """
+    gray = frames.astype(np.float32) @ _LUMA  # (n, h, w)
+
+    # Sharpness: variance of the 4-neighbour Laplacian
+    lap = (gray[:, :-2, 1:-1] + gray[:, 2:, 1:-1] + gray[:, 1:-1, :-2] + gray[:, 1:-1, 2:]
+           - 4 * gray[:, 1:-1, 1:-1])
+    blur = lap.var(axis=(1, 2))
+    sharpness = blur / (blur + BLUR_REFERENCE)
+
+    # Exposure: mean brightness near mid-grey and few clipped pixels
+    mean = gray.mean(axis=(1, 2))
+    clipped = ((gray < 10) | (gray > 245)).mean(axis=(1, 2))
+    exposure = np.clip(1 - np.abs(mean - 128) / 128, 0, 1) * (1 - clipped)
+
+    if boxes is None:
+        size = np.ones(len(frames), dtype=np.float32)
+    else:
+        boxes = np.asarray(boxes, dtype=np.float32)
+        area = boxes[:, 2] * boxes[:, 3] / (gray.shape[1] * gray.shape[2])
+        size = np.nan_to_num(np.clip(area / FACE_REFERENCE, 0, 1), nan=0.0)
+
+    return sharpness * exposure * size
+
+
+class NpyVideoSource:
+    """ Replay a clip stored as an (n, h, w, 3) uint8 .npy file (memory-mapped). """
+
+    def __init__(self, path):
+        self._frames = np.load(path, mmap_mode="r")
+        self.shape = self._frames.shape[1:]
+        self._index = 0
+
+    def read_into(self, buffer) -> bool:
+        if self._index >= len(self._frames):
+            return False
+        np.copyto(buffer, self._frames[self._index])
+        self._index += 1
+        return True
+
+    def close(self):
+        pass
+
+
+class EnrollmentCancelled(Exception):
+    """Raised by run() when the cancel event is set."""
+
+
+class EnrollmentPipeline:
+    """ Capture -> batch quality scoring -> best-N embedding -> averaged template. """
+
+    def __init__(
+        self,
+        source,
+        embedder,
+        detector=None,
+        frames: int = 30,
+        batch_size: int = 8,
+        best_n: int = 5,
+        min_quality: float = 0.05,
+        progress=None,
+    ):
+        self.source = source
+        self.embedder = embedder  # (k, h, w, 3) frames, boxes or None -> (k, dim)
+        self.detector = detector  # (n, h, w, 3) frames -> (n, 4) boxes, NaN where no face
+        self.frames = frames
+        self.batch_size = batch_size
+        self.best_n = best_n
+        self.min_quality = min_quality
+        self.progress = progress or (lambda stage, done, total: None)
+
+    def run(self, cancel_event: threading.Event | None = None):
+        """Enroll synchronously; returns the L2-normalised template."""
+        shape = tuple(self.source.shape)
+        batch = np.empty((self.batch_size, *shape), dtype=np.uint8)
+        best = np.empty((self.best_n, *shape), dtype=np.uint8)
+        best_scores = np.full(self.best_n, -1.0, dtype=np.float32)
+        best_boxes = np.full((self.best_n, 4), np.nan, dtype=np.float32)
+
+        captured = 0
+        while captured < self.frames:
+            if cancel_event is not None and cancel_event.is_set():
+                raise EnrollmentCancelled()
+
+            n = 0
+            while n < min(self.batch_size, self.frames - captured) and self.source.read_into(batch[n]):
+                n += 1
+            if n == 0:
+                break  # source exhausted
+            captured += n
+
+            boxes = self.detector(batch[:n]) if self.detector else None
+            scores = quality_scores(batch[:n], boxes)
+
+            # Merge this batch into the running top-N
+            for i in np.argsort(scores)[::-1]:
+                worst = int(np.argmin(best_scores))
+                if scores[i] <= best_scores[worst]:
+                    break
+                best[worst] = batch[i]
+                best_scores[worst] = scores[i]
+                if boxes is not None:
+                    best_boxes[worst] = boxes[i]
+            self.progress("capture", captured, self.frames)
+
+        keep = best_scores >= self.min_quality
+        if not keep.any():
+            raise ValueError("No usable face frames captured; check lighting and camera position.")
+
+        if cancel_event is not None and cancel_event.is_set():
+            raise EnrollmentCancelled()  # before the slow part
+        self.progress("embed", 0, int(keep.sum()))
+        embeddings = np.asarray(
+            self.embedder(best[keep], best_boxes[keep] if self.detector else None), dtype=np.float32
+        )
+        template = _normalize(np.mean([_normalize(e) for e in embeddings], axis=0))
+        self.progress("done", int(keep.sum()), int(keep.sum()))
+        return template
+
+    def start(self, on_done, on_error=None, cancel_event: threading.Event | None = None) -> threading.Thread:
+        """Run on a background thread; on_done(template) or on_error(exc) is called from it."""
+        def work():
+            try:
+                template = self.run(cancel_event)
+            except Exception as e:
+                if on_error:
+                    on_error(e)
+                return
+            on_done(template)
+
+        thread = threading.Thread(target=work, name="lockam-enroll", daemon=True)
+        thread.start()
+        return thread
+
+
+def face_recognition_models():
+    """
+    (detector, embedder) backed by the optional `face_recognition` package.
+    Both take BGR frames; dlib expects contiguous RGB, so each frame is
+    converted here. Raises ImportError when it is not installed.
+    """
+    import face_recognition
+
+    def rgb(frame):
+        return np.ascontiguousarray(frame[..., ::-1])
+
+    def detector(frames):
+        boxes = np.full((len(frames), 4), np.nan, dtype=np.float32)
+        for i, frame in enumerate(frames):
+            found = face_recognition.face_locations(rgb(frame))
+            if found:
+                top, right, bottom, left = max(found, key=lambda b: (b[2] - b[0]) * (b[1] - b[3]))
+                boxes[i] = (left, top, right - left, bottom - top)
+        return boxes
+
+    def embedder(frames, boxes):
+        out = []
+        for frame, (x, y, w, h) in zip(frames, boxes):
+            location = [(int(y), int(x + w), int(y + h), int(x))]
+            out.append(face_recognition.face_encodings(rgb(frame), known_face_locations=location)[0])
+        return np.array(out)
+
+    return detector, embedder
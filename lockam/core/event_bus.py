@@ -0,0 +1,257 @@
+# Lockam - PC Intrusion Detection & Auto-Lock Software
+# lockam/core/event_bus.py
+# In-process event bus with prioritised handlers and per-stage latency histograms
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+'''
+# publish() runs inline handlers (the lock action) straight away in the
+# publisher's thread, highest priority first, and only then queues the other
+# handlers on a worker pool ordered by priority. A slow subscriber such as
+# evidence encoding can therefore never delay the lock.
+# Every event carries its origin time (e.g. when the frame was captured) and a
+# stamp per stage. Each stamp feeds a LatencyHistogram keyed "<topic>:<stage>",
+# measured from the origin, so p50/p95/p99 of "unknown face -> screen locked"
+# can be read at runtime with latency_report().
+'''
+
+import itertools
+import math
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+
+INTRUDER_DETECTED = "intruder.detected"
+
+CRITICAL = 0   # runs inline in publish(); reserved for the lock action
+HIGH = 10
+NORMAL = 50
+LOW = 90
+
+_STOP = object()
+
+
+class LatencyHistogram:
+    """
+    Log-bucketed latency histogram (nanoseconds in, milliseconds out).
+    Buckets grow by `growth` per step, so memory is constant and quantiles are
+    accurate to within that ratio.
+    """
+
+    def __init__(self, min_ns: int = 1_000, max_ns: int = 60 * 10**9, growth: float = 1.05):
+        self.min_ns = min_ns
+        self._log_growth = math.log(growth)
+        self._growth = growth
+        self._counts = [0] * (self._bucket(max_ns) + 2)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def _bucket(self, ns: int) -> int:
+        if ns <= self.min_ns:
+            return 0
+        return int(math.log(ns / self.min_ns) / self._log_growth) + 1
+
+    def record(self, ns: int):
+        index = min(self._bucket(ns), len(self._counts) - 1)
+        with self._lock:
+            self._counts[index] += 1
+            self.count += 1
+            self.total_ns += ns
+            if ns > self.max_ns:
+                self.max_ns = ns
+
+    def quantile(self, q: float) -> float:
+        """Latency (ms) below which a fraction q of samples fall; 0.0 if empty."""
+        with self._lock:
+            if not self.count:
+                return 0.0
+            rank = max(1, math.ceil(q * self.count))
+            seen = 0
+            for index, n in enumerate(self._counts):
+                seen += n
+                if seen >= rank:
+                    upper = self.min_ns * self._growth ** index
+                    return min(upper, self.max_ns) / 1e6
+        return self.max_ns / 1e6
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_ms": self.total_ns / self.count / 1e6 if self.count else 0.0,
+            "p50_ms": self.quantile(0.50),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+            "max_ms": self.max_ns / 1e6,
+        }
+
+
+@dataclass
+class Event:
+    """ A published event; stamps maps stage name -> time.perf_counter_ns(). """
+
+    topic: str
+    payload: dict
+    origin_ns: int
+    stamps: dict = field(default_factory=dict)
+
+
+@dataclass(order=True)
+class _Subscription:
+    priority: int
+    seq: int
+    name: str = field(compare=False)
+    handler: object = field(compare=False)
+    inline: bool = field(compare=False)
+
+
+class EventBus:
+    """ Topic-based publish/subscribe with inline and pooled handlers. """
+
+    def __init__(self, workers: int = 2):
+        self.workers = workers
+        self.errors = 0
+        self.histograms = {}
+        self._subs = {}
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._queue = queue.PriorityQueue()
+        self._threads = []
+
+    def subscribe(self, topic: str, handler, priority: int = NORMAL, inline: bool | None = None, name: str | None = None):
+        """
+        Register handler(event) for topic. Inline handlers run synchronously
+        inside publish(); by default only CRITICAL ones are inline.
+        """
+        sub = _Subscription(
+            priority, next(self._seq), name or getattr(handler, "__name__", "handler"), handler,
+            priority <= CRITICAL if inline is None else inline,
+        )
+        with self._lock:
+            self._subs[topic] = sorted(self._subs.get(topic, []) + [sub])
+        return sub.name
+
+    def unsubscribe(self, topic: str, name: str):
+        with self._lock:
+            self._subs[topic] = [s for s in self._subs.get(topic, []) if s.name != name]
+
+    def start(self):
+        with self._lock:
+            if self._threads:
+                return
+            self._threads = [
+                threading.Thread(target=self._run, name=f"lockam-bus-{i}", daemon=True) for i in range(self.workers)
+            ]
+        for thread in self._threads:
+            thread.start()
+
+    def publish(self, topic: str, payload: dict | None = None, origin_ns: int | None = None, stages: dict | None = None) -> Event:
+        """
+        Deliver an event. origin_ns (perf_counter_ns) is when the underlying
+        thing happened, e.g. frame capture; defaults to now. stages maps
+        stage name -> perf_counter_ns for work done before publishing
+        (e.g. face detection), stamped like any other stage.
+        """
+        now = time.perf_counter_ns()
+        event = Event(topic, payload or {}, origin_ns if origin_ns is not None else now)
+        for stage, ns in (stages or {}).items():
+            self.mark(event, stage, ns)
+        self.mark(event, "published", now)
+        subs = self._subs.get(topic, ())
+        for sub in subs:
+            if sub.inline:
+                self._call(sub, event)
+        queued = [sub for sub in subs if not sub.inline]
+        if queued:
+            if not self._threads:
+                self.start()
+            for sub in queued:
+                self._queue.put((sub.priority, next(self._seq), sub, event, time.perf_counter_ns()))
+        return event
+
+    def mark(self, event: Event, stage: str, ns: int | None = None):
+        """Stamp a stage on event and record its latency from the event's origin."""
+        ns = ns if ns is not None else time.perf_counter_ns()
+        event.stamps[stage] = ns
+        self.histogram(f"{event.topic}:{stage}").record(ns - event.origin_ns)
+
+    def histogram(self, key: str) -> LatencyHistogram:
+        hist = self.histograms.get(key)
+        if hist is None:
+            with self._lock:
+                hist = self.histograms.setdefault(key, LatencyHistogram())
+        return hist
+
+    def latency_report(self) -> dict:
+        """{"<topic>:<stage>": {count, mean_ms, p50_ms, p95_ms, p99_ms, max_ms}}"""
+        with self._lock:
+            items = sorted(self.histograms.items())
+        return {key: hist.summary() for key, hist in items}
+
+    def _call(self, sub, event):
+        try:
+            sub.handler(event)
+        except Exception:
+            # one broken subscriber must not stop the others (or the lock)
+            self.errors += 1
+        self.mark(event, sub.name)
+
+    def _run(self):
+        while True:
+            _, _, sub, event, queued_ns = self._queue.get()
+            try:
+                if sub is _STOP:
+                    return
+                self.histogram(f"{event.topic}:{sub.name}.queued").record(time.perf_counter_ns() - queued_ns)
+                self._call(sub, event)
+            finally:
+                self._queue.task_done()
+
+    def flush(self):
+        """Block until every queued handler has run."""
+        self._queue.join()
+
+    def close(self):
+        """Run what is queued, then stop the workers."""
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self._queue.put((math.inf, next(self._seq), _STOP, None, 0))
+        for thread in threads:
+            thread.join()
+
+
+def wire_detection(bus: EventBus, lock, sessions=None, journal=None, evidence=None):
+    """
+    Connect the intruder pipeline to INTRUDER_DETECTED. Payload keys used:
+    "frame", "score" and "source". The frame is read later on a worker
+    thread, so publish a copy, not a capture buffer that will be reused.
+
+    lock()                  - inline, CRITICAL: shows the lock screen
+    sessions.revoke_all()   - inline, right after the lock
+    journal.record(...)     - worker pool, HIGH
+    evidence.save(frame)    - worker pool, LOW (encoding is the slow part)
+    """
+    bus.subscribe(INTRUDER_DETECTED, lambda event: lock(), priority=CRITICAL, name="lock")
+    if sessions is not None:
+        bus.subscribe(
+            INTRUDER_DETECTED, lambda event: sessions.revoke_all(), priority=CRITICAL + 1, inline=True, name="revoke_sessions"
+        )
+    if journal is not None:
+        bus.subscribe(
+            INTRUDER_DETECTED,
+            lambda event: journal.record(
+                "intruder.detected", {"score": event.payload.get("score")}, source=event.payload.get("source")
+            ),
+            priority=HIGH,
+            name="journal",
+        )
+    if evidence is not None:
+        def save_evidence(event):
+            frame = event.payload.get("frame")
+            if frame is not None:
+                evidence.save(frame, source=event.payload.get("source"))
+
+        bus.subscribe(INTRUDER_DETECTED, save_evidence, priority=LOW, name="evidence")
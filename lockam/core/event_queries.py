@@ -0,0 +1,116 @@
+# Lockam - PC Intrusion Detection & Auto-Lock Software
+# lockam/core/event_queries.py
+# Read side of the event journal: pagination and dashboard summaries
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+'''
+# Listing uses keyset pagination on (ts, id) over the covering indexes, so
+# page N costs the same as page 1. Summaries read the hourly/daily rollup
+# tables the journal writer maintains; their cost depends on the number of
+# buckets asked for, not on how many months of history are stored.
+'''
+
+import json
+import math
+import time
+
+from .db import ConnectionManager
+from .journal import DAY, HOUR, EventJournal
+
+
+def _event(row) -> dict:
+    event_id, ts, kind, source, details = row
+    return {"id": event_id, "ts": ts, "kind": kind, "source": source,
+            "details": json.loads(details) if details else None}
+
+
+class EventQueries:
+    """ Query API over the `events` table and its rollups. """
+
+    def __init__(self, db: ConnectionManager, clock=time.time):
+        self.db = db
+        self.clock = clock
+        db.add_initializer(EventJournal._init_db)  # same schema, in case nothing was written yet
+
+    def page(self, limit: int = 50, cursor=None, kind: str | None = None, since: float | None = None):
+        """
+        Newest-first page of events. Pass the returned cursor back to get the
+        next page; it is None when there are no more events.
+        """
+        clauses, params = [], []
+        if kind is not None:
+            clauses.append("kind = ?")
+            params.append(kind)
+        if since is not None:
+            clauses.append("ts >= ?")
+            params.append(since)
+        if cursor is not None:
+            clauses.append("(ts, id) < (?, ?)")
+            params.extend(cursor)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        rows = self.db.get().execute(
+            f"SELECT id, ts, kind, source, details FROM events {where} ORDER BY ts DESC, id DESC LIMIT ?",
+            (*params, limit),
+        ).fetchall()
+        events = [_event(row) for row in rows]
+        next_cursor = (rows[-1][1], rows[-1][0]) if len(rows) == limit else None
+        return events, next_cursor
+
+    def _count_raw(self, start: float, end: float, kind: str | None) -> int:
+        sql = "SELECT COUNT(*) FROM events WHERE ts >= ? AND ts < ?"
+        params = [start, end]
+        if kind is not None:
+            sql += " AND kind = ?"
+            params.append(kind)
+        return self.db.get().execute(sql, params).fetchone()[0]
+
+    def count_between(self, start: float, end: float, kind: str | None = None) -> int:
+        """Events in [start, end): whole hours from the rollup, ragged edges from the index."""
+        # Round the float bounds themselves: truncating first would let a start
+        # just past an hour boundary pull in that whole hour's bucket
+        first_hour = math.ceil(start / HOUR) * HOUR
+        last_hour = math.floor(end / HOUR) * HOUR
+        if first_hour >= last_hour:
+            return self._count_raw(start, end, kind)
+
+        sql = "SELECT COALESCE(SUM(count), 0) FROM event_rollup_hourly WHERE bucket >= ? AND bucket < ?"
+        params = [first_hour, last_hour]
+        if kind is not None:
+            sql += " AND kind = ?"
+            params.append(kind)
+        whole = self.db.get().execute(sql, params).fetchone()[0]
+        return whole + self._count_raw(start, first_hour, kind) + self._count_raw(last_hour, end, kind)
+
+    def last_24h(self, kind: str | None = None) -> int:
+        now = self.clock()
+        return self.count_between(now - DAY, now, kind)
+
+    def _series(self, table: str, width: int, buckets: int, kind: str | None) -> list:
+        end = int(self.clock()) // width * width
+        start = end - (buckets - 1) * width
+        sql = f"SELECT bucket, SUM(count) FROM {table} WHERE bucket >= ?"
+        params = [start]
+        if kind is not None:
+            sql += " AND kind = ?"
+            params.append(kind)
+        counts = dict(self.db.get().execute(sql + " GROUP BY bucket", params).fetchall())
+        return [(bucket, counts.get(bucket, 0)) for bucket in range(start, end + 1, width)]
+
+    def per_hour(self, hours: int = 24, kind: str | None = None) -> list:
+        """[(hour_start_ts, count)] for the last `hours` UTC hours, oldest first."""
+        return self._series("event_rollup_hourly", HOUR, hours, kind)
+
+    def per_day(self, days: int = 30, kind: str | None = None) -> list:
+        """[(day_start_ts, count)] for the last `days` UTC days, oldest first."""
+        return self._series("event_rollup_daily", DAY, days, kind)
+
+    def top_kinds(self, days: int = 7, limit: int = 5) -> list:
+        """[(kind, count)] most frequent event types over the last `days` UTC days."""
+        start = (int(self.clock()) // DAY - (days - 1)) * DAY
+        return self.db.get().execute(
+            "SELECT kind, SUM(count) AS total FROM event_rollup_daily WHERE bucket >= ? "
+            "GROUP BY kind ORDER BY total DESC, kind LIMIT ?",
+            (start, limit),
+        ).fetchall()
@@ -0,0 +1,415 @@
+# Lockam - PC Intrusion Detection & Auto-Lock Software
+# lockam/core/evidence.py
+# Deduplicating intruder image store with background encoding and a disk quota
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+'''
+# save() copies the frame and hands it to a small thread pool, so the detector
+# never waits for JPEG encoding or the disk. Workers:
+#   1. hash the raw pixels (sha256) and compute a 64-bit difference hash (dHash),
+#   2. drop the frame if the same or a near-identical image (dHash within
+#      dup_distance bits) is already stored, only bumping its hit count,
+#   3. otherwise encode the image and a thumbnail and write them under
+#      lockam/storage/evidence/<sha[:2]>/<sha>.<ext>.
+# Encoders are tried in order: OpenCV, Pillow, then a stdlib-only PNG writer.
+# The index lives in the `evidence` table of lockam.db; when the stored bytes
+# exceed max_bytes the oldest evidence is evicted first.
+'''
+
+import hashlib
+import struct
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from .db import ConnectionManager
+
+EVIDENCE_DIR = Path(__file__).resolve().parent.parent / "storage" / "evidence"
+MAX_BYTES = 500 * 1024 * 1024
+THUMB_SIZE = 160       # longest thumbnail side in pixels
+JPEG_QUALITY = 85
+DUP_DISTANCE = 6       # dHash bits that may differ for two frames to count as the same
+MAX_PENDING = 32       # frames waiting for a worker before save() starts dropping
+
+_LUMA = np.array([0.114, 0.587, 0.299], dtype=np.float32)  # BGR
+
+
+# ---------------------------------------------------------------------------
+# Hashing
+# ---------------------------------------------------------------------------
+
+def _gray(frame):
+    return frame.astype(np.float32) @ _LUMA if frame.ndim == 3 else frame.astype(np.float32)
+
+
+def dhash(frame) -> int:
+    """64-bit difference hash: brightness gradients of a 9x8 area-averaged thumbnail."""
+    gray = _gray(frame)
+    h, w = gray.shape
+    if h < 8 or w < 9:
+        raise ValueError("Frame too small to hash.")
+    bh, bw = h // 8, w // 9
+    small = gray[: bh * 8, : bw * 9].reshape(8, bh, 9, bw).mean(axis=(1, 3))
+    bits = (small[:, 1:] > small[:, :-1]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def content_hash(frame) -> str:
+    """sha256 over the shape and raw pixels; the storage address of a frame."""
+    digest = hashlib.sha256(repr(frame.shape).encode())
+    digest.update(np.ascontiguousarray(frame).data)
+    return digest.hexdigest()
+
+
+def _popcount(values):
+    if hasattr(np, "bitwise_count"):  # NumPy >= 2.0
+        return np.bitwise_count(values)
+    return np.unpackbits(values.view(np.uint8)).reshape(-1, 64).sum(axis=1)
+
+
+def _to_signed(value: int) -> int:
+    # SQLite integers are signed 64-bit
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+# ---------------------------------------------------------------------------
+# Encoders: (frame, quality) -> (bytes, extension)
+# ---------------------------------------------------------------------------
+
+def _encode_cv2(frame, quality):
+    import cv2
+
+    ok, buf = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        raise ValueError("OpenCV could not encode the frame.")
+    return buf.tobytes(), "jpg"
+
+
+def _encode_pil(frame, quality):
+    import io
+
+    from PIL import Image
+
+    image = Image.fromarray(frame[..., ::-1] if frame.ndim == 3 else frame)
+    buf = io.BytesIO()
+    image.save(buf, "JPEG", quality=quality)
+    return buf.getvalue(), "jpg"
+
+
+def _png_chunk(tag, data):
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+
+def _encode_png(frame, quality=None):
+    """Lossless PNG using only the standard library (last-resort fallback)."""
+    if frame.ndim == 3:
+        pixels, color_type = np.ascontiguousarray(frame[..., ::-1]), 2  # BGR -> RGB
+    else:
+        pixels, color_type = np.ascontiguousarray(frame), 0
+    h, w = pixels.shape[:2]
+    rows = pixels.reshape(h, -1)
+    raw = np.empty((h, rows.shape[1] + 1), dtype=np.uint8)
+    raw[:, 0] = 0  # filter type "none" on every scanline
+    raw[:, 1:] = rows
+    header = struct.pack(">IIBBBBB", w, h, 8, color_type, 0, 0, 0)
+    data = (
+        b"\x89PNG\r\n\x1a\n"
+        + _png_chunk(b"IHDR", header)
+        + _png_chunk(b"IDAT", zlib.compress(raw.tobytes(), 6))
+        + _png_chunk(b"IEND", b"")
+    )
+    return data, "png"
+
+
+ENCODERS = {"cv2": _encode_cv2, "pil": _encode_pil, "png": _encode_png}
+EXTENSIONS = {"cv2": "jpg", "pil": "jpg", "png": "png"}
+
+
+def default_encoder():
+    """Best available encoder name: OpenCV, then Pillow, then the stdlib PNG writer."""
+    for name, module in (("cv2", "cv2"), ("pil", "PIL.Image")):
+        try:
+            __import__(module)
+            return name
+        except ImportError:
+            continue
+    return "png"
+
+
+def thumbnail(frame, size: int = THUMB_SIZE):
+    """Area-averaged downscale so the longest side is at most `size` pixels."""
+    h, w = frame.shape[:2]
+    step = max(1, -(-max(h, w) // size))  # ceil division
+    if step == 1:
+        return frame
+    th, tw = h // step, w // step
+    block = frame[: th * step, : tw * step].reshape(th, step, tw, step, *frame.shape[2:])
+    return block.mean(axis=(1, 3)).astype(np.uint8)
+
+
+@dataclass
+class EvidenceRecord:
+    """ Where a saved frame ended up; duplicate=True means an existing image was reused. """
+
+    sha256: str
+    path: Path
+    thumb_path: Path
+    created_at: float
+    duplicate: bool = False
+
+
+class EvidenceStore:
+    """ Content-addressed intruder images indexed in lockam.db. """
+
+    def __init__(
+        self,
+        db: ConnectionManager,
+        directory: Path = EVIDENCE_DIR,
+        max_bytes: int = MAX_BYTES,
+        workers: int = 2,
+        encoder: str | None = None,
+        quality: int = JPEG_QUALITY,
+        thumb_size: int = THUMB_SIZE,
+        dup_distance: int = DUP_DISTANCE,
+        max_pending: int = MAX_PENDING,
+    ):
+        if encoder is not None and encoder not in ENCODERS:
+            raise ValueError(f"Unknown encoder: {encoder}")
+        self.db = db
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.workers = workers
+        self.encoder = encoder  # resolved on first use; probing imports OpenCV/Pillow
+        self.quality = quality
+        self.thumb_size = thumb_size
+        self.dup_distance = dup_distance
+        self.max_pending = max_pending
+
+        self.stored = 0
+        self.duplicates = 0
+        self.evicted = 0
+        self.dropped = 0
+
+        self._lock = threading.Lock()        # in-memory index only; never held across SQLite or file I/O
+        self._evict_lock = threading.Lock()  # one evictor at a time
+        self._pool = None
+        self._pending = 0
+        self._loaded = False  # in-memory dHash index is read from lockam.db on first save
+        self._hashes = np.empty(0, dtype=np.uint64)
+        self._shas = []
+        self._in_flight = {}  # sha256 -> duplicate hits seen before its row was written
+        self._total_bytes = 0
+        db.add_initializer(self._init_db)
+
+    @staticmethod
+    def _init_db(conn):
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS evidence (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                sha256 TEXT NOT NULL UNIQUE,
+                dhash INTEGER NOT NULL,
+                path TEXT NOT NULL,
+                thumb_path TEXT NOT NULL,
+                width INTEGER NOT NULL,
+                height INTEGER NOT NULL,
+                size_bytes INTEGER NOT NULL,
+                source TEXT,
+                hits INTEGER NOT NULL DEFAULT 1,
+                created_at REAL NOT NULL,
+                last_seen REAL NOT NULL
+            )
+            """
+        )
+        # Listing newest-first and evicting oldest-first both walk this index
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_evidence_created ON evidence (created_at, id)")
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        rows = self.db.get().execute("SELECT sha256, dhash, size_bytes FROM evidence").fetchall()
+        self._shas = [sha for sha, _, _ in rows]
+        self._hashes = np.array([h & 0xFFFFFFFFFFFFFFFF for _, h, _ in rows], dtype=np.uint64)
+        self._total_bytes = sum(size for _, _, size in rows)
+
+    # -- public API ---------------------------------------------------------
+
+    def save(self, frame, source: str | None = None, ts: float | None = None):
+        """
+        Queue a frame for storage and return a Future of EvidenceRecord.
+        The frame is copied, so capture buffers can be reused right away.
+        Returns None (and counts a drop) if max_pending frames are already waiting.
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.dropped += 1
+                return None
+            self._pending += 1
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="lockam-evidence")
+        ts = ts if ts is not None else time.time()
+        return self._pool.submit(self._store, np.array(frame, dtype=np.uint8, copy=True), source, ts)
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            self._load()
+            return self._total_bytes
+
+    def count(self) -> int:
+        return self.db.get().execute("SELECT COUNT(*) FROM evidence").fetchone()[0]
+
+    def list(self, limit: int = 50, before: tuple | None = None) -> list:
+        """
+        Newest evidence first, as dicts. Pass the last row's ("created_at", "id")
+        as `before` to fetch the next page.
+        """
+        sql = "SELECT id, sha256, path, thumb_path, width, height, size_bytes, source, hits, created_at, last_seen FROM evidence"
+        params = []
+        if before is not None:
+            sql += " WHERE (created_at, id) < (?, ?)"
+            params.extend(before)
+        sql += " ORDER BY created_at DESC, id DESC LIMIT ?"
+        params.append(limit)
+        cols = ("id", "sha256", "path", "thumb_path", "width", "height", "size_bytes", "source", "hits", "created_at", "last_seen")
+        return [dict(zip(cols, row)) for row in self.db.get().execute(sql, params)]
+
+    def close(self, wait: bool = True):
+        """Finish (or abandon) queued frames and stop the workers."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=not wait)
+
+    # -- worker side --------------------------------------------------------
+
+    def _find_duplicate(self, sha, dh):
+        if sha in self._in_flight:
+            return sha
+        if not len(self._shas):
+            return None
+        distances = _popcount(self._hashes ^ np.uint64(dh))
+        best = int(np.argmin(distances))
+        if int(distances[best]) <= self.dup_distance:
+            return self._shas[best]
+        return None
+
+    def _paths(self, sha, ext):
+        folder = self.directory / sha[:2]
+        return folder / f"{sha}.{ext}", folder / f"{sha}.thumb.{ext}"
+
+    def _store(self, frame, source, ts):
+        try:
+            sha, dh = content_hash(frame), dhash(frame)
+            with self._lock:
+                self._load()
+                if self.encoder is None:
+                    self.encoder = default_encoder()
+                existing = self._find_duplicate(sha, dh)
+                if existing is None:
+                    self._in_flight[sha] = 0
+                else:
+                    self.duplicates += 1
+                    if existing in self._in_flight:
+                        # still being written: the hit is folded into its INSERT
+                        self._in_flight[existing] += 1
+                        path, thumb_path = self._paths(existing, EXTENSIONS[self.encoder])
+                        return EvidenceRecord(existing, path, thumb_path, ts, duplicate=True)
+            if existing is not None:
+                return self._record_duplicate(existing, ts)
+            try:
+                return self._write_new(frame, sha, dh, source, ts)
+            finally:
+                with self._lock:
+                    self._in_flight.pop(sha, None)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def _record_duplicate(self, sha, ts):
+        with self.db.transaction() as conn:
+            conn.execute(
+                "UPDATE evidence SET hits = hits + 1, last_seen = MAX(last_seen, ?) WHERE sha256 = ?", (ts, sha)
+            )
+            row = conn.execute("SELECT path, thumb_path, created_at FROM evidence WHERE sha256 = ?", (sha,)).fetchone()
+        if row is None:
+            return None  # evicted in the meantime
+        return EvidenceRecord(sha, Path(row[0]), Path(row[1]), row[2], duplicate=True)
+
+    def _write_file(self, path, data):
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_bytes(data)
+        tmp.replace(path)
+
+    def _write_new(self, frame, sha, dh, source, ts):
+        encode = ENCODERS[self.encoder]
+        image, ext = encode(frame, self.quality)
+        thumb, _ = encode(thumbnail(frame, self.thumb_size), self.quality)
+
+        path, thumb_path = self._paths(sha, ext)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._write_file(path, image)
+        self._write_file(thumb_path, thumb)
+        size = len(image) + len(thumb)
+
+        # BEGIN IMMEDIATE may wait out busy_timeout behind another writer:
+        # do it without self._lock so save() and other workers keep going
+        with self._lock:
+            hits = 1 + self._in_flight.get(sha, 0)
+        with self.db.transaction() as conn:
+            conn.execute(
+                "INSERT INTO evidence (sha256, dhash, path, thumb_path, width, height, size_bytes, source, hits, created_at, last_seen) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (sha, _to_signed(dh), str(path), str(thumb_path), frame.shape[1], frame.shape[0], size, source, hits, ts, ts),
+            )
+        with self._lock:
+            late_hits = 1 + self._in_flight.pop(sha, 0) - hits  # duplicates folded in while inserting
+            self._shas.append(sha)
+            self._hashes = np.append(self._hashes, np.uint64(dh))
+            self._total_bytes += size
+            self.stored += 1
+            over_quota = self._total_bytes > self.max_bytes
+        if late_hits:
+            with self.db.transaction() as conn:
+                conn.execute("UPDATE evidence SET hits = hits + ? WHERE sha256 = ?", (late_hits, sha))
+        if over_quota:
+            self._enforce_quota()
+        return EvidenceRecord(sha, path, thumb_path, ts)
+
+    def _enforce_quota(self):
+        """Evict oldest evidence until under max_bytes; self._lock is only taken for the index."""
+        with self._evict_lock:
+            while True:
+                with self._lock:
+                    excess = self._total_bytes - self.max_bytes
+                if excess <= 0:
+                    break
+                rows = self.db.get().execute(
+                    "SELECT id, sha256, path, thumb_path, size_bytes FROM evidence ORDER BY created_at, id LIMIT 32"
+                ).fetchall()
+                if not rows:
+                    break
+                victims, freed = [], 0
+                for row_id, sha, path, thumb_path, size in rows:
+                    if freed >= excess:
+                        break
+                    victims.append((row_id, sha, path, thumb_path))
+                    freed += size
+                with self.db.transaction() as conn:
+                    conn.executemany("DELETE FROM evidence WHERE id = ?", ((v[0],) for v in victims))
+                gone = {sha for _, sha, _, _ in victims}
+                with self._lock:
+                    self._total_bytes -= freed
+                    keep = [i for i, sha in enumerate(self._shas) if sha not in gone]
+                    self._shas = [self._shas[i] for i in keep]
+                    self._hashes = self._hashes[keep]
+                    self.evicted += len(victims)
+                for _, _, path, thumb_path in victims:
+                    Path(path).unlink(missing_ok=True)
+                    Path(thumb_path).unlink(missing_ok=True)
@@ -0,0 +1,143 @@
+# Lockam - PC Intrusion Detection & Auto-Lock Software
+# lockam/core/face_store.py
+# Face template store: memory-mapped float32 matrix + JSON sidecar
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+'''
+# Enrolled face embeddings live in lockam/storage/faces/templates.f32 as one
+# contiguous (capacity x dim) float32 matrix, L2-normalised row by row.
+# templates.json keeps the row count, ids and metadata.
+# Opening the store maps the file (np.memmap) instead of reading it, so start-up
+# is zero-copy. Matching a probe is a single matrix-vector product, i.e. the
+# cosine similarity against every template at once.
+'''
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+FACE_STORE_DIR = Path(__file__).resolve().parent.parent / "storage" / "faces"
+EMBEDDING_DIM = 128
+MATCH_THRESHOLD = 0.6  # cosine similarity needed to accept a match
+
+
+def _normalize(vector):
+    vector = np.asarray(vector, dtype=np.float32).reshape(-1)
+    norm = float(np.linalg.norm(vector))
+    if norm == 0.0:
+        raise ValueError("Embedding must not be all zeros.")
+    return vector / norm
+
+
+class FaceTemplateStore:
+    """ Enrolled face embeddings with vectorised cosine matching. """
+
+    def __init__(self, directory: Path = FACE_STORE_DIR, dim: int = EMBEDDING_DIM, initial_capacity: int = 16):
+        self.directory = Path(directory)
+        self.matrix_path = self.directory / "templates.f32"
+        self.meta_path = self.directory / "templates.json"
+        self.dim = dim
+        self.initial_capacity = initial_capacity
+
+        self.ids = []
+        self.metadata = {}
+        self._matrix = None
+        self._scores = None
+        self._load()
+
+    def _load(self):
+        if not self.meta_path.exists():
+            return
+        meta = json.loads(self.meta_path.read_text())
+        if meta["dim"] != self.dim:
+            raise ValueError(f"Face store holds {meta['dim']}-d embeddings, expected {self.dim}.")
+        self.ids = meta["ids"]
+        self.metadata = meta["metadata"]
+        self._map(meta["capacity"])
+
+    def _map(self, capacity: int):
+        self._matrix = np.memmap(self.matrix_path, dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+        self._scores = np.empty(capacity, dtype=np.float32)
+
+    def _save_meta(self):
+        meta = {
+            "dim": self.dim,
+            "capacity": self.capacity,
+            "ids": self.ids,
+            "metadata": self.metadata,
+        }
+        tmp = self.meta_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(meta))
+        tmp.replace(self.meta_path)
+
+    @property
+    def capacity(self) -> int:
+        return 0 if self._matrix is None else self._matrix.shape[0]
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _ensure_capacity(self, needed: int):
+        if needed <= self.capacity:
+            return
+        capacity = max(self.initial_capacity, self.capacity)
+        while capacity < needed:
+            capacity *= 2
+        if self._matrix is not None:
+            self._matrix.flush()
+            self._matrix = None  # release the mapping before resizing the file
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.matrix_path, "ab") as f:
+            f.truncate(capacity * self.dim * 4)
+        self._map(capacity)
+
+    def add(self, template_id: str, embedding, metadata: dict | None = None):
+        """Enroll (or replace) a template."""
+        vector = _normalize(embedding)
+        if vector.shape[0] != self.dim:
+            raise ValueError(f"Expected a {self.dim}-d embedding, got {vector.shape[0]}.")
+
+        if template_id in self.metadata:
+            row = self.ids.index(template_id)
+        else:
+            self._ensure_capacity(len(self.ids) + 1)
+            row = len(self.ids)
+            self.ids.append(template_id)
+        self._matrix[row] = vector
+        self._matrix.flush()
+        self.metadata[template_id] = metadata or {}
+        self._save_meta()
+
+    def remove(self, template_id: str) -> bool:
+        """Delete a template; the last row is moved into its place."""
+        if template_id not in self.metadata:
+            return False
+        row, last = self.ids.index(template_id), len(self.ids) - 1
+        if row != last:
+            self._matrix[row] = self._matrix[last]
+            self.ids[row] = self.ids[last]
+        self.ids.pop()
+        del self.metadata[template_id]
+        self._matrix.flush()
+        self._save_meta()
+        return True
+
+    def similarities(self, probe):
+        """Cosine similarity of probe against every template (a view into a reused buffer)."""
+        n = len(self.ids)
+        if n == 0:
+            return np.empty(0, dtype=np.float32)
+        scores = self._scores[:n]
+        np.dot(self._matrix[:n], _normalize(probe), out=scores)
+        return scores
+
+    def match(self, probe, threshold: float = MATCH_THRESHOLD):
+        """Return (template_id, score) for the best match, or (None, score) if below threshold."""
+        scores = self.similarities(probe)
+        if scores.size == 0:
+            return None, 0.0
+        best = int(np.argmax(scores))
+        score = float(scores[best])
+        return (self.ids[best] if score >= threshold else None), score
@@ -0,0 +1,231 @@
+# Lockam - PC Intrusion Detection & Auto-Lock Software
+# lockam/core/journal.py
+# Append-only intrusion/auth event journal with group-commit writes
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+'''
+# record() only puts a tuple on a queue.SimpleQueue (no locks held by the
+# caller beyond the queue's own), so the detection loop never waits on SQLite.
+# A single writer thread takes everything that arrives within flush_interval
+# (or up to batch_size events) and commits it as one transaction: one fsync
+# for the whole group instead of one per event.
+# The same transaction bumps the hourly/daily rollup tables, so dashboard
+# summaries (see event_queries.py) never have to scan the event history.
+# A group whose commit fails (e.g. SQLITE_BUSY past busy_timeout) is kept and
+# retried with backoff, merged with whatever arrived meanwhile; only after
+# max_retries failures in a row is it dropped and counted in events_dropped.
+# flush() reports True only once its events are actually committed.
+'''
+
+import json
+import queue
+import threading
+import time
+from collections import Counter
+
+from .db import ConnectionManager
+
+BATCH_SIZE = 1000
+FLUSH_INTERVAL = 0.05  # seconds an event may wait before it is committed
+RETRY_BACKOFF = 0.05   # first delay after a failed commit; doubles per retry
+MAX_RETRIES = 5        # failed commits in a row before the group is dropped
+
+HOUR = 3600
+DAY = 24 * HOUR
+# Rollup table -> bucket width in seconds (buckets are UTC, aligned to the epoch)
+ROLLUPS = {"event_rollup_hourly": HOUR, "event_rollup_daily": DAY}
+
+_STOP = object()
+
+
+class _Flush:
+    """ Queue marker for flush(): done once every earlier event is committed or dropped. """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.ok = True
+
+
+class EventJournal:
+    """ Thread-safe, append-only event log stored in the `events` table. """
+
+    def __init__(
+        self,
+        db: ConnectionManager,
+        batch_size: int = BATCH_SIZE,
+        flush_interval: float = FLUSH_INTERVAL,
+        retry_backoff: float = RETRY_BACKOFF,
+        max_retries: int = MAX_RETRIES,
+    ):
+        self.db = db
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retry_backoff = retry_backoff
+        self.max_retries = max_retries
+        self.events_written = 0
+        self.batches_written = 0
+        self.write_errors = 0
+        self.events_dropped = 0
+
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        db.add_initializer(self._init_db)
+
+    @staticmethod
+    def _init_db(conn):
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                ts REAL NOT NULL,
+                kind TEXT NOT NULL,
+                source TEXT,
+                details TEXT
+            )
+            """
+        )
+        # Time-range scans (optionally per kind) are answered from these indexes alone
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_events_ts ON events (ts, id)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_events_kind_ts ON events (kind, ts, id)")
+
+        for table, width in ROLLUPS.items():
+            existed = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+            ).fetchone()
+            conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    bucket INTEGER NOT NULL,
+                    kind TEXT NOT NULL,
+                    count INTEGER NOT NULL,
+                    PRIMARY KEY (bucket, kind)
+                ) WITHOUT ROWID
+                """
+            )
+            if not existed:
+                # Journal created before rollups existed: backfill once
+                conn.execute(
+                    f"INSERT INTO {table} (bucket, kind, count) "
+                    f"SELECT CAST(ts / {width} AS INTEGER) * {width}, kind, COUNT(*) FROM events GROUP BY 1, 2"
+                )
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="lockam-journal", daemon=True)
+                self._thread.start()
+
+    def record(self, kind: str, details: dict | None = None, source: str | None = None, ts: float | None = None):
+        """Queue an event; returns immediately. Safe to call from any thread."""
+        if self._thread is None:
+            self.start()
+        self._queue.put((ts if ts is not None else time.time(), kind, source, json.dumps(details) if details else None))
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """
+        Block until every event recorded before this call is committed.
+        False on timeout or if some of those events had to be dropped.
+        """
+        if self._thread is None:
+            return True
+        marker = _Flush()
+        self._queue.put(marker)
+        return marker.done.wait(timeout) and marker.ok
+
+    def close(self, timeout: float | None = None):
+        """Commit what is queued and stop the writer thread."""
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _collect(self, first):
+        """Gather a group: everything arriving within flush_interval, up to batch_size."""
+        batch, markers = [], []
+        deadline = time.monotonic() + self.flush_interval
+        item = first
+        while True:
+            if item is _STOP or isinstance(item, _Flush):
+                markers.append(item)
+                if item is _STOP:
+                    break
+            else:
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                if markers:
+                    break  # someone is waiting on a flush: commit now
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+        return batch, markers
+
+    def _write(self, batch):
+        with self.db.transaction() as conn:
+            conn.executemany("INSERT INTO events (ts, kind, source, details) VALUES (?, ?, ?, ?)", batch)
+            for table, width in ROLLUPS.items():
+                counts = Counter((int(ts // width) * width, kind) for ts, kind, _, _ in batch)
+                conn.executemany(
+                    f"INSERT INTO {table} (bucket, kind, count) VALUES (?, ?, ?) "
+                    "ON CONFLICT (bucket, kind) DO UPDATE SET count = count + excluded.count",
+                    ((bucket, kind, n) for (bucket, kind), n in counts.items()),
+                )
+        self.events_written += len(batch)
+        self.batches_written += 1
+
+    def _next_group(self, delay: float):
+        """Next group to commit; after a failed commit, wait at most `delay` for new items."""
+        if not delay:
+            return self._collect(self._queue.get())
+        try:
+            return self._collect(self._queue.get(timeout=delay))
+        except queue.Empty:
+            return [], []
+
+    def _run(self):
+        pending, markers = [], []  # not committed yet (kept across failed attempts)
+        failures = 0
+        while True:
+            batch, new_markers = self._next_group(self.retry_backoff * 2 ** (failures - 1) if failures else 0)
+            pending += batch
+            markers += new_markers
+            if pending:
+                try:
+                    self._write(pending)
+                    failures = 0
+                except Exception:
+                    # never let a bad batch kill the writer; the detector must keep running
+                    self.write_errors += 1
+                    failures += 1
+                    if failures < self.max_retries:
+                        continue  # keep the group (and its flush markers) for the next attempt
+                    self.events_dropped += len(pending)
+                    failures = 0
+                    for marker in markers:
+                        if marker is not _STOP:
+                            marker.ok = False
+                pending = []
+            for marker in markers:
+                if marker is _STOP:
+                    return
+                marker.done.set()
+            markers = []
+
+    def recent(self, limit: int = 100) -> list:
+        """Most recent events, newest first, as dicts."""
+        rows = self.db.get().execute(
+            "SELECT id, ts, kind, source, details FROM events ORDER BY id DESC LIMIT ?", (limit,)
+        ).fetchall()
+        return [
+            {"id": i, "ts": ts, "kind": kind, "source": source, "details": json.loads(details) if details else None}
+            for i, ts, kind, source, details in rows
+        ]
@@ -0,0 +1,161 @@
+# Lockam - PC Intrusion Detection & Auto-Lock Software
+# lockam/core/kdf.py
+# Password key-derivation registry and self-describing hash strings
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+'''
+# Password hashes are stored as one PHC-style string that records the
+# algorithm and its cost parameters, e.g.
+#     $pbkdf2-sha256$i=100000$<salt>$<hash>
+#     $scrypt$ln=14,r=8,p=1$<salt>$<hash>
+# (salt and hash are unpadded base64). Because every hash carries its own
+# parameters, the cost can be raised per machine (see calibrate()) without
+# breaking rows written earlier.
+'''
+
+import base64
+import hashlib
+import hmac
+import os
+import time
+
+SALT_BYTES = 16  # 128-bit salt
+HASH_BYTES = 32
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii").rstrip("=")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+
+class PBKDF2SHA256:
+    """ PBKDF2-HMAC-SHA256; cost is the iteration count `i`. """
+
+    name = "pbkdf2-sha256"
+    param_names = ("i",)
+    defaults = {"i": 100000}
+    minimum = {"i": 100000}
+
+    def derive(self, password: bytes, salt: bytes, params: dict) -> bytes:
+        return hashlib.pbkdf2_hmac("sha256", password, salt, params["i"], HASH_BYTES)
+
+    def calibrate(self, target_seconds: float) -> dict:
+        # Cost is linear in iterations: time a probe run and scale it
+        probe = 20000
+        start = time.perf_counter()
+        self.derive(b"calibration", os.urandom(SALT_BYTES), {"i": probe})
+        elapsed = max(time.perf_counter() - start, 1e-6)
+        iterations = int(probe * target_seconds / elapsed) // 1000 * 1000
+        return {"i": max(iterations, self.minimum["i"])}
+
+
+class Scrypt:
+    """ hashlib.scrypt; cost is N = 2**ln with block size r and parallelism p. """
+
+    name = "scrypt"
+    param_names = ("ln", "r", "p")
+    defaults = {"ln": 14, "r": 8, "p": 1}
+    minimum = {"ln": 14, "r": 8, "p": 1}
+    max_ln = 20
+
+    def derive(self, password: bytes, salt: bytes, params: dict) -> bytes:
+        n, r, p = 1 << params["ln"], params["r"], params["p"]
+        maxmem = 2 * 128 * r * (n + p) + (1 << 20)
+        return hashlib.scrypt(password, salt=salt, n=n, r=r, p=p, maxmem=maxmem, dklen=HASH_BYTES)
+
+    def calibrate(self, target_seconds: float) -> dict:
+        # Cost doubles with each ln step: walk up until the next step would overshoot
+        params = dict(self.minimum)
+        salt = os.urandom(SALT_BYTES)
+        while params["ln"] < self.max_ln:
+            start = time.perf_counter()
+            self.derive(b"calibration", salt, params)
+            if (time.perf_counter() - start) * 2 > target_seconds:
+                break
+            params["ln"] += 1
+        return params
+
+
+KDFS = {}
+
+
+def register_kdf(kdf):
+    """Make a KDF available to hash_password()/verify_password() by its name."""
+    KDFS[kdf.name] = kdf
+    return kdf
+
+
+register_kdf(PBKDF2SHA256())
+register_kdf(Scrypt())
+
+DEFAULT_ALGORITHM = PBKDF2SHA256.name
+
+
+def _get_kdf(algorithm: str):
+    try:
+        return KDFS[algorithm]
+    except KeyError:
+        raise ValueError(f"Unknown password hashing algorithm: {algorithm}") from None
+
+
+def resolve_params(algorithm: str, params: dict | None = None) -> dict:
+    """Fill in defaults for an algorithm's parameters and reject unknown ones."""
+    kdf = _get_kdf(algorithm)
+    merged = dict(kdf.defaults, **(params or {}))
+    if set(merged) != set(kdf.param_names):
+        raise ValueError(f"Invalid parameters for {algorithm}: {sorted(params or {})}")
+    return {key: int(value) for key, value in merged.items()}
+
+
+def _format_params(kdf, params: dict) -> str:
+    return ",".join(f"{key}={int(params[key])}" for key in kdf.param_names)
+
+
+def parse(encoded: str):
+    """Split an encoded hash into (algorithm, params, salt, digest)."""
+    try:
+        _, algorithm, param_str, salt, digest = encoded.split("$")
+        params = {key: int(value) for key, value in (item.split("=") for item in param_str.split(","))}
+    except ValueError:
+        raise ValueError("Malformed password hash string.") from None
+    kdf = _get_kdf(algorithm)
+    if set(params) != set(kdf.param_names):
+        raise ValueError("Malformed password hash string.")
+    return algorithm, params, _b64decode(salt), _b64decode(digest)
+
+
+def hash_password(password: str, algorithm: str = DEFAULT_ALGORITHM, params: dict | None = None) -> str:
+    """Hash a password with a fresh salt and return the encoded string."""
+    kdf = _get_kdf(algorithm)
+    params = resolve_params(algorithm, params)
+    salt = os.urandom(SALT_BYTES)
+    digest = kdf.derive(password.encode("utf-8"), salt, params)
+    return f"${kdf.name}${_format_params(kdf, params)}${_b64encode(salt)}${_b64encode(digest)}"
+
+
+def verify_password(password: str, encoded: str) -> bool:
+    """Verify a password against an encoded hash string."""
+    algorithm, params, salt, digest = parse(encoded)
+    candidate = KDFS[algorithm].derive(password.encode("utf-8"), salt, params)
+    return hmac.compare_digest(candidate, digest)
+
+
+def needs_rehash(encoded: str, algorithm: str = DEFAULT_ALGORITHM, params: dict | None = None) -> bool:
+    """True if the hash was made with a different algorithm or parameters than requested."""
+    stored_algorithm, stored_params, _, _ = parse(encoded)
+    return stored_algorithm != algorithm or stored_params != resolve_params(algorithm, params)
+
+
+def encode_legacy(salt_hex: str, hash_hex: str) -> str:
+    """Convert a pre-registry (hex salt, hex hash) pair into an encoded string."""
+    salt, digest = bytes.fromhex(salt_hex), bytes.fromhex(hash_hex)
+    return f"$pbkdf2-sha256$i=100000${_b64encode(salt)}${_b64encode(digest)}"
+
+
+def calibrate(algorithm: str = DEFAULT_ALGORITHM, target_ms: float = 250) -> dict:
+    """Pick parameters so one verification takes roughly target_ms on this machine."""
+    return _get_kdf(algorithm).calibrate(target_ms / 1000)
@@ -0,0 +1,342 @@
+# Lockam - PC Intrusion Detection & Auto-Lock Software
+# lockam/core/metrics.py
+# In-process metrics: counters, gauges and histograms with JSON/Prometheus export
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+'''
+# Metrics are declared once, at import time, against the module-level REGISTRY
+# and updated in place. When the registry is disabled (the default) every
+# update is a single attribute check and return, so instrumentation can stay
+# in hot paths permanently. Enable with LOCKAM_METRICS=1, `run.py --metrics
+# FILE` or REGISTRY.enable().
+# instrument(op) wraps a function with a call counter, an error counter, a
+# latency histogram and a count of the SQLite statements it executed; the
+# statements are counted through sqlite3's trace callback, which
+# ConnectionManager installs on connections opened while metrics are enabled.
+# snapshot() / to_json() give a dict / JSON; prometheus_text() and
+# write_prometheus() produce the text format read by node_exporter's textfile
+# collector.
+'''
+
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+# Upper bounds (seconds) for latency histograms; +Inf is implicit
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: tuple, extra: tuple = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    escaped = (v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """ Monotonically increasing count. """
+
+    kind = "counter"
+
+    def __init__(self, registry, labels: tuple):
+        self._registry = registry
+        self.labels = labels
+        self._lock = threading.Lock()
+        self.value = 0
+
+    def inc(self, amount=1):
+        if not self._registry.enabled:
+            return
+        with self._lock:
+            self.value += amount
+
+    def _reset(self):
+        self.value = 0
+
+    def _sample(self) -> dict:
+        return {"value": self.value}
+
+    def _prometheus(self, name: str) -> list:
+        return [f"{name}{_format_labels(self.labels)} {_format_value(self.value)}"]
+
+
+class Gauge(Counter):
+    """ Value that can go up and down, or be read from a callable at snapshot time. """
+
+    kind = "gauge"
+
+    def __init__(self, registry, labels: tuple):
+        super().__init__(registry, labels)
+        self._fn = None
+
+    def set(self, value):
+        if self._registry.enabled:
+            self.value = value
+
+    def dec(self, amount=1):
+        self.inc(-amount)
+
+    def set_function(self, fn):
+        """Report fn() instead of a stored value (evaluated on every snapshot)."""
+        self._fn = fn
+
+    def _current(self):
+        if self._fn is not None:
+            try:
+                return self._fn()
+            except Exception:
+                return float("nan")
+        return self.value
+
+    def _sample(self) -> dict:
+        return {"value": self._current()}
+
+    def _prometheus(self, name: str) -> list:
+        return [f"{name}{_format_labels(self.labels)} {_format_value(self._current())}"]
+
+
+class Histogram:
+    """ Cumulative-bucket histogram (Prometheus semantics). """
+
+    kind = "histogram"
+
+    def __init__(self, registry, labels: tuple, buckets=DEFAULT_BUCKETS):
+        self._registry = registry
+        self.labels = labels
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        if not self._registry.enabled:
+            return
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+
+    def time(self):
+        """Context manager observing the elapsed seconds of its block."""
+        return _Timer(self)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th sample (inf if past the last bucket)."""
+        if not self.count:
+            return 0.0
+        rank, seen = q * self.count, 0
+        for bound, n in zip(self.buckets + (float("inf"),), self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def _sample(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "buckets": dict(zip([str(b) for b in self.buckets] + ["+Inf"], self._cumulative())),
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+    def _cumulative(self) -> list:
+        total, out = 0, []
+        for n in self.counts:
+            total += n
+            out.append(total)
+        return out
+
+    def _prometheus(self, name: str) -> list:
+        lines = [
+            f"{name}_bucket{_format_labels(self.labels, (('le', _format_value(bound)),))} {n}"
+            for bound, n in zip(self.buckets + (float("inf"),), self._cumulative())
+        ]
+        lines.append(f"{name}_sum{_format_labels(self.labels)} {_format_value(self.sum)}")
+        lines.append(f"{name}_count{_format_labels(self.labels)} {self.count}")
+        return lines
+
+
+class _Timer:
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start)
+        return False
+
+
+class MetricsRegistry:
+    """ Named metric families; each family holds one metric per label set. """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._families = {}  # name -> (kind, help, {label_key: metric})
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def _get(self, cls, name: str, help: str, labels: dict, **kwargs):
+        key = _label_key(labels)
+        with self._lock:
+            family = self._families.get(name)
+            if family is None:
+                family = self._families[name] = (cls.kind, help, {})
+            elif family[0] != cls.kind:
+                raise ValueError(f"Metric {name} is already registered as a {family[0]}.")
+            metric = family[2].get(key)
+            if metric is None:
+                metric = family[2][key] = cls(self, key, **kwargs)
+            return metric
+
+    def counter(self, name: str, help: str = "", **labels) -> Counter:
+        return self._get(Counter, name, help, labels)
+
+    def gauge(self, name: str, help: str = "", **labels) -> Gauge:
+        return self._get(Gauge, name, help, labels)
+
+    def histogram(self, name: str, help: str = "", buckets=DEFAULT_BUCKETS, **labels) -> Histogram:
+        return self._get(Histogram, name, help, labels, buckets=buckets)
+
+    def reset(self):
+        """Zero every value (definitions are kept)."""
+        with self._lock:
+            metrics = [m for _, _, family in self._families.values() for m in family.values()]
+        for metric in metrics:
+            with metric._lock:
+                metric._reset()
+
+    def _items(self):
+        with self._lock:
+            return [(name, kind, help, list(family.values())) for name, (kind, help, family) in sorted(self._families.items())]
+
+    def snapshot(self) -> dict:
+        return {
+            "timestamp": time.time(),
+            "enabled": self.enabled,
+            "metrics": {
+                name: {
+                    "type": kind,
+                    "help": help,
+                    "samples": [{"labels": dict(m.labels), **m._sample()} for m in metrics],
+                }
+                for name, kind, help, metrics in self._items()
+            },
+        }
+
+    def to_json(self, indent: int | None = None) -> str:
+        return json.dumps(self.snapshot(), indent=indent, default=str)
+
+    def prometheus_text(self) -> str:
+        lines = []
+        for name, kind, help, metrics in self._items():
+            if help:
+                lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for metric in metrics:
+                lines.extend(metric._prometheus(name))
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: Path):
+        """Atomically write the text format (safe for the textfile collector to read at any time)."""
+        self._write(path, self.prometheus_text())
+
+    def write_json(self, path: Path):
+        self._write(path, self.to_json(indent=2))
+
+    @staticmethod
+    def _write(path, text):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(text)
+        tmp.replace(path)
+
+
+# LOCKAM_METRICS=0/false/no/off (or empty) keeps metrics off
+REGISTRY = MetricsRegistry(enabled=os.getenv("LOCKAM_METRICS", "").strip().lower() not in ("", "0", "false", "no", "off"))
+
+counter = REGISTRY.counter
+gauge = REGISTRY.gauge
+histogram = REGISTRY.histogram
+
+# -- SQLite statement counting -------------------------------------------------
+
+SQL_STATEMENTS = REGISTRY.counter("lockam_sqlite_statements_total", "SQLite statements executed")
+_sql_local = threading.local()
+
+
+def count_sql(statement):
+    """sqlite3 trace callback: counts statements globally and for the current thread."""
+    _sql_local.count = getattr(_sql_local, "count", 0) + 1
+    SQL_STATEMENTS.inc()
+
+
+def sql_statements() -> int:
+    """Statements executed so far on this thread (see instrument())."""
+    return getattr(_sql_local, "count", 0)
+
+
+# -- Function instrumentation --------------------------------------------------
+
+def instrument(op: str, registry: MetricsRegistry = REGISTRY):
+    """
+    Decorator recording lockam_<op>_calls_total, _errors_total, _seconds and
+    _sql_statements_total for the wrapped function. When metrics are disabled
+    it only adds one attribute check per call.
+    """
+    name = f"lockam_{op}"
+
+    def wrap(fn):
+        calls = registry.counter(f"{name}_calls_total", f"Calls to {op}")
+        errors = registry.counter(f"{name}_errors_total", f"Calls to {op} that raised")
+        seconds = registry.histogram(f"{name}_seconds", f"Duration of {op}")
+        statements = registry.counter(f"{name}_sql_statements_total", f"SQLite statements run by {op}")
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not registry.enabled:
+                return fn(*args, **kwargs)
+            sql_before = sql_statements()
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                errors.inc()
+                raise
+            finally:
+                seconds.observe(time.perf_counter() - start)
+                calls.inc()
+                statements.inc(sql_statements() - sql_before)
+        return wrapper
+    return wrap
@@ -0,0 +1,253 @@
+# Lockam - PC Intrusion Detection & Auto-Lock Software
+# lockam/core/outbox.py
+# Durable outbox for server sync (registration, user info, event reports)
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+'''
+# Anything meant for the server is first written to the `outbox` table in
+# lockam.db, so installs and reports complete instantly even offline.
+# OutboxSender drains it in the background: items go out in gzip'd JSON
+# batches, each item carrying its own idempotency key so the server can drop
+# re-deliveries (a batch whose response was lost is simply sent again).
+# Failed batches back off exponentially; items that keep failing are parked
+# (dead = 1) after max_attempts instead of being retried forever. A batch the
+# server rejects outright (4xx other than 429) is split in halves until the
+# offending items are isolated; only those are parked, the rest go through.
+'''
+
+import gzip
+import hashlib
+import json
+import random
+import threading
+import time
+import uuid
+
+from .db import ConnectionManager
+
+SYNC_URI = "https://lockam.sanni.com.ng/api/sync"  # Batch sync endpoint
+
+BATCH_SIZE = 50
+MAX_ATTEMPTS = 8
+BASE_BACKOFF = 5.0      # seconds before the first retry
+MAX_BACKOFF = 30 * 60.0
+
+
+class Outbox:
+    """ Persistent queue of payloads waiting to be sent to the server. """
+
+    def __init__(
+        self,
+        db: ConnectionManager,
+        max_attempts: int = MAX_ATTEMPTS,
+        base_backoff: float = BASE_BACKOFF,
+        max_backoff: float = MAX_BACKOFF,
+        clock=time.time,
+        rng=random.random,
+    ):
+        self.db = db
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.clock = clock
+        self.rng = rng
+        db.add_initializer(self._init_db)
+
+    @staticmethod
+    def _init_db(conn):
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                key TEXT NOT NULL UNIQUE,
+                kind TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL DEFAULT 0,
+                last_error TEXT,
+                dead INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (dead, next_attempt_at, id)")
+
+    def enqueue(self, kind: str, payload: dict, key: str | None = None) -> str:
+        """Store a payload for delivery and return its idempotency key."""
+        key = key or uuid.uuid4().hex
+        with self.db.transaction() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO outbox (key, kind, payload, created_at) VALUES (?, ?, ?, ?)",
+                (key, kind, json.dumps(payload), self.clock()),
+            )
+        return key
+
+    def next_batch(self, limit: int = BATCH_SIZE) -> list:
+        """Oldest deliverable items as (id, key, kind, payload) tuples."""
+        rows = self.db.get().execute(
+            "SELECT id, key, kind, payload FROM outbox "
+            "WHERE dead = 0 AND next_attempt_at <= ? ORDER BY id LIMIT ?",
+            (self.clock(), limit),
+        ).fetchall()
+        return [(row_id, key, kind, json.loads(payload)) for row_id, key, kind, payload in rows]
+
+    def ack(self, ids):
+        """Delivered: remove the items."""
+        with self.db.transaction() as conn:
+            conn.executemany("DELETE FROM outbox WHERE id = ?", ((i,) for i in ids))
+
+    def fail(self, ids, error: str, park: bool = False):
+        """
+        Delivery failed: schedule a retry with jittered exponential backoff, or
+        park the item (after max_attempts, or at once with park=True).
+        """
+        now = self.clock()
+        with self.db.transaction() as conn:
+            for row_id in ids:
+                attempts = conn.execute("SELECT attempts FROM outbox WHERE id = ?", (row_id,)).fetchone()
+                if attempts is None:
+                    continue
+                attempts = attempts[0] + 1
+                delay = min(self.max_backoff, self.base_backoff * (2 ** (attempts - 1)))
+                delay *= 0.5 + self.rng() / 2
+                conn.execute(
+                    "UPDATE outbox SET attempts = ?, next_attempt_at = ?, last_error = ?, dead = ? WHERE id = ?",
+                    (attempts, now + delay, error, int(park or attempts >= self.max_attempts), row_id),
+                )
+
+    def pending_count(self) -> int:
+        return self.db.get().execute("SELECT COUNT(*) FROM outbox WHERE dead = 0").fetchone()[0]
+
+    def dead_count(self) -> int:
+        return self.db.get().execute("SELECT COUNT(*) FROM outbox WHERE dead = 1").fetchone()[0]
+
+
+def encode_batch(items) -> tuple:
+    """Build the gzip'd request body and headers for a batch of outbox rows."""
+    keys = [key for _, key, _, _ in items]
+    body = json.dumps({
+        "items": [{"key": key, "kind": kind, "payload": payload} for _, key, kind, payload in items]
+    }).encode("utf-8")
+    headers = {
+        "Content-Type": "application/json",
+        "Content-Encoding": "gzip",
+        # Same items -> same batch key, so a resent batch is recognisable as a whole too
+        "Idempotency-Key": hashlib.sha256(",".join(keys).encode("ascii")).hexdigest(),
+    }
+    return gzip.compress(body), headers
+
+
+def is_rejection(error: Exception) -> bool:
+    """True for an HTTP client error (4xx except 429): resending the same items cannot succeed."""
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    return status is not None and 400 <= status < 500 and status != 429
+
+
+class HttpTransport:
+    """ Deliver encoded batches through a RegistrationClient (shared keep-alive session). """
+
+    def __init__(self, client=None):
+        if client is None:
+            from .registration import RegistrationClient
+
+            # One attempt per drain: the outbox itself schedules the retries
+            client = RegistrationClient(SYNC_URI, retries=1)
+        self.client = client
+
+    def __call__(self, body: bytes, headers: dict):
+        self.client.send(body, headers)
+
+    def close(self):
+        self.client.close()
+
+
+class OutboxSender:
+    """ Background thread that drains an Outbox in batches. """
+
+    def __init__(self, outbox: Outbox, transport=None, batch_size: int = BATCH_SIZE, interval: float = 30.0):
+        self.outbox = outbox
+        self.transport = transport or HttpTransport()
+        self.batch_size = batch_size
+        self.interval = interval
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._drain_lock = threading.Lock()
+        self._thread = None
+
+    def drain(self, cancel_event: threading.Event | None = None) -> int:
+        """
+        Send every due item now; stops at the first failed batch, or between
+        batches once cancel_event is set. Returns items delivered.
+        """
+        cancel_event = cancel_event or threading.Event()
+        delivered = 0
+        # Another drain (e.g. the background thread) may be mid-request: wait for it, but stay cancellable
+        while not self._drain_lock.acquire(timeout=0.1):
+            if cancel_event.is_set():
+                return delivered
+        try:
+            while not self._stop.is_set() and not cancel_event.is_set():
+                batch = self.outbox.next_batch(self.batch_size)
+                if not batch:
+                    break
+                sent, ok = self._send(batch)
+                delivered += sent
+                if not ok:
+                    break
+        finally:
+            self._drain_lock.release()
+        return delivered
+
+    def _send(self, batch) -> tuple:
+        """
+        Deliver one batch; returns (items delivered, ok). ok is False on a
+        transient failure (stop draining). A rejected batch is split in two and
+        each half sent on its own, so one bad item cannot take the others down.
+        """
+        ids = [row_id for row_id, _, _, _ in batch]
+        body, headers = encode_batch(batch)
+        try:
+            self.transport(body, headers)
+        except Exception as e:
+            if not is_rejection(e):
+                self.outbox.fail(ids, str(e))
+                return 0, False
+            if len(batch) == 1:
+                self.outbox.fail(ids, str(e), park=True)
+                return 0, True
+            delivered, half = 0, len(batch) // 2
+            for part in (batch[:half], batch[half:]):
+                sent, ok = self._send(part)
+                delivered += sent
+                if not ok:
+                    return delivered, False
+            return delivered, True
+        self.outbox.ack(ids)
+        return len(ids), True
+
+    def wake(self):
+        """Ask the sender to drain now (e.g. right after enqueue or when the network returns)."""
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.drain()
+            except Exception:
+                pass  # keep the sender alive; items stay queued
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="lockam-outbox", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float | None = None):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
@@ -0,0 +1,187 @@
+# Lockam - PC Intrusion Detection & Auto-Lock Software
+# lockam/core/profiling.py
+# Opt-in profiling: cProfile of startup, tracemalloc checkpoints, sampled call timing
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+'''
+# Turned on with `python run.py --profile` or LOCKAM_PROFILE=1. Every run gets
+# its own directory under lockam/storage/profiles/ (the oldest are deleted so
+# only `keep` runs remain) containing:
+#   startup.prof               cProfile stats up to "ready"
+#                              (python -m pstats, snakeviz, ...)
+#   NN-<label>.tracemalloc     tracemalloc.Snapshot.dump() at each checkpoint
+#                              (tracemalloc.Snapshot.load())
+#   memory.txt                 top allocation sites per checkpoint, readable as is
+#   calls.jsonl                sampled UserManager call timings, one JSON per line
+#   summary.json               checkpoints, sample counts, interpreter details
+# Code elsewhere calls profiling.checkpoint(label); it is a no-op unless a
+# profiler is active, so hooks can stay in place permanently.
+'''
+
+import cProfile
+import functools
+import json
+import os
+import platform
+import random
+import shutil
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+PROFILE_DIR = Path(__file__).resolve().parent.parent / "storage" / "profiles"
+KEEP_RUNS = 10
+SAMPLE_RATE = 0.1       # fraction of UserManager calls that are timed
+TRACE_FRAMES = 10       # stack depth recorded by tracemalloc
+TOP_ALLOCATIONS = 15    # lines per checkpoint in memory.txt
+
+# Methods timed by instrument_user_manager()
+USER_MANAGER_METHODS = (
+    "authenticate", "authenticate_user", "save_user", "add_user", "import_users",
+    "export_user_info", "get_user", "unlock", "check_session",
+)
+
+_active = None
+
+
+def active():
+    """The running Profiler, or None."""
+    return _active
+
+
+def checkpoint(label: str):
+    """Take a memory snapshot if profiling is on; otherwise do nothing."""
+    if _active is not None:
+        _active.snapshot(label)
+
+
+def rotate(directory: Path, keep: int):
+    """Delete all but the newest `keep` run directories."""
+    if not directory.exists():
+        return
+    runs = sorted(p for p in directory.iterdir() if p.is_dir())
+    for old in runs[: max(0, len(runs) - keep)]:
+        shutil.rmtree(old, ignore_errors=True)
+
+
+class Profiler:
+    """ One profiling session; files go to a fresh directory per run. """
+
+    def __init__(self, directory: Path = PROFILE_DIR, keep: int = KEEP_RUNS, sample_rate: float = SAMPLE_RATE, rng=None):
+        self.root = Path(directory)
+        self.keep = keep
+        self.sample_rate = sample_rate
+        self.rng = rng or random.Random()
+        self.run_dir = None
+        self.checkpoints = {}  # label -> seconds since start
+        self.samples = 0
+        self.calls = 0
+
+        self._profile = None
+        self._started = None
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._calls_file = None
+        self._first_auth = threading.Event()
+
+    def start(self):
+        """Create the run directory and start cProfile and tracemalloc."""
+        global _active
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        self.run_dir = self.root / f"{stamp}-{os.getpid()}"
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        rotate(self.root, self.keep)
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+        self._profile = cProfile.Profile()
+        self._started = time.perf_counter()
+        self._profile.enable()
+        _active = self
+        return self
+
+    def stop_startup(self):
+        """Stop cProfile and write startup.prof (call at the "ready" checkpoint)."""
+        if self._profile is None:
+            return
+        self._profile.disable()
+        self._profile.dump_stats(self.run_dir / "startup.prof")
+        self._profile = None
+
+    def snapshot(self, label: str):
+        """Dump a tracemalloc snapshot and append its top allocation sites to memory.txt."""
+        if self.run_dir is None or not tracemalloc.is_tracing():
+            return
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+            self.checkpoints[label] = time.perf_counter() - self._started
+        snap = tracemalloc.take_snapshot()
+        snap.dump(str(self.run_dir / f"{seq:02d}-{label}.tracemalloc"))
+        current, peak = tracemalloc.get_traced_memory()
+        lines = [f"== {label} (current {current / 1024:.0f} KiB, peak {peak / 1024:.0f} KiB)"]
+        lines += [str(stat) for stat in snap.statistics("lineno")[:TOP_ALLOCATIONS]]
+        with self._lock, open(self.run_dir / "memory.txt", "a") as f:
+            f.write("\n".join(lines) + "\n\n")
+
+    def _record_call(self, name, elapsed, ok):
+        entry = {"ts": time.time(), "method": name, "ms": round(elapsed * 1000, 3), "ok": ok}
+        with self._lock:
+            self.samples += 1
+            if self._calls_file is None:
+                self._calls_file = open(self.run_dir / "calls.jsonl", "a")
+            self._calls_file.write(json.dumps(entry) + "\n")
+            self._calls_file.flush()
+
+    def _wrap(self, name, method):
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            self.calls += 1
+            if self.rng.random() >= self.sample_rate:
+                result = method(*args, **kwargs)
+            else:
+                start, ok = time.perf_counter(), False
+                try:
+                    result = method(*args, **kwargs)
+                    ok = True
+                finally:
+                    self._record_call(name, time.perf_counter() - start, ok)
+            if name == "authenticate" and not self._first_auth.is_set():
+                self._first_auth.set()
+                self.snapshot("first_auth")
+            return result
+        return timed
+
+    def instrument_user_manager(self, user_manager, methods=USER_MANAGER_METHODS):
+        """Wrap the given methods on this instance with sampled timing."""
+        for name in methods:
+            method = getattr(user_manager, name, None)
+            if method is not None:
+                setattr(user_manager, name, self._wrap(name, method))
+        return user_manager
+
+    def close(self):
+        """Flush files, write summary.json and stop tracing."""
+        global _active
+        if self.run_dir is None:
+            return
+        self.stop_startup()
+        with self._lock:
+            if self._calls_file is not None:
+                self._calls_file.close()
+                self._calls_file = None
+        summary = {
+            "checkpoints_s": self.checkpoints,
+            "user_manager_calls": self.calls,
+            "user_manager_samples": self.samples,
+            "sample_rate": self.sample_rate,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        }
+        (self.run_dir / "summary.json").write_text(json.dumps(summary, indent=2))
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        if _active is self:
+            _active = None
@@ -0,0 +1,102 @@
+# Lockam - PC Intrusion Detection & Auto-Lock Software
+# lockam/core/registration.py
+# Device registration client (HTTP, keep-alive, retry with jittered backoff)
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+'''
+# Qt-free on purpose: registration data goes through the outbox, whose
+# HttpTransport calls RegistrationClient.send() from the wizard's worker
+# thread or the background OutboxSender, while tests drive it directly
+# against a local stand-in HTTP server.
+'''
+
+import random
+import threading
+
+SERVER_URI = "https://lockam.sanni.com.ng/api/register_device"  # Server endpoint
+
+
+class RegistrationCancelled(Exception):
+    """Raised when the user cancels a submission that is still retrying."""
+
+
+class RegistrationClient:
+    """ POST registration payloads over one reusable keep-alive session. """
+
+    def __init__(
+        self,
+        url: str = SERVER_URI,
+        retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 8.0,
+        timeout: float = 10,
+        session=None,
+        rng=random.random,
+    ):
+        self.url = url
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.rng = rng
+        self._session = session
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        """requests.Session with a small connection pool (created on first use)."""
+        with self._lock:
+            if self._session is None:
+                import requests  # deferred: not needed until something is sent
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=2))
+                session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=2))
+                self._session = session
+            return self._session
+
+    def _delay(self, attempt: int) -> float:
+        # "Full jitter": uniform in [0, capped exponential backoff]
+        return self.rng() * min(self.max_backoff, self.backoff * (2 ** (attempt - 1)))
+
+    def send(self, body: bytes, headers=None, progress=None, cancel_event: threading.Event | None = None):
+        """
+        POST a pre-encoded body (e.g. a gzip'd outbox batch), retrying transient
+        failures (connection errors, 5xx, 429).
+        progress(attempt, retries, message) is called before each attempt.
+        Returns the successful requests.Response; raises the last error otherwise.
+        """
+        import requests
+
+        cancel_event = cancel_event or threading.Event()
+        last_error = None
+        for attempt in range(1, self.retries + 1):
+            if cancel_event.is_set():
+                raise RegistrationCancelled()
+            if progress:
+                progress(attempt, self.retries, f"Contacting server (attempt {attempt}/{self.retries})...")
+
+            try:
+                r = self.session.post(self.url, data=body, headers=headers, timeout=self.timeout)
+                r.raise_for_status()
+                return r
+            except requests.HTTPError as e:
+                status = e.response.status_code
+                if status < 500 and status != 429:
+                    raise  # the server rejected the payload; retrying won't help
+                last_error = e
+            except requests.RequestException as e:
+                last_error = e
+
+            if attempt < self.retries and cancel_event.wait(self._delay(attempt)):
+                raise RegistrationCancelled()
+
+        raise last_error
+
+    def close(self):
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
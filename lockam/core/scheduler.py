@@ -0,0 +1,325 @@
+# Lockam - PC Intrusion Detection & Auto-Lock Software
+# lockam/core/scheduler.py
+# Adaptive camera sampling: capture rate follows user activity and threat state
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+'''
+# States, checked in priority order:
+#   locked - the lock screen is up: full rate
+#   alert  - a suspicious event happened within alert_hold seconds: full rate
+#   active - an authenticated user gave input within idle_after seconds:
+#            one frame every active_interval seconds
+#   idle   - otherwise: the interval shrinks geometrically from active_interval
+#            to full_interval over ramp_seconds of inactivity
+# Activity sources are plain callables returning the time of the last user
+# input on the scheduler's clock (or None if unknown); the most recent wins.
+# The clock is injectable, so tests and what-if simulations run on
+# SimulatedClock instead of waiting in real time.
+'''
+
+import os
+import subprocess
+import sys
+import threading
+import time
+
+ACTIVE = "active"
+IDLE = "idle"
+ALERT = "alert"
+LOCKED = "locked"
+STATES = (ACTIVE, IDLE, ALERT, LOCKED)
+
+FULL_INTERVAL = 1 / 15   # seconds between frames at full rate (15 fps)
+ACTIVE_INTERVAL = 5.0    # seconds between frames while the owner is typing
+IDLE_AFTER = 10.0        # seconds without input before ramping up
+RAMP_SECONDS = 60.0      # idle time to go from ACTIVE_INTERVAL to FULL_INTERVAL
+ALERT_HOLD = 120.0       # seconds at full rate after a suspicious event
+LOGIND_REFRESH = 2.0     # seconds between loginctl queries for the idle hint
+
+
+class SimulatedClock:
+    """ Manually advanced clock for tests and simulations. """
+
+    def __init__(self, start: float = 0.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+class ManualActivity:
+    """ Activity source fed by the application (e.g. key/mouse events in the GUI). """
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.last = None
+
+    def touch(self):
+        self.last = self.clock()
+
+    def __call__(self):
+        return self.last
+
+
+def system_idle_source(clock=time.monotonic):
+    """
+    Activity source backed by the OS input idle timer, or None if unsupported.
+    Currently Windows only (GetLastInputInfo); elsewhere feed a ManualActivity.
+    """
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class LASTINPUTINFO(ctypes.Structure):
+            _fields_ = [("cbSize", wintypes.UINT), ("dwTime", wintypes.DWORD)]
+
+        user32, kernel32 = ctypes.windll.user32, ctypes.windll.kernel32
+    except (ImportError, AttributeError):
+        return None
+
+    info = LASTINPUTINFO(cbSize=ctypes.sizeof(LASTINPUTINFO))
+
+    def last_input():
+        if not user32.GetLastInputInfo(ctypes.byref(info)):
+            return None
+        idle_ms = (kernel32.GetTickCount() - info.dwTime) & 0xFFFFFFFF
+        return clock() - idle_ms / 1000.0
+
+    return last_input
+
+
+def logind_properties(*names) -> dict | None:
+    """Properties of this login session from `loginctl show-session`; None if logind can't answer."""
+    cmd = ["loginctl", "show-session", os.getenv("XDG_SESSION_ID", "auto"), *(f"--property={n}" for n in names)]
+    try:
+        out = subprocess.run(cmd, timeout=2, capture_output=True, text=True)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if out.returncode != 0:
+        return None
+    return dict(line.split("=", 1) for line in out.stdout.splitlines() if "=" in line)
+
+
+def _logind_idle_since():
+    """time.monotonic() at which the session went idle, "active", or None if there is no usable hint."""
+    props = logind_properties("IdleHint", "IdleSinceHintMonotonic")
+    if props is None or props.get("IdleHint") not in ("yes", "no"):
+        return None
+    if props["IdleHint"] == "no":
+        return "active"
+    since_us = int(props.get("IdleSinceHintMonotonic") or 0)  # CLOCK_MONOTONIC, as time.monotonic()
+    return since_us / 1e6 if since_us else None
+
+
+def logind_idle_source(clock=time.monotonic, refresh: float = LOGIND_REFRESH):
+    """
+    Activity source backed by logind's IdleHint / IdleSinceHintMonotonic
+    (Linux), or None if this session has no usable idle hint. The desktop
+    sets the hint after its own idle delay, so ramping starts that much later
+    than with an input timer. loginctl is asked at most once per `refresh`.
+    """
+    if not sys.platform.startswith("linux") or _logind_idle_since() is None:
+        return None
+    cache = {"at": None, "idle_since": None}
+
+    def last_input():
+        now = time.monotonic()
+        if cache["at"] is None or now - cache["at"] >= refresh:
+            cache["at"], cache["idle_since"] = now, _logind_idle_since()
+        idle_since = cache["idle_since"]
+        if idle_since is None or idle_since == "active":
+            return clock()  # not idle (or logind stopped answering): treat as input just now
+        return clock() - (now - idle_since)  # idle for now - idle_since, on the caller's clock
+
+    return last_input
+
+
+def default_activity_source(clock=time.monotonic):
+    """
+    The OS input idle timer (Windows), else logind's idle hint (Linux).
+    Fallback where neither works (macOS, sessions without logind): the clock
+    itself, i.e. "input just now". An authenticated session then stays at
+    the low active rate and never ramps to full rate, as idleness can't be
+    observed.
+    """
+    return system_idle_source(clock) or logind_idle_source(clock) or clock
+
+
+class SamplingScheduler:
+    """ Decides how often the detector grabs and analyses a frame. """
+
+    def __init__(
+        self,
+        sources=(),
+        clock=time.monotonic,
+        full_interval: float = FULL_INTERVAL,
+        active_interval: float = ACTIVE_INTERVAL,
+        idle_after: float = IDLE_AFTER,
+        ramp_seconds: float = RAMP_SECONDS,
+        alert_hold: float = ALERT_HOLD,
+    ):
+        if not 0 < full_interval <= active_interval:
+            raise ValueError("Intervals must satisfy 0 < full_interval <= active_interval.")
+        self.sources = list(sources)
+        self.clock = clock
+        self.full_interval = full_interval
+        self.active_interval = active_interval
+        self.idle_after = idle_after
+        self.ramp_seconds = ramp_seconds
+        self.alert_hold = alert_hold
+
+        self.authenticated = False
+        self.locked = False
+        self._alert_until = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+
+        self._started = clock()
+        self._state = None
+        self._since = self._started
+        self._time_in = dict.fromkeys(STATES, 0.0)
+        self._frames_in = dict.fromkeys(STATES, 0)
+
+    # -- inputs ---------------------------------------------------------------
+
+    def add_source(self, source):
+        self.sources.append(source)
+
+    def set_authenticated(self, authenticated: bool):
+        self.authenticated = authenticated
+        self._changed()
+
+    def set_locked(self, locked: bool):
+        self.locked = locked
+        self._changed()
+
+    def notify_suspicious(self):
+        """Go to full rate now and stay there for alert_hold seconds."""
+        self._alert_until = self.clock() + self.alert_hold
+        self._changed()
+
+    def _changed(self):
+        with self._lock:
+            self._observe(self.clock())
+        self._wake.set()  # cut a long wait short so the new rate applies now
+
+    # -- decisions ------------------------------------------------------------
+
+    def last_activity(self):
+        stamps = [t for t in (source() for source in self.sources) if t is not None]
+        return max(stamps) if stamps else None
+
+    def _evaluate(self, now):
+        """Return (state, interval) at time now."""
+        if self.locked:
+            return LOCKED, self.full_interval
+        if self._alert_until is not None and now < self._alert_until:
+            return ALERT, self.full_interval
+        last = self.last_activity()
+        idle_for = float("inf") if last is None else now - last
+        if self.authenticated and idle_for < self.idle_after:
+            return ACTIVE, self.active_interval
+        if not self.authenticated or self.ramp_seconds <= 0:
+            return IDLE, self.full_interval  # nobody vouched for the person in front of the camera
+        progress = min(1.0, (idle_for - self.idle_after) / self.ramp_seconds)
+        # geometric ramp: each second idle shortens the interval by the same factor
+        return IDLE, self.active_interval * (self.full_interval / self.active_interval) ** progress
+
+    def _observe(self, now):
+        state, interval = self._evaluate(now)
+        if self._state is not None:
+            self._time_in[self._state] += now - self._since
+        self._state, self._since = state, now
+        return state, interval
+
+    def state(self) -> str:
+        with self._lock:
+            return self._observe(self.clock())[0]
+
+    def next_interval(self) -> float:
+        """Seconds to wait before the next frame."""
+        with self._lock:
+            return self._observe(self.clock())[1]
+
+    def record_frame(self):
+        """Count one analysed frame against the current state."""
+        with self._lock:
+            state, _ = self._observe(self.clock())
+            self._frames_in[state] += 1
+
+    # -- loops ----------------------------------------------------------------
+
+    def wait(self, stop_event: threading.Event | None = None) -> bool:
+        """
+        Sleep until the next frame is due (real time). Returns False once
+        stop_event is set. State changes wake the wait early.
+        """
+        deadline = time.monotonic() + self.next_interval()
+        while True:
+            if stop_event is not None and stop_event.is_set():
+                return False
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return True
+            self._wake.clear()
+            if self._wake.wait(min(remaining, 0.25)):
+                deadline = min(deadline, time.monotonic() + self.next_interval())
+
+    def run(self, analyse, stop_event: threading.Event):
+        """Call analyse() at the scheduled rate until stop_event is set."""
+        while self.wait(stop_event):
+            analyse()
+            self.record_frame()
+
+    def simulate(self, duration: float, analyse=None, events=()):
+        """
+        Advance a SimulatedClock through `duration` seconds, analysing frames
+        as the schedule dictates. events: (at_offset, callable) pairs fired
+        when the clock reaches them (e.g. lambda: activity.touch()).
+        """
+        if not isinstance(self.clock, SimulatedClock):
+            raise ValueError("simulate() needs a SimulatedClock.")
+        end = self.clock() + duration
+        pending = sorted(((self.clock() + at, i, fn) for i, (at, fn) in enumerate(events)), key=lambda e: e[:2])
+        while self.clock() < end:
+            due = self.clock() + self.next_interval()
+            while pending and pending[0][0] <= min(due, end):
+                at, _, fn = pending.pop(0)
+                self.clock.now = at
+                fn()
+                due = min(due, self.clock() + self.next_interval())
+            if due > end:
+                self.clock.now = end
+                break
+            self.clock.now = due
+            if analyse is not None:
+                analyse()
+            self.record_frame()
+        self.state()  # close the books on the current state
+
+    # -- reporting ------------------------------------------------------------
+
+    def stats(self) -> dict:
+        """Time spent and frames analysed per state, plus frames/hour against full rate."""
+        with self._lock:
+            now = self.clock()
+            self._observe(now)
+            elapsed = now - self._started
+            time_in = dict(self._time_in)
+            frames_in = dict(self._frames_in)
+        frames = sum(frames_in.values())
+        hours = elapsed / 3600.0
+        full_rate_frames = elapsed / self.full_interval
+        return {
+            "elapsed": elapsed,
+            "time_in_state": time_in,
+            "frames_in_state": frames_in,
+            "frames": frames,
+            "frames_per_hour": frames / hours if hours else 0.0,
+            "full_rate_frames_per_hour": 3600.0 / self.full_interval,
+            "savings": 1.0 - frames / full_rate_frames if full_rate_frames else 0.0,
+        }
@@ -0,0 +1,102 @@
+# Lockam - PC Intrusion Detection & Auto-Lock Software
+# lockam/core/session.py
+# Short-lived unlock sessions
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+'''
+# After a successful unlock the user gets a session token. Follow-up privileged
+# actions (settings, intrusion logs, export) check the token instead of asking
+# for the password and running the key derivation again.
+# Tokens are HMAC-signed with a per-process key and only live in memory, so a
+# restart or an auto-lock (revoke_all) ends every session.
+'''
+
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+from dataclasses import dataclass
+
+DEFAULT_TTL = 10 * 60.0          # hard session lifetime, seconds
+DEFAULT_IDLE_TIMEOUT = 2 * 60.0  # session ends after this long without use
+
+
+@dataclass
+class Session:
+    username: str
+    expires_at: float
+    last_used: float
+
+
+class SessionManager:
+    """ Issue, validate and revoke in-memory unlock sessions. """
+
+    def __init__(self, ttl: float = DEFAULT_TTL, idle_timeout: float = DEFAULT_IDLE_TIMEOUT, clock=time.monotonic):
+        self.ttl = ttl
+        self.idle_timeout = idle_timeout
+        self.clock = clock
+        self._key = os.urandom(32)
+        self._lock = threading.Lock()
+        self._sessions = {}  # session id -> Session
+
+    def _sign(self, session_id: str) -> str:
+        # Token text is untrusted: utf-8 accepts anything a caller can pass in
+        return hmac.new(self._key, session_id.encode("utf-8", "surrogatepass"), hashlib.sha256).hexdigest()
+
+    def _expired(self, session: Session, now: float) -> bool:
+        return now >= session.expires_at or now - session.last_used >= self.idle_timeout
+
+    def _prune(self, now: float):
+        """Drop sessions that expired without being validated again (caller holds the lock)."""
+        for session_id in [sid for sid, s in self._sessions.items() if self._expired(s, now)]:
+            del self._sessions[session_id]
+
+    def issue(self, username: str) -> str:
+        """Start a session for a freshly authenticated user and return its token."""
+        session_id = secrets.token_urlsafe(16)
+        now = self.clock()
+        with self._lock:
+            self._prune(now)
+            self._sessions[session_id] = Session(username, now + self.ttl, now)
+        return f"{session_id}.{self._sign(session_id)}"
+
+    def _session_id(self, token: str) -> str | None:
+        session_id, _, signature = (token or "").partition(".")
+        if not signature or not hmac.compare_digest(signature.encode("utf-8", "surrogatepass"), self._sign(session_id).encode("ascii")):
+            return None
+        return session_id
+
+    def validate(self, token: str) -> str | None:
+        """Return the session's username if the token is valid, refreshing its idle timer."""
+        session_id = self._session_id(token)
+        if session_id is None:
+            return None
+
+        now = self.clock()
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            if self._expired(session, now):
+                del self._sessions[session_id]
+                return None
+            session.last_used = now
+            return session.username
+
+    def revoke(self, token: str):
+        session_id = self._session_id(token)
+        if session_id is not None:
+            with self._lock:
+                self._sessions.pop(session_id, None)
+
+    def revoke_all(self):
+        """End every session immediately (called when the screen auto-locks)."""
+        with self._lock:
+            self._sessions.clear()
+
+    def active_count(self) -> int:
+        with self._lock:
+            return len(self._sessions)
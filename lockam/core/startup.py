@@ -0,0 +1,62 @@
+# Lockam - PC Intrusion Detection & Auto-Lock Software
+# lockam/core/startup.py
+# Startup timing report (import time per module, time-to-ready)
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+'''
+# run.py imports its modules through StartupReport.timed_import() and marks
+# checkpoints as it goes; `python run.py --startup-report` (or
+# LOCKAM_STARTUP_REPORT=1) prints the result.
+'''
+
+import importlib
+import time
+
+# Deliberately no lockam imports at module level: run.py imports this first and
+# everything imported after it should show up in the report.
+
+
+class StartupReport:
+    """ Collect import durations and checkpoints relative to process start-up. """
+
+    def __init__(self, clock=time.perf_counter, started: float | None = None):
+        self.clock = clock
+        self.started = clock() if started is None else started  # pass the earliest clock() reading
+        self.imports = {}      # module name -> ms spent importing it
+        self.checkpoints = {}  # label -> ms since start
+
+    def timed_import(self, name: str):
+        """Import a module and record how long it took (0 if it was already loaded)."""
+        start = self.clock()
+        module = importlib.import_module(name)
+        ms = self.imports[name] = (self.clock() - start) * 1000
+        from . import metrics
+
+        metrics.gauge("lockam_startup_import_seconds", "Module import time at startup", module=name).set(ms / 1000)
+        return module
+
+    def checkpoint(self, label: str):
+        ms = self.checkpoints[label] = (self.clock() - self.started) * 1000
+        from . import metrics
+
+        metrics.gauge("lockam_startup_checkpoint_seconds", "Time from start to a checkpoint", label=label).set(ms / 1000)
+
+    @property
+    def time_to_ready(self) -> float | None:
+        return self.checkpoints.get("ready")
+
+    def as_dict(self) -> dict:
+        return {
+            "imports_ms": dict(self.imports),
+            "checkpoints_ms": dict(self.checkpoints),
+            "time_to_ready_ms": self.time_to_ready,
+        }
+
+    def format(self) -> str:
+        lines = ["Startup report:"]
+        for name, ms in self.imports.items():
+            lines.append(f"  import {name:<32} {ms:8.1f} ms")
+        for label, ms in self.checkpoints.items():
+            lines.append(f"  {label:<39} {ms:8.1f} ms")
+        return "\n".join(lines)
@@ -0,0 +1,139 @@
+# Lockam - PC Intrusion Detection & Auto-Lock Software
+# lockam/core/throttle.py
+# Failed-attempt throttling in front of password verification
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+'''
+# Every password attempt spends one token from a small bucket that refills
+# slowly. Once `capacity` attempts in a row have failed, further attempts are
+# locked out with an exponentially growing delay. Rejections are decided from
+# in-memory state alone, so a guesser never gets to run the key derivation.
+# The state is written to lockam.db so restarting Lockam does not reset it.
+'''
+
+import threading
+import time
+from dataclasses import dataclass
+
+from .db import ConnectionManager
+
+
+@dataclass
+class ThrottleState:
+    """ Snapshot for the UI: whether an attempt is allowed now and, if not, for how long. """
+
+    allowed: bool
+    retry_after: float  # seconds until the next attempt is accepted
+    failures: int       # consecutive failed attempts
+    tokens: float       # attempts left in the bucket
+
+
+class AttemptLimiter:
+    """ Token bucket with exponential lockout, persisted per scope in lockam.db. """
+
+    def __init__(
+        self,
+        db: ConnectionManager,
+        scope: str = "local_user",
+        capacity: int = 5,
+        refill_seconds: float = 30.0,
+        base_delay: float = 1.0,
+        max_delay: float = 15 * 60.0,
+        clock=time.time,
+    ):
+        self.db = db
+        self.scope = scope
+        self.capacity = capacity
+        self.refill_seconds = refill_seconds
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.clock = clock  # wall clock: lockouts must survive restarts
+
+        self._lock = threading.Lock()
+        self._loaded = False  # state is read from lockam.db on first use
+        self.db.add_initializer(self._init_db)
+
+    @staticmethod
+    def _init_db(conn):
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS auth_throttle (
+                scope TEXT PRIMARY KEY,
+                tokens REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                failures INTEGER NOT NULL,
+                locked_until REAL NOT NULL
+            )
+            """
+        )
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        row = self.db.get().execute(
+            "SELECT tokens, updated_at, failures, locked_until FROM auth_throttle WHERE scope = ?",
+            (self.scope,),
+        ).fetchone()
+        if row:
+            self._tokens, self._updated_at, self._failures, self._locked_until = row
+        else:
+            self._tokens, self._updated_at = float(self.capacity), self.clock()
+            self._failures, self._locked_until = 0, 0.0
+
+    def _save(self):
+        with self.db.transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO auth_throttle (scope, tokens, updated_at, failures, locked_until) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (self.scope, self._tokens, self._updated_at, self._failures, self._locked_until),
+            )
+
+    def _refill(self, now: float):
+        elapsed = max(now - self._updated_at, 0.0)
+        self._tokens = min(self.capacity, self._tokens + elapsed / self.refill_seconds)
+        self._updated_at = now
+
+    def _retry_after(self, now: float) -> float:
+        if now < self._locked_until:
+            return self._locked_until - now
+        if self._tokens < 1:
+            return (1 - self._tokens) * self.refill_seconds
+        return 0.0
+
+    def state(self) -> ThrottleState:
+        """Current state without consuming an attempt (e.g. to drive a countdown)."""
+        with self._lock:
+            self._load()
+            now = self.clock()
+            self._refill(now)
+            retry_after = self._retry_after(now)
+            return ThrottleState(retry_after == 0.0, retry_after, self._failures, self._tokens)
+
+    def acquire(self) -> bool:
+        """Spend a token for one attempt; False means reject without verifying."""
+        with self._lock:
+            self._load()
+            now = self.clock()
+            self._refill(now)
+            if self._retry_after(now) > 0:
+                return False
+            self._tokens -= 1
+            return True
+
+    def record_failure(self):
+        with self._lock:
+            self._load()
+            self._failures += 1
+            if self._failures >= self.capacity:
+                excess = self._failures - self.capacity
+                delay = min(self.max_delay, self.base_delay * (2 ** min(excess, 32)))
+                self._locked_until = self.clock() + delay
+            self._save()
+
+    def record_success(self):
+        with self._lock:
+            self._tokens, self._updated_at = float(self.capacity), self.clock()
+            self._failures, self._locked_until = 0, 0.0
+            self._save()
@@ -1,115 +1,418 @@
 # Lockam - PC Intrusion Detection & Auto-Lock Software
 # lockam/core/user_manager.py
-# User management for Lockam (Handles one local user per device (no remote control, no multi-user system))
+# User management for Lockam (device owner created by the setup wizard + additional local users with roles)
 # Copyright (c) 2025 Muhammad Sanni
 # All rights reserved. See LICENSE for details.
 
-import sqlite3
+import threading
+from itertools import islice
 from pathlib import Path
 import json
+import os
 import platform
+import sqlite3
 from datetime import datetime, timezone
-from . import utils
+from . import kdf, metrics, utils
+from .db import ConnectionManager
+from .session import SessionManager
+from .throttle import AttemptLimiter
+
+ROLES = ("admin", "user", "guest")
+IMPORT_CHUNK_SIZE = 256  # users hashed per parallel batch during import_users()
+EXPORT_BATCH_SIZE = 500  # rows fetched per round trip while streaming exports
+
+_UNSET = object()
+_USER_COLUMNS = "id, username, role, password_hash, created_at"
+
+
+AUTH_ATTEMPTS = {
+    result: metrics.counter("lockam_auth_attempts_total", "Password attempts by outcome", result=result)
+    for result in ("success", "failure", "throttled")
+}
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
 
 
 class UserManager:
     def __init__(self, db_path: Path):
         self.db_path = db_path
-        self._init_db()
+        self.db = ConnectionManager(db_path)
+
+        # In-memory copy of the owner's row, dropped whenever it is written
+        self._cache_lock = threading.Lock()
+        self._cached_user = _UNSET
+        self._cache_generation = 0
+
+        self._kdf_policy = None  # (algorithm, params), loaded from settings on first use
+
+        self._verifier = None
+        self._verifier_lock = threading.Lock()
+
+        # Schema is created on first database access, not here (keeps create_app() cheap)
+        self.db.add_initializer(self._init_db)
+        self.limiter = AttemptLimiter(self.db)  # owner's limiter
+        self._limiters = {}                     # username -> AttemptLimiter for other users
+        self._limiters_lock = threading.Lock()
+        self.sessions = SessionManager()
 
     def _get_conn(self):
-        return sqlite3.connect(self.db_path)
+        return self.db.get()
 
-    def _init_db(self):
-        """Initialize local user table (single user only)."""
-        conn = self._get_conn()
-        cursor = conn.cursor()
-        cursor.execute(
+    def _init_db(self, conn):
+        """Initialize users and settings tables, migrating the old single-user table."""
+        conn.execute(
             """
-            CREATE TABLE IF NOT EXISTS local_user (
+            CREATE TABLE IF NOT EXISTS users (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 username TEXT NOT NULL,
-                salt TEXT NOT NULL,
+                role TEXT NOT NULL DEFAULT 'user',
                 password_hash TEXT NOT NULL,
+                is_owner INTEGER NOT NULL DEFAULT 0,
                 created_at TEXT NOT NULL
             )
             """
         )
-        conn.commit()
-        conn.close()
+        conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_users_username ON users (username)")
+        # At most one owner (the account created by the setup wizard)
+        conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_users_owner ON users (is_owner) WHERE is_owner = 1")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS settings (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            )
+            """
+        )
+        self._migrate_local_user(conn)
+
+    def _migrate_local_user(self, conn):
+        """Move the pre-multi-user `local_user` row into `users` as the owner."""
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'local_user'"
+        ).fetchone()
+        if not exists:
+            return
+
+        row = conn.execute("SELECT username, salt, password_hash, created_at FROM local_user LIMIT 1").fetchone()
+        if row:
+            username, salt, stored_hash, created_at = row
+            # Rows written before the KDF registry keep a hex salt in its own column
+            encoded = kdf.encode_legacy(salt, stored_hash) if salt else stored_hash
+            conn.execute(
+                "INSERT INTO users (username, role, password_hash, is_owner, created_at) VALUES (?, 'admin', ?, 1, ?)",
+                (username, encoded, created_at),
+            )
+        conn.execute("DROP TABLE local_user")
+
+    def _get_setting(self, key: str):
+        row = self._get_conn().execute("SELECT value FROM settings WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
 
+    def _set_setting(self, key: str, value):
+        with self.db.transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)", (key, json.dumps(value))
+            )
+
+    @property
+    def kdf_policy(self):
+        """(algorithm, params) used for new hashes; stored hashes that differ are upgraded on login."""
+        if self._kdf_policy is None:
+            stored = self._get_setting("kdf_policy")
+            if stored:
+                self._kdf_policy = (stored["algorithm"], stored["params"])
+            else:
+                self._kdf_policy = (kdf.DEFAULT_ALGORITHM, kdf.resolve_params(kdf.DEFAULT_ALGORITHM))
+        return self._kdf_policy
+
+    def set_kdf_policy(self, algorithm: str, params: dict):
+        """Persist the hashing algorithm/parameters for this machine."""
+        params = kdf.resolve_params(algorithm, params)
+        self._set_setting("kdf_policy", {"algorithm": algorithm, "params": params})
+        self._kdf_policy = (algorithm, params)
+
+    def calibrate_kdf(self, algorithm: str = kdf.DEFAULT_ALGORITHM, target_ms: float = 250) -> dict:
+        """Tune hashing cost to this machine's CPU and store it as the policy."""
+        params = kdf.calibrate(algorithm, target_ms)
+        self.set_kdf_policy(algorithm, params)
+        return params
+
+    def _load_user(self):
+        """Return the owner's (id, username, role, password_hash, created_at) or None, served from cache."""
+        with self._cache_lock:
+            if self._cached_user is not _UNSET:
+                return self._cached_user
+            generation = self._cache_generation
+
+        row = self._get_conn().execute(
+            f"SELECT {_USER_COLUMNS} FROM users WHERE is_owner = 1"
+        ).fetchone()
+
+        with self._cache_lock:
+            # A write that raced with this read wins; don't cache the stale row
+            if generation == self._cache_generation:
+                self._cached_user = row
+        return row
+
+    def _get_user_row(self, username: str):
+        """Indexed lookup of one user's row."""
+        return self._get_conn().execute(
+            f"SELECT {_USER_COLUMNS} FROM users WHERE username = ?", (username,)
+        ).fetchone()
+
+    def _invalidate_cache(self):
+        with self._cache_lock:
+            self._cached_user = _UNSET
+            self._cache_generation += 1
+
+    @staticmethod
+    def _check_role(role: str):
+        if role not in ROLES:
+            raise ValueError(f"Unknown role: {role}")
+
+    @metrics.instrument("user_manager_save_user")
     def save_user(self, username: str, password: str) -> bool:
-        """Store or update local user credentials."""
-        salt, pwd_hash = utils.hash_password(password)
-        conn = self._get_conn()
-        cursor = conn.cursor()
-
-        # Only one local user record — replace if exists
-        cursor.execute("DELETE FROM local_user")
-        cursor.execute(
-            "INSERT INTO local_user (username, salt, password_hash, created_at) VALUES (?, ?, ?, ?)",
-            (username, salt, pwd_hash, datetime.now(timezone.utc).isoformat()),
-        )
-        conn.commit()
-        conn.close()
+        """Store or replace the device owner (admin) credentials."""
+        pwd_hash = utils.hash_password(password, *self.kdf_policy)
+        with self.db.transaction() as conn:
+            # Only one owner — replace if exists (also frees the username if a regular user had it)
+            conn.execute("DELETE FROM users WHERE is_owner = 1 OR username = ?", (username,))
+            conn.execute(
+                "INSERT INTO users (username, role, password_hash, is_owner, created_at) VALUES (?, 'admin', ?, 1, ?)",
+                (username, pwd_hash, _now()),
+            )
+        self._invalidate_cache()
+        return True
+
+    @metrics.instrument("user_manager_add_user")
+    def add_user(self, username: str, password: str, role: str = "user") -> bool:
+        """Create an additional local user; False if the username is taken."""
+        self._check_role(role)
+        pwd_hash = utils.hash_password(password, *self.kdf_policy)
+        try:
+            with self.db.transaction() as conn:
+                conn.execute(
+                    "INSERT INTO users (username, role, password_hash, created_at) VALUES (?, ?, ?, ?)",
+                    (username, role, pwd_hash, _now()),
+                )
+        except sqlite3.IntegrityError:
+            return False
+        return True
+
+    @metrics.instrument("user_manager_import_users")
+    def import_users(self, records, workers: int | None = None) -> int:
+        """
+        Bulk-create users from an iterable of {"username", "password", "role"} dicts.
+        Hashing runs on a thread pool (the KDFs release the GIL) before the write
+        lock is taken; the rows are then inserted with executemany in one short
+        transaction, and a duplicate username aborts the whole import.
+        Returns the number of users imported.
+        """
+        records = iter(records)
+        algorithm, params = self.kdf_policy
+        created_at = _now()
+        rows = []
+
+        def prepare(record):
+            role = record.get("role", "user")
+            self._check_role(role)
+            pwd_hash = utils.hash_password(record["password"], algorithm, params)
+            return record["username"], role, pwd_hash, created_at
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        # No transaction while hashing: holding BEGIN IMMEDIATE through the KDF
+        # runs would lock every other writer (throttle, journal) out of lockam.db
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            while True:
+                chunk = list(islice(records, IMPORT_CHUNK_SIZE))
+                if not chunk:
+                    break
+                rows.extend(pool.map(prepare, chunk))
+
+        with self.db.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO users (username, role, password_hash, created_at) VALUES (?, ?, ?, ?)", rows
+            )
+        return len(rows)
+
+    def get_user(self, username: str) -> dict | None:
+        """Return a user's non-sensitive details."""
+        row = self._get_user_row(username)
+        if not row:
+            return None
+        _, username, role, _, created_at = row
+        return {"username": username, "role": role, "created_at": created_at}
+
+    def set_role(self, username: str, role: str) -> bool:
+        self._check_role(role)
+        with self.db.transaction() as conn:
+            updated = conn.execute("UPDATE users SET role = ? WHERE username = ?", (role, username)).rowcount
+        self._invalidate_cache()
+        return updated > 0
+
+    def delete_user(self, username: str) -> bool:
+        """Remove a non-owner user (the owner is only replaced through save_user)."""
+        with self.db.transaction() as conn:
+            deleted = conn.execute(
+                "DELETE FROM users WHERE username = ? AND is_owner = 0", (username,)
+            ).rowcount
+        return deleted > 0
+
+    def _limiter_for(self, username: str) -> AttemptLimiter:
+        owner = self._load_user()
+        if owner and owner[1] == username:
+            return self.limiter
+        with self._limiters_lock:
+            limiter = self._limiters.get(username)
+            if limiter is None:
+                limiter = self._limiters[username] = AttemptLimiter(self.db, scope=f"user:{username}")
+            return limiter
+
+    def _verify(self, row, password: str, limiter: AttemptLimiter) -> bool:
+        user_id, _, _, stored_hash, _ = row
+
+        # Throttled attempts are rejected before any hashing happens
+        if not limiter.acquire():
+            AUTH_ATTEMPTS["throttled"].inc()
+            return False
+
+        if not utils.verify_password(password, stored_hash):
+            limiter.record_failure()
+            AUTH_ATTEMPTS["failure"].inc()
+            return False
+        limiter.record_success()
+        AUTH_ATTEMPTS["success"].inc()
+
+        if kdf.needs_rehash(stored_hash, *self.kdf_policy):
+            self._rehash(user_id, stored_hash, password)
         return True
 
+    @metrics.instrument("user_manager_authenticate")
     def authenticate(self, password: str) -> bool:
-        """Verify password for local user."""
-        conn = self._get_conn()
-        cursor = conn.cursor()
-        cursor.execute("SELECT salt, password_hash FROM local_user LIMIT 1")
-        row = cursor.fetchone()
-        conn.close()
+        """Verify password for the device owner."""
+        row = self._load_user()
+        if not row:
+            return False
+        return self._verify(row, password, self.limiter)
 
+    @metrics.instrument("user_manager_authenticate_user")
+    def authenticate_user(self, username: str, password: str) -> bool:
+        """Verify password for any local user."""
+        row = self._get_user_row(username)
         if not row:
             return False
+        return self._verify(row, password, self._limiter_for(username))
+
+    def _rehash(self, user_id: int, old_hash: str, password: str):
+        """Re-store the password under the current policy (only if nobody changed it meanwhile)."""
+        new_hash = utils.hash_password(password, *self.kdf_policy)
+        with self.db.transaction() as conn:
+            conn.execute(
+                "UPDATE users SET password_hash = ? WHERE id = ? AND password_hash = ?",
+                (new_hash, user_id, old_hash),
+            )
+        self._invalidate_cache()
 
-        salt, stored_hash = row
-        return utils.verify_password(password, salt, stored_hash)
+    def unlock(self, password: str) -> str | None:
+        """Authenticate and, on success, return a session token for follow-up privileged actions."""
+        if not self.authenticate(password):
+            return None
+        return self.sessions.issue(self.get_local_username())
+
+    def check_session(self, token: str) -> bool:
+        """Cheap re-auth check for privileged actions: no key derivation involved."""
+        return self.sessions.validate(token) is not None
+
+    def lock(self):
+        """Auto-lock hook: revoke every unlock session so the next action needs the password."""
+        self.sessions.revoke_all()
+
+    @property
+    def verifier(self):
+        """Worker pool used by the non-blocking authenticate variants (created on first use)."""
+        from .auth import PasswordVerifier
+
+        with self._verifier_lock:
+            if self._verifier is None:
+                self._verifier = PasswordVerifier(self.authenticate)
+            return self._verifier
+
+    def authenticate_future(self, password: str, channel: str = "default"):
+        """Non-blocking authenticate(); returns a concurrent.futures.Future[bool]."""
+        return self.verifier.submit(password, channel)
+
+    async def authenticate_async(self, password: str, channel: str = "default") -> bool:
+        """Awaitable authenticate() that hashes on the worker pool."""
+        return await self.verifier.verify_async(password, channel)
 
     def get_local_username(self) -> str | None:
-        """Return the stored local username."""
-        conn = self._get_conn()
-        cursor = conn.cursor()
-        cursor.execute("SELECT username FROM local_user LIMIT 1")
-        row = cursor.fetchone()
-        conn.close()
-        return row[0] if row else None
+        """Return the device owner's username."""
+        row = self._load_user()
+        return row[1] if row else None
 
     def is_user_registered(self) -> bool:
-        """Check if a local user already exists."""
-        conn = self._get_conn()
-        cursor = conn.cursor()
-        cursor.execute("SELECT COUNT(*) FROM local_user")
-        count = cursor.fetchone()[0]
-        conn.close()
-        return count > 0
+        """Check if the device owner already exists."""
+        return self._load_user() is not None
+
+    def _system_info(self) -> dict:
+        return {
+            "system_name": platform.node(),
+            "os": platform.system(),
+            "os_version": platform.version(),
+        }
 
+    @metrics.instrument("user_manager_export_user_info")
     def export_user_info(self) -> dict:
         """
-        Export non-sensitive user info for reporting or remote documentation.
+        Export non-sensitive owner info for reporting or remote documentation.
         Returns a JSON-safe dict that can be sent to a remote API.
         """
-        conn = self._get_conn()
-        cursor = conn.cursor()
-        cursor.execute("SELECT username, created_at FROM local_user LIMIT 1")
-        row = cursor.fetchone()
-        conn.close()
-
+        row = self._load_user()
         if not row:
             return {}
 
-        username, created_at = row
-        info = {
-            "username": username,
-            "system_name": platform.node(),
-            "os": platform.system(),
-            "os_version": platform.version(),
-            "registered_at": created_at,
-        }
+        _, username, _, _, created_at = row
+        info = {"username": username, **self._system_info(), "registered_at": created_at}
         return info
 
     def export_user_info_json(self) -> str:
         """Convenience: return export info as JSON string."""
         return json.dumps(self.export_user_info(), indent=2)
+
+    def iter_user_info(self, batch_size: int = EXPORT_BATCH_SIZE):
+        """Stream non-sensitive info for every user, a batch of rows at a time."""
+        system = self._system_info()
+        cursor = self._get_conn().execute(
+            "SELECT username, role, is_owner, created_at FROM users ORDER BY id"
+        )
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            for username, role, is_owner, created_at in rows:
+                yield {
+                    "username": username,
+                    "role": role,
+                    "owner": bool(is_owner),
+                    **system,
+                    "registered_at": created_at,
+                }
+
+    def export_users_jsonl(self, fp) -> int:
+        """Write every user's export info to a text file object as JSON lines; returns the count."""
+        count = 0
+        for info in self.iter_user_info():
+            fp.write(json.dumps(info) + "\n")
+            count += 1
+        return count
+
+    def close(self):
+        """Stop the verification workers and close all pooled database connections."""
+        with self._verifier_lock:
+            verifier, self._verifier = self._verifier, None
+        if verifier is not None:
+            verifier.shutdown()
+        self.db.close()
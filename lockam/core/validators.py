@@ -8,18 +8,32 @@ This module contains input validation functions for the Lockam setup wizard.
 All functions return (bool, str):
  - bool -> True if valid
  - str  -> error message, or "" if valid
+
+For bulk provisioning, validate_record() checks every field of one record and
+returns (bool, [errors]); validate_many() streams those results for an
+iterable of records, optionally spread over worker processes.
 """
 
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import date
+from itertools import islice
+import os
 import re
 
+# Compiled once at import; the validators run for every record in a batch
+FULLNAME_RE = re.compile(r"^[A-Za-z0-9 .'-]{3,50}$")
+EMAIL_RE = re.compile(r"^[\w\.-]+@[\w\.-]+\.\w+$")
+USERNAME_RE = re.compile(r"^[A-Za-z0-9_.-]{3,32}$")
+
+CHUNK_SIZE = 1000  # records per task when validating in parallel
+
 
 def validate_fullname(name: str):
     """Validate full name: 3–50 chars, letters, numbers, space, '.', '-', ' allowed."""
     name = name.strip()
 
-    # FIXED: removed space in {3,50}
-    if not re.match(r"^[A-Za-z0-9 .'-]{3,50}$", name):
+    if not FULLNAME_RE.match(name):
         return False, "Invalid full name format."
 
     return True, ""
@@ -32,7 +46,7 @@ def validate_email(email: str):
     if email == "":
         return True, ""
 
-    if not re.match(r"^[\w\.-]+@[\w\.-]+\.\w+$", email):
+    if not EMAIL_RE.match(email):
         return False, "Invalid email address."
 
     return True, ""
@@ -42,8 +56,7 @@ def validate_username(username: str):
     """Validate username: 3–32 chars, alphanumeric + _ - ."""
     username = username.strip()
 
-    # FIXED: removed space in {3,32}
-    if not re.match(r"^[A-Za-z0-9_.-]{3,32}$", username):
+    if not USERNAME_RE.match(username):
         return False, "Invalid username format"
 
     return True, ""
@@ -79,17 +92,72 @@ def validate_dob(dob: date, min_age_years=5):
     return True, ""
 
 
+# Field name -> validator, in the order errors are reported
+FIELD_VALIDATORS = (
+    ("fullname", validate_fullname),
+    ("email", validate_email),
+    ("username", validate_username),
+    ("password", validate_password),
+    ("dob", validate_dob),
+)
+
+
+def validate_record(record: dict):
+    """Run all validators on one record and return (bool, [every error found])."""
+    errors = []
+    for field, fn in FIELD_VALIDATORS:
+        if field not in record:
+            errors.append(f"Missing field: {field}.")
+            continue
+        try:
+            valid, msg = fn(record[field])
+        except (TypeError, AttributeError, ValueError):
+            # Wrong type (e.g. dob as a string, password None): a field error,
+            # not a reason to abort the whole batch
+            valid, msg = False, f"Invalid value for {field}."
+        if not valid:
+            errors.append(msg)
+
+    return not errors, errors
+
+
+def _validate_chunk(records):
+    return [validate_record(record) for record in records]
+
+
+def validate_many(records, parallel: bool = False, workers: int | None = None, chunk_size: int = CHUNK_SIZE):
+    """
+    Validate an iterable of records, yielding (bool, [errors]) per record in input order.
+    Records are consumed lazily; with parallel=True chunks are checked in worker
+    processes with a bounded number of chunks in flight.
+    """
+    if not parallel:
+        for record in records:
+            yield validate_record(record)
+        return
+
+    records = iter(records)
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        max_in_flight = 2 * workers
+        in_flight = deque()
+        while True:
+            while len(in_flight) < max_in_flight:
+                chunk = list(islice(records, chunk_size))
+                if not chunk:
+                    break
+                in_flight.append(pool.submit(_validate_chunk, chunk))
+            if not in_flight:
+                return
+            yield from in_flight.popleft().result()
+
+
 def validate_inputs(fullname, email, username, password, dob):
     """Run all validators and return first error found."""
-    checks = [
-        (validate_fullname, fullname),
-        (validate_email, email),
-        (validate_username, username),
-        (validate_password, password),
-        (validate_dob, dob),
-    ]
-
-    for fn, value in checks:
+    values = (fullname, email, username, password, dob)
+
+    # Stops at the first failure, so later fields are never looked at
+    for (_, fn), value in zip(FIELD_VALIDATORS, values):
         valid, msg = fn(value)
         if not valid:
             return False, msg
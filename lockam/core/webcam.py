@@ -0,0 +1,180 @@
+# Lockam - PC Intrusion Detection & Auto-Lock Software
+# lockam/core/webcam.py
+# Webcam capture: dedicated grabber thread + fixed-size frame ring buffer
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+'''
+# The grabber thread reads each frame straight into a preallocated slot of a
+# NumPy ring buffer, so capture allocates nothing per frame and never waits
+# for recognition. Consumers copy the frame they want into their own reusable
+# buffer. Two drop policies:
+#  - DROP_OLDEST ("latest"): the camera always wins; a slow consumer jumps to
+#    the newest frame and the frames it skipped count as dropped.
+#  - DROP_NEWEST ("fifo"): frames are delivered in order; when the ring is
+#    full of unread frames, newly captured ones are discarded.
+# Sources only need read_into(buffer) -> bool, so tests use SyntheticSource
+# instead of a camera.
+'''
+
+import threading
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+
+
+@dataclass
+class CaptureStats:
+    captured: int = 0   # frames read from the source
+    dropped: int = 0    # frames never delivered to a consumer
+    processed: int = 0  # frames delivered to a consumer
+
+
+class FrameRing:
+    """ Preallocated ring of frames shared by one producer and its consumer. """
+
+    def __init__(self, capacity: int, shape: tuple, dtype=np.uint8, policy: str = DROP_OLDEST):
+        if capacity < 2:
+            raise ValueError("FrameRing needs at least 2 slots.")
+        if policy not in (DROP_OLDEST, DROP_NEWEST):
+            raise ValueError(f"Unknown drop policy: {policy}")
+        self.capacity = capacity
+        self.policy = policy
+        self.frames = np.empty((capacity, *shape), dtype=dtype)
+        self._scratch = np.empty(shape, dtype=dtype)  # sink for frames that will be dropped
+        self.stats = CaptureStats()
+
+        self._cond = threading.Condition()
+        self._write_seq = 0  # sequence number of the next frame to be written
+        self._read_seq = 0   # sequence number of the next frame the consumer has not seen
+        self._closed = False
+
+    def acquire(self):
+        """Producer: buffer to capture the next frame into (the slot is not visible until publish())."""
+        with self._cond:
+            full = self._write_seq - self._read_seq >= self.capacity
+        if self.policy == DROP_NEWEST and full:
+            return self._scratch
+        return self.frames[self._write_seq % self.capacity]
+
+    def publish(self, buffer):
+        """Producer: make the frame written into buffer available to consumers."""
+        with self._cond:
+            self.stats.captured += 1
+            if buffer is self._scratch:
+                self.stats.dropped += 1
+                return
+            self._write_seq += 1
+            if self._write_seq - self._read_seq > self.capacity:
+                # DROP_OLDEST: the unread frame in this slot was just overwritten
+                self._read_seq = self._write_seq - self.capacity
+                self.stats.dropped += 1
+            self._cond.notify_all()
+
+    def get(self, out, timeout: float | None = None) -> int | None:
+        """
+        Consumer: copy the next frame (per policy) into out and return its
+        sequence number; None on timeout or after close().
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._write_seq > self._read_seq or self._closed, timeout):
+                return None
+            if self._write_seq == self._read_seq:
+                return None  # closed
+
+            if self.policy == DROP_OLDEST:
+                seq = self._write_seq - 1
+                self.stats.dropped += seq - self._read_seq
+            else:
+                seq = self._read_seq
+            # Copy under the lock: the producer can only be writing the slot after `seq`
+            np.copyto(out, self.frames[seq % self.capacity])
+            self._read_seq = seq + 1
+            self.stats.processed += 1
+            return seq
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+class SyntheticSource:
+    """ Frame source for tests: a bright square moving over a dark background. """
+
+    def __init__(self, shape=(240, 320, 3), fps: float | None = None, square: int = 40):
+        self.shape = shape
+        self.interval = 1.0 / fps if fps else 0.0
+        self.square = square
+        self.count = 0
+
+    def read_into(self, buffer) -> bool:
+        if self.interval:
+            time.sleep(self.interval)
+        height, width = self.shape[:2]
+        x = (self.count * 4) % max(1, width - self.square)
+        y = (self.count * 2) % max(1, height - self.square)
+        buffer.fill(16)
+        buffer[y:y + self.square, x:x + self.square] = 240
+        self.count += 1
+        return True
+
+    def close(self):
+        pass
+
+
+class OpenCVSource:
+    """ Real webcam through OpenCV; VideoCapture.read() fills the given buffer in place. """
+
+    def __init__(self, index: int = 0, shape=(480, 640, 3)):
+        import cv2  # optional dependency, only needed with a real camera
+
+        self.shape = shape
+        self._cap = cv2.VideoCapture(index)
+        self._cap.set(cv2.CAP_PROP_FRAME_HEIGHT, shape[0])
+        self._cap.set(cv2.CAP_PROP_FRAME_WIDTH, shape[1])
+
+    def read_into(self, buffer) -> bool:
+        ok, frame = self._cap.read(buffer)
+        if ok and frame is not buffer:
+            np.copyto(buffer, frame)  # driver ignored our buffer (e.g. size mismatch)
+        return ok
+
+    def close(self):
+        self._cap.release()
+
+
+class FrameGrabber:
+    """ Dedicated capture thread filling a FrameRing from a source. """
+
+    def __init__(self, source, ring: FrameRing):
+        self.source = source
+        self.ring = ring
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        try:
+            while not self._stop.is_set():
+                buffer = self.ring.acquire()
+                if not self.source.read_into(buffer):
+                    break
+                self.ring.publish(buffer)
+        finally:
+            self.ring.close()
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="lockam-capture", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.source.close()
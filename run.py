@@ -3,26 +3,119 @@
 # Copyright (c) 2025 Muhammad Sanni
 # All rights reserved. See LICENSE for details.
 
-from lockam import create_app
-from gui import setup_wizard
-from lockam.core.install_marker import is_fresh_install
+# Keep module-level imports light: PyQt5 and requests are only loaded
+# on the code path that actually shows the setup wizard.
+import time
 
-def main():
-    app = create_app()
+STARTED = time.perf_counter()  # taken before any lockam module is imported
+
+import argparse
+import atexit
+import os
+from lockam.core.startup import StartupReport  # no core modules behind this import
+
+startup = StartupReport(started=STARTED)
+
+
+def env_flag(name: str) -> bool:
+    """ True for LOCKAM_X=1/true/yes/on; unset, empty, 0/false/no/off mean off. """
+    return os.getenv(name, "").strip().lower() not in ("", "0", "false", "no", "off")
+
+
+def boot():
+    """ Load the core and build the app context; no GUI, no disk I/O. """
+    # Import the core explicitly so the report shows where start-up time goes
+    startup.timed_import("lockam.core.user_manager")
+    startup.timed_import("lockam.core.outbox")
+    lockam = startup.timed_import("lockam")
+    app = lockam.create_app()
+    startup.checkpoint("create_app")
+    return app
+
+
+def enable_metrics(path):
+    """ Turn metrics on and dump them to path when the process exits. """
+    from lockam.core import metrics
+
+    metrics.REGISTRY.enable()
+    if path.endswith(".prom"):
+        atexit.register(metrics.REGISTRY.write_prometheus, path)
+    else:
+        atexit.register(metrics.REGISTRY.write_json, path)
+
+
+def start_profiling():
+    """ Start a profiling session; its files are finalised when the process exits. """
+    from lockam.core.profiling import Profiler
+
+    profiler = Profiler().start()
+    atexit.register(profiler.close)
+    print(f"Profiling to: {profiler.run_dir}")
+    return profiler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Lockam - PC Intrusion Detection & Auto-Lock")
+    parser.add_argument("--startup-report", action="store_true",
+                        default=env_flag("LOCKAM_STARTUP_REPORT"),
+                        help="print import and time-to-ready timings")
+    parser.add_argument("--profile", action="store_true",
+                        default=env_flag("LOCKAM_PROFILE"),
+                        help="write cProfile/tracemalloc data to lockam/storage/profiles")
+    parser.add_argument("--daemon", action="store_true",
+                        help="run headless in the background (no Qt); stop with Ctrl+C or SIGTERM")
+    parser.add_argument("--metrics", metavar="FILE", default=os.getenv("LOCKAM_METRICS_FILE"),
+                        help="enable metrics and write them on exit (.prom = Prometheus text, else JSON)")
+    args = parser.parse_args(argv)
+    if args.metrics:
+        enable_metrics(args.metrics)
+    # Before boot(): the core modules are imported there, inside the profile
+    profiler = start_profiling() if args.profile else None
+
+    app = boot()
     um = app["user_manager"]
+    if profiler:
+        profiler.snapshot("create_app")
+        profiler.instrument_user_manager(um)
 
     print("Lockam started successfully!")
     print(f"Using database at: {app['db_path']}\n")
 
+    if args.daemon:
+        daemon = startup.timed_import("lockam.core.daemon")
+        startup.checkpoint("ready")
+        if profiler:
+            profiler.stop_startup()
+        if args.startup_report:
+            print(startup.format())
+        return daemon.run_daemon(app)
+
+    # Deliver whatever earlier (offline) runs left in the outbox, off the main thread
+    from lockam.core.outbox import OutboxSender
+
+    sender = OutboxSender(app["outbox"])
+    sender.start()
+
+    install_marker = startup.timed_import("lockam.core.install_marker")
 
     # Only show Setup Wizard if fresh install
-    if is_fresh_install():
-        setup_wizard.run_setup_wizard(um)
+    if install_marker.is_fresh_install():
+        setup_wizard = startup.timed_import("gui.setup_wizard")
+        startup.checkpoint("ready")
+        if profiler:
+            profiler.stop_startup()
+        if args.startup_report:
+            print(startup.format())
+        setup_wizard.run_setup_wizard(um, app["outbox"], sender)
     else:
+        startup.checkpoint("ready")
+        if profiler:
+            profiler.stop_startup()
+        if args.startup_report:
+            print(startup.format())
         print("Lockam is already installed. Launching main app...")
         # TODO: Replace this with main dashboard/lock screen later
 
 
 if __name__ == "__main__":
-    main()
-
+    raise SystemExit(main())
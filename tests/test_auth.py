@@ -0,0 +1,69 @@
+# Lockam - Unit Tests for auth.py
+# tests/test_auth.py
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+import asyncio
+import threading
+from concurrent.futures import CancelledError
+
+import pytest
+from lockam.core.auth import PasswordVerifier
+from lockam.core.user_manager import UserManager
+
+
+@pytest.fixture
+def user_manager(tmp_path):
+    um = UserManager(tmp_path / "local.db")
+    um.save_user("admin", "mypassword")
+    yield um
+    um.close()
+
+
+def test_authenticate_future(user_manager):
+    """Future variant should resolve to the same answer as authenticate()."""
+    assert user_manager.authenticate_future("mypassword").result(timeout=5) is True
+    assert user_manager.authenticate_future("wrong").result(timeout=5) is False
+
+
+def test_authenticate_async(user_manager):
+    """Coroutine variant should be awaitable from an asyncio loop."""
+    assert asyncio.run(user_manager.authenticate_async("mypassword")) is True
+
+
+def test_superseded_attempt_is_cancelled():
+    """A newer attempt on the same channel cancels the older one, even mid-hash."""
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow_check(password):
+        calls.append(password)
+        started.set()
+        release.wait(5)
+        return password == "right"
+
+    verifier = PasswordVerifier(slow_check, max_workers=1)
+    first = verifier.submit("typo")
+    started.wait(5)
+    queued = verifier.submit("typo2")
+    latest = verifier.submit("right")
+
+    assert first.cancelled() and queued.cancelled()
+    release.set()
+    assert latest.result(timeout=5) is True
+    with pytest.raises(CancelledError):
+        first.result()
+
+    # The queued attempt was dropped before it reached the hash
+    assert calls == ["typo", "right"]
+    verifier.shutdown()
+
+
+def test_channels_are_independent():
+    """Attempts on different channels should not cancel each other."""
+    verifier = PasswordVerifier(lambda p: p == "ok")
+    a = verifier.submit("ok", channel="lockscreen")
+    b = verifier.submit("no", channel="wizard")
+    assert a.result(timeout=5) is True
+    assert b.result(timeout=5) is False
+    verifier.shutdown()
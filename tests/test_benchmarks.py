@@ -0,0 +1,40 @@
+# Lockam - Unit Tests for the benchmark harness (benchmarks/)
+# tests/test_benchmarks.py
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+import json
+
+from benchmarks import harness, suite
+
+
+def _report(**medians):
+    return {"results": {name: {"median_s": s} for name, s in medians.items()}}
+
+
+def test_compare_flags_regressions_against_baseline():
+    baseline = _report(a=1.0, b=1.0, c=1.0, gone=1.0)
+    current = _report(a=1.10, b=1.30, c=0.5, new=2.0)
+    rows = {row["name"]: row for row in harness.compare(current, baseline, threshold=0.15)}
+
+    assert rows["a"]["status"] == "ok"
+    assert rows["b"]["status"] == "regression" and rows["b"]["ratio"] == 1.3
+    assert rows["c"]["status"] == "improvement"
+    assert rows["new"]["status"] == "new"
+    assert rows["gone"]["status"] == "missing"
+
+
+def test_suite_writes_json_and_fails_on_regression(tmp_path, capsys):
+    out, baseline = tmp_path / "out.json", tmp_path / "baseline.json"
+    args = ["-k", "countries.search", "--quick", "--repeat", "1"]
+    assert suite.main(args + ["--json", str(out)]) == 0
+    report = json.loads(out.read_text())
+    assert set(report["results"]) == {"countries.search_countries"}
+    assert report["results"]["countries.search_countries"]["ops_per_sec"] > 0
+
+    # A baseline 1000x faster than reality must be reported as a regression
+    for result in report["results"].values():
+        result["median_s"] /= 1000
+    baseline.write_text(json.dumps(report))
+    assert suite.main(args + ["--compare", str(baseline)]) == 1
+    assert "REGRESSION" in capsys.readouterr().out
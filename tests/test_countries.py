@@ -0,0 +1,39 @@
+# Lockam - Unit Tests for countries.py
+# tests/test_countries.py
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+from lockam.core.countries import (
+    COUNTRIES,
+    get_country_code,
+    get_country_list,
+    get_country_name,
+    search_countries,
+)
+
+
+def test_country_list_is_cached_and_complete():
+    names = get_country_list()
+    assert names is get_country_list()
+    assert names[0] == "Select Country"
+    assert len(names) == len(COUNTRIES)
+
+
+def test_code_lookup():
+    assert get_country_code("Nigeria") == "NG"
+    assert get_country_code("nigeria") == "NG"
+    assert get_country_code("  SAO TOME AND PRINCIPE ") == "ST"
+    assert get_country_code("Atlantis") is None
+
+
+def test_reverse_lookup():
+    assert get_country_name("GB") == "United Kingdom"
+    assert get_country_name("gb") == "United Kingdom"
+    assert get_country_name("XX") is None
+
+
+def test_prefix_search():
+    assert search_countries("Ni") == ["Nicaragua", "Niger", "Nigeria"]
+    assert search_countries("sao") == ["São Tomé and Príncipe"]
+    assert search_countries("United", limit=2) == ["United Arab Emirates", "United Kingdom"]
+    assert search_countries("zz") == []
@@ -0,0 +1,245 @@
+# Lockam - Unit Tests for daemon.py
+# tests/test_daemon.py
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from lockam.core.daemon import CameraDetector, LockamDaemon, read_heartbeat
+from lockam.core.outbox import Outbox
+from lockam.core.scheduler import LOCKED, SamplingScheduler
+from lockam.core.user_manager import UserManager
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+class FakeDetector:
+    """
+    Reports an intruder on frame `intruder_at` (and every later frame if
+    `stays`); optionally raises once on frame `crash_at`.
+    """
+
+    def __init__(self, intruder_at=3, crash_at=None, stays=False):
+        self.intruder_at = intruder_at
+        self.crash_at = crash_at
+        self.stays = stays
+        self.calls = 0
+        self.closed = False
+
+    def analyse(self):
+        self.calls += 1
+        if self.calls == self.crash_at:
+            raise RuntimeError("camera unplugged")
+        if self.calls == self.intruder_at or (self.stays and self.calls > self.intruder_at):
+            return {"frame": None, "score": 0.1, "source": "test"}
+        return None
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def app(tmp_path):
+    um = UserManager(tmp_path / "lockam.db")
+    yield {"db_path": tmp_path / "lockam.db", "user_manager": um, "outbox": Outbox(um.db)}
+    um.close()
+
+
+def _daemon(app, tmp_path, detector, locks, session_state=lambda: None):
+    return LockamDaemon(
+        app,
+        detector=detector,
+        lock=lambda: locks.append(time.monotonic()) or True,
+        sync=False,
+        scheduler=SamplingScheduler(full_interval=0.005, active_interval=0.005),
+        heartbeat_path=tmp_path / "daemon.heartbeat",
+        heartbeat_interval=0.02,
+        session_state=session_state,
+    )
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return predicate()
+
+
+def test_detection_locks_and_journals(app, tmp_path):
+    locks, detector = [], FakeDetector()
+    app["user_manager"].sessions.issue("admin")
+    daemon = _daemon(app, tmp_path, detector, locks)
+    daemon.start()
+    assert _wait_for(lambda: locks and daemon.heartbeat_path.exists())
+
+    beat = read_heartbeat(daemon.heartbeat_path)
+    assert beat["pid"] == os.getpid() and beat["loop_healthy"]
+    assert app["user_manager"].sessions.active_count() == 0
+    daemon.stop()
+
+    assert detector.closed and daemon.detections == 1
+    assert not daemon.heartbeat_path.exists()
+    kinds = [e["kind"] for e in reversed(daemon.journal.recent())]
+    assert kinds[0] == "daemon.started" and kinds[-1] == "daemon.stopped"
+    assert "intruder.detected" in kinds
+    daemon.stop()  # second stop is harmless
+
+
+def test_one_lock_per_intrusion_until_unlocked(app, tmp_path):
+    locks, session = [], {"locked": None}
+    daemon = _daemon(app, tmp_path, FakeDetector(intruder_at=1, stays=True), locks, lambda: session["locked"])
+    daemon.start()
+    assert _wait_for(lambda: daemon.suppressed >= 20)
+    assert len(locks) == 1 and daemon.scheduler.state() == LOCKED
+
+    session["locked"] = True   # the OS confirms the lock...
+    assert _wait_for(lambda: daemon._seen_locked)
+    session["locked"] = False  # ...then the owner unlocks: re-armed, so the intruder still in view locks again
+    assert _wait_for(lambda: len(locks) == 2)
+    daemon.stop()
+    assert "daemon.unlocked" in [e["kind"] for e in daemon.journal.recent()]
+
+
+def test_failed_lock_is_journaled_and_retried(app, tmp_path):
+    daemon = LockamDaemon(
+        app,
+        detector=FakeDetector(intruder_at=1, stays=True),
+        lock=lambda: False,  # neither loginctl nor xdg-screensaver worked
+        sync=False,
+        scheduler=SamplingScheduler(full_interval=0.005, active_interval=0.005),
+        heartbeat_path=tmp_path / "daemon.heartbeat",
+        heartbeat_interval=0.02,
+        session_state=lambda: None,
+    )
+    daemon.start()
+    assert _wait_for(lambda: daemon.lock_failures >= 3)
+    assert _wait_for(lambda: (read_heartbeat(daemon.heartbeat_path) or {}).get("lock_failures", 0) >= 3)
+    daemon.stop()
+    assert daemon.locked_at is None and daemon.suppressed == 0
+    assert daemon.scheduler.state() != LOCKED
+    assert "daemon.lock_failed" in [e["kind"] for e in daemon.journal.recent(1000)]
+
+
+def test_unknown_session_state_rearms_after_timeout(app, tmp_path):
+    locks = []
+    daemon = _daemon(app, tmp_path, FakeDetector(intruder_at=1, stays=True), locks)
+    daemon.relock_after = 0.1
+    daemon.start()
+    assert _wait_for(lambda: len(locks) >= 2)
+    daemon.stop()
+    assert daemon.suppressed > 0
+
+
+def test_camera_detector_skips_frames_without_enrolled_owner():
+    pytest.importorskip("numpy")  # CameraDetector allocates its frame buffer with numpy
+
+    class Source:
+        shape = (4, 4, 3)
+        reads = 0
+
+        def read_into(self, buffer):
+            self.reads += 1
+            return True
+
+    def fail(*args):
+        raise AssertionError("no face work without an enrolled owner")
+
+    store = type("EmptyStore", (), {"__len__": lambda self: 0, "match": fail})()
+    source = Source()
+    assert CameraDetector(source, fail, fail, store).analyse() is None
+    assert source.reads == 0
+
+
+def test_lock_latency_is_measured_from_frame_capture(app, tmp_path):
+    class SlowDetector(FakeDetector):
+        def analyse(self):
+            payload = super().analyse()
+            if payload is not None:
+                now = time.perf_counter_ns()
+                payload["captured_ns"] = now - 50_000_000  # read 50 ms ago, then detected and embedded
+                payload["stages"] = {"detected": now - 30_000_000, "embedded": now - 10_000_000}
+            return payload
+
+    locks = []
+    daemon = _daemon(app, tmp_path, SlowDetector(intruder_at=1), locks)
+    daemon.start()
+    assert _wait_for(lambda: locks)
+    daemon.stop()
+    report = daemon.bus.latency_report()
+    assert 18 <= report["intruder.detected:detected"]["p50_ms"] < 23
+    assert 38 <= report["intruder.detected:embedded"]["p50_ms"] < 43
+    assert report["intruder.detected:lock"]["p50_ms"] >= 50
+
+
+def test_camera_detector_reports_capture_and_stage_times():
+    np = pytest.importorskip("numpy")
+
+    class Source:
+        shape = (4, 4, 3)
+
+        def read_into(self, buffer):
+            return True
+
+    class Store:
+        def __len__(self):
+            return 1
+
+        def match(self, embedding):
+            return None, 0.2  # unknown face
+
+    detector = CameraDetector(Source(), lambda frames: np.zeros((1, 4)), lambda frames, boxes: np.zeros((1, 8)), Store())
+    payload = detector.analyse()
+    stages = payload["stages"]
+    assert payload["captured_ns"] <= stages["detected"] <= stages["embedded"] <= time.perf_counter_ns()
+
+
+def test_watchdog_restarts_crashed_loop(app, tmp_path):
+    locks, detector = [], FakeDetector(intruder_at=10, crash_at=2)
+    daemon = _daemon(app, tmp_path, detector, locks)
+    daemon.start()
+    assert _wait_for(lambda: locks)
+    daemon.stop()
+    assert daemon.loop_restarts == 1 and detector.calls >= 10
+    kinds = [e["kind"] for e in daemon.journal.recent()]
+    assert "daemon.loop_crashed" in kinds and "daemon.loop_restarted" in kinds
+
+
+def test_runs_without_detector_and_stops_on_signal(app, tmp_path):
+    daemon = _daemon(app, tmp_path, None, [])
+    previous = signal.getsignal(signal.SIGTERM)
+    try:
+        daemon.install_signal_handlers()
+        threading.Timer(0.1, os.kill, (os.getpid(), signal.SIGTERM)).start()
+        start = time.monotonic()
+        daemon.run_forever(duration=5)
+        assert time.monotonic() - start < 4
+    finally:
+        signal.signal(signal.SIGTERM, previous)
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+    assert daemon.frames == 0 and daemon.started_at is None
+
+
+def test_stale_heartbeat_is_ignored(tmp_path):
+    path = tmp_path / "hb"
+    assert read_heartbeat(path) is None
+    path.write_text(json.dumps({"ts": time.time() - 600}))
+    assert read_heartbeat(path) is None
+    path.write_text(json.dumps({"ts": time.time()}))
+    assert read_heartbeat(path) is not None
+
+
+def test_daemon_does_not_load_qt():
+    probe = (
+        "import sys, lockam.core.daemon; "
+        "print([m for m in ('PyQt5', 'gui.setup_wizard', 'requests', 'numpy') if m in sys.modules])"
+    )
+    out = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
@@ -0,0 +1,55 @@
+# Lockam - Unit Tests for device_info.py
+# tests/test_device_info.py
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+import threading
+import time
+
+from lockam.core.device_info import PROBES, DeviceFingerprint, run_probes
+
+
+def test_slow_probe_is_cut_off():
+    release = threading.Event()
+    probes = {"fast": lambda: "ok", "hung": lambda: release.wait(10), "broken": lambda: 1 / 0}
+
+    start = time.monotonic()
+    result = run_probes(probes, timeout=0.2)
+    release.set()
+
+    assert time.monotonic() - start < 1.0
+    assert result == {"fast": "ok", "hung": None, "broken": None}
+
+
+def test_install_id_is_stable(tmp_path):
+    cache = tmp_path / "device.json"
+    first = DeviceFingerprint(cache).get()
+    second = DeviceFingerprint(cache).get()
+    assert first["uuid"] == second["uuid"]
+    assert set(PROBES) <= set(first)
+
+
+def test_cached_read_skips_probes_and_refreshes_volatile_fields(tmp_path):
+    cache = tmp_path / "device.json"
+    calls = []
+    values = {"hostname": "box", "ip_address": "10.0.0.1"}
+
+    def probe(name):
+        def run():
+            calls.append(name)
+            return values[name]
+        return run
+
+    probes = {name: probe(name) for name in values}
+    DeviceFingerprint(cache, probes=probes).get()
+    assert sorted(calls) == ["hostname", "ip_address"]
+
+    calls.clear()
+    values["ip_address"] = "10.0.0.2"
+    fingerprint = DeviceFingerprint(cache, probes=probes)
+    assert fingerprint.get()["ip_address"] == "10.0.0.1"  # served from cache
+    fingerprint.refresh_async().join(5)
+
+    assert calls == ["ip_address"]
+    assert fingerprint.get()["ip_address"] == "10.0.0.2"
+    assert DeviceFingerprint(cache, probes=probes).get()["ip_address"] == "10.0.0.2"
@@ -0,0 +1,140 @@
+# Lockam - Unit Tests for enrollment.py
+# tests/test_enrollment.py
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+import sys
+import threading
+import types
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from lockam.core.enrollment import (
+    EnrollmentCancelled, EnrollmentPipeline, NpyVideoSource, face_recognition_models, quality_scores
+)
+from lockam.core.face_store import FaceTemplateStore
+
+SHAPE = (48, 64, 3)
+
+
+def _sharp(rng):
+    return rng.integers(60, 200, size=SHAPE, dtype=np.uint8)
+
+
+def _clip(path, n=20):
+    """Every 4th frame is sharp and well exposed; the rest are flat or too dark."""
+    rng = np.random.default_rng(1)
+    frames = np.empty((n, *SHAPE), np.uint8)
+    for i in range(n):
+        if i % 4 == 0:
+            frames[i] = _sharp(rng)
+        elif i % 4 == 1:
+            frames[i] = _sharp(rng) // 8  # underexposed
+        else:
+            frames[i] = 128                # no detail (blurred)
+    np.save(path, frames)
+    return frames
+
+
+def _embedder(calls):
+    def embed(frames, boxes):
+        calls.append(len(frames))
+        return np.ones((len(frames), 8), np.float32) + frames.mean(axis=(1, 2, 3))[:, None] / 1000
+    return embed
+
+
+def test_quality_prefers_sharp_well_exposed_frames():
+    rng = np.random.default_rng(0)
+    batch = np.stack([_sharp(rng), _sharp(rng) // 8, np.full(SHAPE, 128, np.uint8)])
+    scores = quality_scores(batch)
+    assert scores[0] > scores[1] and scores[0] > scores[2]
+
+    boxes = np.array([[0, 0, 4, 4], [0, 0, 30, 30], [np.nan] * 4], np.float32)
+    sized = quality_scores(np.stack([batch[0]] * 3), boxes)
+    assert sized[1] > sized[0] > sized[2] == 0
+
+
+def test_quality_uses_bgr_luma():
+    rng = np.random.default_rng(0)
+    texture = rng.integers(0, 2, size=SHAPE[:2], dtype=np.uint8) * 255
+    blue, red = np.zeros((2, *SHAPE), np.uint8)
+    blue[..., 0] = texture  # channel 0 is blue in a BGR frame
+    red[..., 2] = texture
+    scores = quality_scores(np.stack([blue, red]))
+    assert scores[1] > scores[0]  # red carries more luma than blue
+
+
+def test_models_receive_rgb_frames(monkeypatch):
+    seen = []
+    fake = types.SimpleNamespace(
+        face_locations=lambda image: seen.append(image) or [(0, 10, 10, 0)],
+        face_encodings=lambda image, known_face_locations: seen.append(image) or [np.zeros(128)],
+    )
+    monkeypatch.setitem(sys.modules, "face_recognition", fake)
+    detector, embedder = face_recognition_models()
+
+    frame = np.zeros((1, *SHAPE), np.uint8)
+    frame[..., 0] = 255  # pure blue, BGR
+    embedder(frame, detector(frame))
+    for image in seen:
+        assert image.flags.c_contiguous
+        assert (image[..., 2] == 255).all() and (image[..., 0] == 0).all()
+
+
+def test_pipeline_runs_headless_from_video_file(tmp_path):
+    path = tmp_path / "clip.npy"
+    _clip(path)
+    calls, progress = [], []
+    pipeline = EnrollmentPipeline(
+        NpyVideoSource(path), _embedder(calls), frames=20, batch_size=6, best_n=5,
+        progress=lambda stage, done, total: progress.append((stage, done)),
+    )
+    template = pipeline.run()
+
+    assert calls == [5]  # best frames embedded together, once
+    assert np.linalg.norm(template) == pytest.approx(1.0)
+    assert [done for stage, done in progress if stage == "capture"] == [6, 12, 18, 20]
+    assert progress[-1][0] == "done"
+
+    store = FaceTemplateStore(tmp_path / "faces", dim=8)
+    store.add("admin", template)
+    assert store.match(template)[0] == "admin"
+
+
+def test_pipeline_rejects_unusable_footage(tmp_path):
+    path = tmp_path / "flat.npy"
+    np.save(path, np.full((10, *SHAPE), 128, np.uint8))
+    pipeline = EnrollmentPipeline(NpyVideoSource(path), _embedder([]), frames=10)
+    with pytest.raises(ValueError):
+        pipeline.run()
+
+
+def test_background_run_and_cancel(tmp_path):
+    path = tmp_path / "clip.npy"
+    _clip(path)
+    done = []
+    pipeline = EnrollmentPipeline(NpyVideoSource(path), _embedder([]), frames=20)
+    pipeline.start(done.append).join(5)
+    assert len(done) == 1
+
+    cancel = threading.Event()
+    cancel.set()
+    errors = []
+    pipeline = EnrollmentPipeline(NpyVideoSource(path), _embedder([]), frames=20)
+    pipeline.start(done.append, on_error=errors.append, cancel_event=cancel).join(5)
+    assert isinstance(errors[0], EnrollmentCancelled)
+
+
+def test_cancel_after_capture_skips_embedding(tmp_path):
+    path = tmp_path / "clip.npy"
+    _clip(path, n=8)
+    calls, cancel = [], threading.Event()
+    pipeline = EnrollmentPipeline(
+        NpyVideoSource(path), _embedder(calls), frames=8, batch_size=8,
+        progress=lambda stage, done, total: cancel.set(),  # closed while the last batch was captured
+    )
+    with pytest.raises(EnrollmentCancelled):
+        pipeline.run(cancel)
+    assert calls == []
@@ -0,0 +1,104 @@
+# Lockam - Unit Tests for event_bus.py
+# tests/test_event_bus.py
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+import threading
+import time
+
+import pytest
+from lockam.core.event_bus import (
+    CRITICAL, HIGH, INTRUDER_DETECTED, LOW, EventBus, LatencyHistogram, wire_detection
+)
+from lockam.core.session import SessionManager
+
+
+@pytest.fixture
+def bus():
+    bus = EventBus(workers=1)
+    yield bus
+    bus.close()
+
+
+def test_histogram_quantiles_are_within_bucket_error():
+    hist = LatencyHistogram()
+    for ms in range(1, 101):
+        hist.record(ms * 1_000_000)
+    summary = hist.summary()
+    assert summary["count"] == 100
+    assert summary["p50_ms"] == pytest.approx(50, rel=0.05)
+    assert summary["p99_ms"] == pytest.approx(99, rel=0.05)
+    assert summary["max_ms"] == 100
+    assert LatencyHistogram().quantile(0.5) == 0.0
+
+
+def test_slow_subscriber_does_not_delay_lock(bus):
+    release = threading.Event()
+    locked = []
+    bus.subscribe("alarm", lambda e: release.wait(5), priority=LOW, name="slow")
+    bus.subscribe("alarm", lambda e: locked.append(time.perf_counter_ns()), priority=CRITICAL, name="lock")
+
+    event = bus.publish("alarm")
+    assert locked  # ran before publish() returned
+    assert "lock" in event.stamps and "slow" not in event.stamps
+    release.set()
+    bus.flush()
+    assert event.stamps["slow"] >= event.stamps["lock"]
+
+
+def test_queued_handlers_run_by_priority(bus):
+    gate, order = threading.Event(), []
+    bus.subscribe("block", lambda e: gate.wait(5), name="blocker")
+    bus.subscribe("x", lambda e: order.append("low"), priority=LOW, name="low")
+    bus.subscribe("x", lambda e: order.append("high"), priority=HIGH, name="high")
+    bus.publish("block")
+    bus.publish("x")
+    gate.set()
+    bus.flush()
+    assert order == ["high", "low"]
+
+
+def test_failing_handler_is_counted_and_isolated(bus):
+    ran = []
+    bus.subscribe("x", lambda e: 1 / 0, priority=CRITICAL, name="boom")
+    bus.subscribe("x", lambda e: ran.append(1), priority=CRITICAL + 1, inline=True, name="after")
+    bus.publish("x")
+    assert bus.errors == 1 and ran == [1]
+
+
+def test_detection_wiring_reports_end_to_end_latency(bus):
+    sessions = SessionManager()
+    sessions.issue("admin")
+    calls = []
+
+    class Journal:
+        def record(self, kind, details=None, source=None):
+            calls.append(("journal", kind, source))
+
+    class Evidence:
+        def save(self, frame, source=None):
+            time.sleep(0.01)
+            calls.append(("evidence", frame))
+
+    wire_detection(bus, lock=lambda: calls.append(("lock",)), sessions=sessions, journal=Journal(), evidence=Evidence())
+    for _ in range(20):
+        captured = time.perf_counter_ns()
+        bus.publish(INTRUDER_DETECTED, {"frame": "img", "score": 0.2, "source": "webcam"}, origin_ns=captured)
+    bus.flush()
+
+    assert sessions.active_count() == 0
+    assert calls[0] == ("lock",)
+    assert calls.count(("journal", INTRUDER_DETECTED, "webcam")) == 20
+    report = bus.latency_report()
+    lock, evidence = report["intruder.detected:lock"], report["intruder.detected:evidence"]
+    assert lock["count"] == 20
+    assert lock["p99_ms"] < evidence["p50_ms"]
+    assert set(lock) >= {"p50_ms", "p95_ms", "p99_ms"}
+    assert "intruder.detected:evidence.queued" in report
+
+
+def test_pre_publish_stages_are_stamped_from_origin(bus):
+    origin = time.perf_counter_ns() - 20_000_000
+    event = bus.publish("frame", {}, origin_ns=origin, stages={"detected": origin + 5_000_000})
+    assert list(event.stamps)[:2] == ["detected", "published"]
+    assert 4 <= bus.latency_report()["frame:detected"]["p50_ms"] <= 6
@@ -0,0 +1,89 @@
+# Lockam - Unit Tests for event_queries.py
+# tests/test_event_queries.py
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+import pytest
+from lockam.core.db import ConnectionManager
+from lockam.core.event_queries import EventQueries
+from lockam.core.journal import DAY, HOUR, EventJournal
+
+NOW = 1_700_000_000 // DAY * DAY + 12 * HOUR + 1800  # 12:30 UTC
+
+
+@pytest.fixture
+def db(tmp_path):
+    manager = ConnectionManager(tmp_path / "lockam.db")
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def queries(db):
+    journal = EventJournal(db)
+    # Two events per hour for the last 3 days, alternating kinds; plus extra lock events today
+    for h in range(72):
+        for k in range(2):
+            journal.record("face.unknown" if k == 0 else "auth.failed", ts=NOW - h * HOUR - k)
+    for i in range(3):
+        journal.record("lock", ts=NOW - i)
+    journal.close(timeout=5)
+    return EventQueries(db, clock=lambda: NOW + 1)
+
+
+def test_keyset_pagination_walks_everything_once(queries):
+    seen, cursor = [], None
+    while True:
+        events, cursor = queries.page(limit=40, cursor=cursor)
+        seen.extend(e["id"] for e in events)
+        if cursor is None:
+            break
+    assert len(seen) == len(set(seen)) == 147
+    events, _ = queries.page(limit=5, kind="lock")
+    assert [e["kind"] for e in events] == ["lock"] * 3
+
+
+def test_rollups_match_raw_counts(queries, db):
+    assert queries.last_24h() == 24 * 2 + 3
+    assert queries.last_24h(kind="face.unknown") == 24
+    assert queries.count_between(NOW - 10 * HOUR + 5, NOW + 1) == queries._count_raw(NOW - 10 * HOUR + 5, NOW + 1, None)
+
+    per_day = queries.per_day(days=4)
+    assert [count for _, count in per_day][-1] == 2 * 13 + 3  # 00:30..12:30 today
+    assert sum(count for _, count in per_day) == 147
+
+    assert queries.per_hour(hours=2)[-1][1] == 2 + 3
+    assert queries.top_kinds(days=1)[0] == ("auth.failed", 13)
+
+
+def test_fractional_start_just_after_an_hour(db):
+    base = NOW // HOUR * HOUR
+    journal = EventJournal(db)
+    journal.record("lock", ts=base + 0.2)  # before the window, inside its first hour bucket
+    journal.record("lock", ts=base + 100)
+    journal.close(timeout=5)
+    queries = EventQueries(db, clock=lambda: NOW)
+    assert queries.count_between(base + 0.5, base + 2 * HOUR) == queries._count_raw(base + 0.5, base + 2 * HOUR, None) == 1
+
+
+def test_summary_queries_use_rollups_and_indexes(queries, db):
+    plan = db.get().execute(
+        "EXPLAIN QUERY PLAN SELECT COUNT(*) FROM events WHERE ts >= ? AND ts < ? AND kind = ?", (0, 1, "x")
+    ).fetchall()
+    assert "COVERING INDEX idx_events_kind_ts" in " ".join(str(step) for step in plan)
+
+
+def test_rollups_backfilled_for_old_journals(tmp_path):
+    import sqlite3
+
+    db_path = tmp_path / "old.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE events (id INTEGER PRIMARY KEY AUTOINCREMENT, ts REAL NOT NULL, "
+                 "kind TEXT NOT NULL, source TEXT, details TEXT)")
+    conn.executemany("INSERT INTO events (ts, kind) VALUES (?, 'lock')", [(NOW - i * HOUR,) for i in range(5)])
+    conn.commit()
+    conn.close()
+
+    db = ConnectionManager(db_path)
+    assert EventQueries(db, clock=lambda: NOW + 1).last_24h() == 5
+    db.close()
@@ -0,0 +1,133 @@
+# Lockam - Unit Tests for evidence.py
+# tests/test_evidence.py
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+import sqlite3
+import threading
+import time
+import zlib
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from lockam.core.db import ConnectionManager
+from lockam.core.evidence import EvidenceStore, dhash, thumbnail
+
+SHAPE = (120, 160, 3)
+
+
+@pytest.fixture
+def db(tmp_path):
+    manager = ConnectionManager(tmp_path / "lockam.db")
+    yield manager
+    manager.close()
+
+
+def _frame(seed):
+    # smooth random blobs so dHash sees real structure
+    small = np.random.default_rng(seed).integers(0, 256, size=(6, 8, 3), dtype=np.uint8)
+    return np.repeat(np.repeat(small, 20, axis=0), 20, axis=1)
+
+
+def _store(db, tmp_path, **kwargs):
+    return EvidenceStore(db, tmp_path / "evidence", encoder="png", **kwargs)
+
+
+def test_dhash_is_stable_under_noise():
+    frame = _frame(1)
+    noisy = np.clip(frame.astype(int) + np.random.default_rng(2).integers(-3, 4, SHAPE), 0, 255).astype(np.uint8)
+    assert bin(dhash(frame) ^ dhash(noisy)).count("1") <= 2
+    assert bin(dhash(frame) ^ dhash(_frame(3))).count("1") > 10
+    assert thumbnail(frame, 40).shape == (30, 40, 3)
+
+
+def test_frames_are_encoded_in_background_and_indexed(db, tmp_path):
+    store = _store(db, tmp_path)
+    frame = _frame(1)
+    future = store.save(frame, source="webcam", ts=100.0)
+    frame[:] = 0  # the capture buffer is reused straight away
+    record = future.result(timeout=5)
+
+    data = record.path.read_bytes()
+    assert data.startswith(b"\x89PNG") and record.thumb_path.exists()
+    assert record.path.parent.name == record.sha256[:2]
+    raw = zlib.decompress(data[data.index(b"IDAT") + 4:])
+    assert len(raw) == SHAPE[0] * (SHAPE[1] * 3 + 1)
+    assert raw[1:4] != b"\x00\x00\x00"  # saved the copy, not the zeroed buffer
+
+    [row] = store.list()
+    assert row["sha256"] == record.sha256 and row["source"] == "webcam"
+    assert row["size_bytes"] == store.total_bytes()
+    store.close()
+
+
+def test_identical_and_near_identical_frames_are_stored_once(db, tmp_path):
+    store = _store(db, tmp_path)
+    frame = _frame(1)
+    near = frame.copy()
+    near[0, 0] ^= 1
+    first = store.save(frame, ts=1.0).result(timeout=5)
+    assert store.save(frame, ts=2.0).result(timeout=5).duplicate
+    dup = store.save(near, ts=3.0).result(timeout=5)
+    assert dup.duplicate and dup.sha256 == first.sha256
+    assert not store.save(_frame(5), ts=4.0).result(timeout=5).duplicate
+
+    rows = store.list()
+    assert store.count() == 2
+    assert rows[-1]["hits"] == 3 and rows[-1]["last_seen"] == 3.0
+    store.close()
+
+
+def test_quota_evicts_oldest_first(db, tmp_path):
+    store = _store(db, tmp_path, workers=1)
+    records = [store.save(_frame(seed), ts=float(seed)).result(timeout=5) for seed in range(3)]
+    size = store.total_bytes() // 3
+    store.close()
+
+    store = _store(db, tmp_path, max_bytes=int(size * 3.5), workers=1)
+    store.save(_frame(10), ts=10.0).result(timeout=5)
+    assert store.evicted == 1
+    assert not records[0].path.exists() and not records[0].thumb_path.exists()
+    assert records[1].path.exists()
+    assert [row["created_at"] for row in store.list()] == [10.0, 2.0, 1.0]
+    assert store.total_bytes() <= store.max_bytes
+    store.close()
+
+
+def test_busy_database_does_not_block_the_index_lock(db, tmp_path):
+    store = _store(db, tmp_path, workers=1)
+    store.save(_frame(1), ts=1.0).result(timeout=5)  # tables and index loaded
+
+    writer = sqlite3.connect(tmp_path / "lockam.db", isolation_level=None, check_same_thread=False)
+    writer.execute("BEGIN IMMEDIATE")  # e.g. a bulk import holding the write lock
+    pending = store.save(_frame(2), ts=2.0)
+    time.sleep(0.2)  # the worker is now waiting in BEGIN IMMEDIATE
+
+    start = time.perf_counter()
+    assert store.total_bytes() > 0
+    assert store.save(_frame(3), ts=3.0) is not None
+    assert time.perf_counter() - start < 0.1
+
+    threading.Timer(0.1, writer.rollback).start()
+    assert not pending.result(timeout=10).duplicate
+    store.close()
+    writer.close()
+    assert store.count() == 3
+
+
+def test_backlog_is_bounded(db, tmp_path):
+    store = _store(db, tmp_path, max_pending=0)
+    assert store.save(_frame(1)) is None
+    assert store.dropped == 1
+
+
+def test_list_pages_with_cursor(db, tmp_path):
+    store = _store(db, tmp_path, workers=1)
+    for seed in range(5):
+        store.save(_frame(seed), ts=float(seed)).result(timeout=5)
+    first = store.list(limit=2)
+    second = store.list(limit=2, before=(first[-1]["created_at"], first[-1]["id"]))
+    assert [r["created_at"] for r in first + second] == [4.0, 3.0, 2.0, 1.0]
+    store.close()
@@ -0,0 +1,65 @@
+# Lockam - Unit Tests for face_store.py
+# tests/test_face_store.py
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from lockam.core.face_store import FaceTemplateStore
+
+DIM = 16
+
+
+def _vectors(n, seed=0):
+    return np.random.default_rng(seed).normal(size=(n, DIM)).astype(np.float32)
+
+
+def test_match_finds_enrolled_face(tmp_path):
+    store = FaceTemplateStore(tmp_path, dim=DIM, initial_capacity=2)
+    vectors = _vectors(5)
+    for i, vector in enumerate(vectors):
+        store.add(f"user{i}", vector, {"username": f"user{i}"})
+
+    assert store.capacity == 8  # grew by doubling
+    noisy = vectors[3] + 0.05 * _vectors(1, seed=9)[0]
+    assert store.match(noisy)[0] == "user3"
+    assert store.match(-vectors[3])[0] is None
+
+
+def test_store_reopens_from_memory_map(tmp_path):
+    store = FaceTemplateStore(tmp_path, dim=DIM)
+    vectors = _vectors(3)
+    for i, vector in enumerate(vectors):
+        store.add(f"user{i}", vector)
+
+    reopened = FaceTemplateStore(tmp_path, dim=DIM)
+    assert isinstance(reopened._matrix, np.memmap)
+    assert reopened.ids == ["user0", "user1", "user2"]
+    assert reopened.match(vectors[1]) == ("user1", pytest.approx(1.0))
+
+
+def test_remove_and_replace(tmp_path):
+    store = FaceTemplateStore(tmp_path, dim=DIM)
+    vectors = _vectors(3)
+    for i, vector in enumerate(vectors):
+        store.add(f"user{i}", vector)
+
+    assert store.remove("user0") is True
+    assert store.remove("user0") is False
+    assert len(store) == 2
+    assert store.match(vectors[2])[0] == "user2"
+
+    store.add("user1", vectors[0])  # re-enroll with a new template
+    assert store.match(vectors[0])[0] == "user1"
+    assert len(store) == 2
+
+
+def test_dimension_mismatch(tmp_path):
+    store = FaceTemplateStore(tmp_path, dim=DIM)
+    with pytest.raises(ValueError):
+        store.add("bad", np.ones(DIM + 1))
+    store.add("ok", np.ones(DIM))
+    with pytest.raises(ValueError):
+        FaceTemplateStore(tmp_path, dim=DIM * 2)
@@ -0,0 +1,103 @@
+# Lockam - Unit Tests for journal.py
+# tests/test_journal.py
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+import threading
+import time
+
+import pytest
+from lockam.core.db import ConnectionManager
+from lockam.core.journal import EventJournal
+
+
+@pytest.fixture
+def db(tmp_path):
+    manager = ConnectionManager(tmp_path / "lockam.db")
+    yield manager
+    manager.close()
+
+
+def test_events_from_many_threads_are_written(db):
+    journal = EventJournal(db)
+    threads = [
+        threading.Thread(target=lambda n=n: [journal.record("auth.failed", {"n": i}, source=f"t{n}") for i in range(500)])
+        for n in range(4)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert journal.flush(timeout=5)
+
+    count = db.get().execute("SELECT COUNT(*) FROM events").fetchone()[0]
+    assert count == 2000
+    assert journal.batches_written < 2000  # grouped, not one commit per event
+    journal.close()
+
+
+def test_flush_latency_is_bounded(db):
+    journal = EventJournal(db, flush_interval=0.05)
+    journal.record("face.unknown", {"score": 0.3})
+    deadline = time.monotonic() + 2
+    while journal.events_written == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert journal.events_written == 1
+    assert journal.recent(1)[0]["details"] == {"score": 0.3}
+    journal.close()
+
+
+def test_close_commits_pending_events(db):
+    journal = EventJournal(db, flush_interval=10)
+    for i in range(10):
+        journal.record("lock", {"n": i})
+    journal.close(timeout=5)
+    assert [e["details"]["n"] for e in journal.recent()] == list(range(9, -1, -1))
+
+
+def test_record_is_cheap_for_the_caller(db):
+    journal = EventJournal(db)
+    journal.start()
+    start = time.perf_counter()
+    for i in range(5000):
+        journal.record("face.unknown", {"frame": i})
+    per_event = (time.perf_counter() - start) / 5000
+    assert journal.flush(timeout=10)
+    assert per_event < 100e-6  # thousands of events/sec without touching SQLite
+    journal.close()
+
+
+def test_failed_commit_is_retried_not_dropped(db):
+    journal = EventJournal(db, retry_backoff=0.01)
+    write, failures = journal._write, [1, 1]
+
+    def flaky_write(batch):
+        if failures:
+            failures.pop()
+            raise RuntimeError("database is locked")
+        write(batch)
+
+    journal._write = flaky_write
+    for i in range(10):
+        journal.record("auth.failed", {"n": i})
+    assert journal.flush(timeout=5)
+    assert db.get().execute("SELECT COUNT(*) FROM events").fetchone()[0] == 10
+    assert journal.write_errors == 2 and journal.events_dropped == 0
+    journal.close()
+
+
+def test_flush_reports_events_that_could_not_be_written(db):
+    journal = EventJournal(db, retry_backoff=0.01, max_retries=3)
+
+    def broken_write(batch):
+        raise RuntimeError("disk I/O error")
+
+    journal._write = broken_write
+    journal.record("auth.failed")
+    assert journal.flush(timeout=5) is False
+    assert journal.write_errors == 3 and journal.events_dropped == 1
+
+    journal.record("auth.failed")
+    writer = journal._thread
+    journal.close(timeout=5)  # gives up after max_retries instead of hanging
+    assert not writer.is_alive() and journal.events_dropped == 2
@@ -0,0 +1,100 @@
+# Lockam - Unit Tests for kdf.py
+# tests/test_kdf.py
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+import binascii
+import hashlib
+
+import pytest
+from lockam.core import kdf
+from lockam.core.user_manager import UserManager
+
+
+@pytest.fixture
+def user_manager(tmp_path):
+    um = UserManager(tmp_path / "local.db")
+    yield um
+    um.close()
+
+
+def test_encoded_hash_records_algorithm_and_params():
+    encoded = kdf.hash_password("secret", "pbkdf2-sha256", {"i": 1000})
+    assert encoded.startswith("$pbkdf2-sha256$i=1000$")
+    assert kdf.verify_password("secret", encoded) is True
+    assert kdf.verify_password("Secret", encoded) is False
+
+
+def test_scrypt_roundtrip():
+    encoded = kdf.hash_password("secret", "scrypt", {"ln": 10})
+    assert encoded.startswith("$scrypt$ln=10,r=8,p=1$")
+    assert kdf.verify_password("secret", encoded) is True
+    assert kdf.verify_password("wrong", encoded) is False
+
+
+def test_needs_rehash():
+    encoded = kdf.hash_password("secret", "pbkdf2-sha256", {"i": 1000})
+    assert kdf.needs_rehash(encoded, "pbkdf2-sha256", {"i": 1000}) is False
+    assert kdf.needs_rehash(encoded, "pbkdf2-sha256", {"i": 2000}) is True
+    assert kdf.needs_rehash(encoded, "scrypt") is True
+
+
+def test_unknown_algorithm_and_bad_params():
+    with pytest.raises(ValueError):
+        kdf.hash_password("secret", "md5")
+    with pytest.raises(ValueError):
+        kdf.hash_password("secret", "pbkdf2-sha256", {"rounds": 5})
+
+
+def test_calibrate_respects_minimum():
+    params = kdf.calibrate("pbkdf2-sha256", target_ms=1)
+    assert params["i"] >= kdf.PBKDF2SHA256.minimum["i"]
+
+
+def test_rehash_on_login_when_policy_changes(user_manager):
+    """A successful login should upgrade hashes made with outdated parameters."""
+    user_manager.set_kdf_policy("pbkdf2-sha256", {"i": 1000})
+    user_manager.save_user("admin", "mypassword")
+    old_hash = user_manager._load_user()[3]
+
+    user_manager.set_kdf_policy("scrypt", {"ln": 10})
+    assert user_manager.authenticate("wrong") is False
+    assert user_manager._load_user()[3] == old_hash  # failed logins never rehash
+
+    assert user_manager.authenticate("mypassword") is True
+    new_hash = user_manager._load_user()[3]
+    assert new_hash.startswith("$scrypt$ln=10,")
+    assert user_manager.authenticate("mypassword") is True
+
+
+def test_policy_is_persisted(tmp_path):
+    db_path = tmp_path / "local.db"
+    UserManager(db_path).set_kdf_policy("scrypt", {"ln": 11})
+    assert UserManager(db_path).kdf_policy == ("scrypt", {"ln": 11, "r": 8, "p": 1})
+
+
+def test_legacy_single_user_database_is_migrated(tmp_path):
+    """Databases from before the KDF registry/multi-user schema should still log in, then be upgraded."""
+    import sqlite3
+
+    db_path = tmp_path / "local.db"
+    salt = b"0123456789abcdef"
+    digest = hashlib.pbkdf2_hmac("sha256", b"oldpass", salt, 100000)
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE local_user (id INTEGER PRIMARY KEY AUTOINCREMENT, username TEXT NOT NULL, "
+        "salt TEXT NOT NULL, password_hash TEXT NOT NULL, created_at TEXT NOT NULL)"
+    )
+    conn.execute(
+        "INSERT INTO local_user (username, salt, password_hash, created_at) VALUES (?, ?, ?, ?)",
+        ("legacy", binascii.hexlify(salt).decode(), binascii.hexlify(digest).decode(), "2025-01-01"),
+    )
+    conn.commit()
+    conn.close()
+
+    user_manager = UserManager(db_path)
+    assert user_manager.get_local_username() == "legacy"
+    assert user_manager.export_user_info()["registered_at"] == "2025-01-01"
+    assert user_manager.authenticate("wrong") is False
+    assert user_manager.authenticate("oldpass") is True
+    user_manager.close()
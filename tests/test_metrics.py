@@ -0,0 +1,106 @@
+# Lockam - Unit Tests for metrics.py
+# tests/test_metrics.py
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+import json
+
+import pytest
+from lockam.core import metrics
+from lockam.core.metrics import MetricsRegistry
+from lockam.core.user_manager import UserManager
+
+
+@pytest.fixture
+def enabled():
+    metrics.REGISTRY.reset()
+    metrics.REGISTRY.enable()
+    yield metrics.REGISTRY
+    metrics.REGISTRY.disable()
+    metrics.REGISTRY.reset()
+
+
+def _value(name, **labels):
+    for sample in metrics.REGISTRY.snapshot()["metrics"][name]["samples"]:
+        if sample["labels"] == {k: str(v) for k, v in labels.items()}:
+            return sample.get("value", sample.get("count"))
+    return None
+
+
+def test_disabled_registry_records_nothing():
+    registry = MetricsRegistry()
+    counter, hist = registry.counter("c"), registry.histogram("h")
+    counter.inc()
+    hist.observe(0.1)
+    assert counter.value == 0 and hist.count == 0
+
+    calls = []
+    wrapped = metrics.instrument("noop", registry)(lambda: calls.append(1) or "ok")
+    assert wrapped() == "ok" and calls == [1]
+    assert registry.counter("lockam_noop_calls_total").value == 0
+
+
+def test_counters_gauges_histograms():
+    registry = MetricsRegistry(enabled=True)
+    registry.counter("req_total", "Requests", path="/a").inc(2)
+    registry.counter("req_total", path="/b").inc()
+    gauge = registry.gauge("temp")
+    gauge.set(5)
+    gauge.dec()
+    registry.gauge("live").set_function(lambda: 42)
+    hist = registry.histogram("lat", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        hist.observe(value)
+    with pytest.raises(ValueError):
+        registry.gauge("req_total")
+
+    snap = registry.snapshot()["metrics"]
+    assert [s["value"] for s in snap["req_total"]["samples"]] == [2, 1]
+    assert snap["temp"]["samples"][0]["value"] == 4
+    assert snap["live"]["samples"][0]["value"] == 42
+    assert snap["lat"]["samples"][0]["buckets"] == {"0.1": 1, "1.0": 3, "+Inf": 4}
+    assert hist.quantile(0.5) == 1.0 and hist.quantile(0.99) == float("inf")
+    json.loads(registry.to_json())
+
+    text = registry.prometheus_text()
+    assert "# HELP req_total Requests\n# TYPE req_total counter\n" in text
+    assert 'req_total{path="/a"} 2\n' in text
+    assert 'lat_bucket{le="+Inf"} 4\n' in text
+    assert "lat_count 4\n" in text and "lat_sum 4.05\n" in text
+
+
+def test_write_prometheus_textfile(tmp_path):
+    registry = MetricsRegistry(enabled=True)
+    registry.counter("x_total").inc()
+    path = tmp_path / "node" / "lockam.prom"
+    registry.write_prometheus(path)
+    assert path.read_text() == "# TYPE x_total counter\nx_total 1\n"
+    assert not list(path.parent.glob("*.tmp"))
+
+
+def test_user_manager_is_instrumented(enabled, tmp_path):
+    um = UserManager(tmp_path / "lockam.db")  # connections opened while enabled count SQL
+    um.save_user("admin", "pw")
+    assert um.authenticate("pw")
+    assert not um.authenticate("wrong")
+    um.export_user_info()
+
+    assert _value("lockam_auth_attempts_total", result="success") == 1
+    assert _value("lockam_auth_attempts_total", result="failure") == 1
+    assert _value("lockam_user_manager_authenticate_calls_total") == 2
+    assert _value("lockam_user_manager_authenticate_seconds") == 2
+    assert _value("lockam_verify_password_calls_total") == 2
+    assert _value("lockam_user_manager_save_user_sql_statements_total") > 0
+    assert _value("lockam_sqlite_statements_total") >= _value("lockam_user_manager_save_user_sql_statements_total")
+    um.close()
+
+
+def test_instrument_counts_errors(enabled):
+    @metrics.instrument("test_boom")
+    def boom():
+        raise RuntimeError
+
+    with pytest.raises(RuntimeError):
+        boom()
+    assert _value("lockam_test_boom_errors_total") == 1
+    assert _value("lockam_test_boom_calls_total") == 1
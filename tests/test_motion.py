@@ -0,0 +1,57 @@
+# Lockam - Unit Tests for motion.py
+# tests/test_motion.py
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from lockam.core.motion import MotionGate, replay
+from lockam.core.webcam import SyntheticSource
+
+SHAPE = (120, 160, 3)
+
+
+def _static(n, value=60):
+    frame = np.full(SHAPE, value, np.uint8)
+    return [frame] * n
+
+
+def test_static_scene_is_skipped():
+    gate = MotionGate(SHAPE)
+    results = [gate.check(frame) for frame in _static(50)]
+    assert results[0] is True  # first frame primes the background
+    assert not any(results[1:])
+    assert gate.stats.skip_ratio == pytest.approx(49 / 50)
+
+
+def test_moving_object_passes():
+    gate = MotionGate(SHAPE)
+    gate.check(_static(1)[0])
+    source = SyntheticSource(SHAPE, square=30)
+    frame = np.empty(SHAPE, np.uint8)
+    source.read_into(frame)
+    assert gate.check(frame) is True
+    assert gate.last_changed > gate.min_changed
+
+
+def test_slow_lighting_drift_is_absorbed():
+    gate = MotionGate(SHAPE, alpha=0.2)
+    passed = [gate.check(np.full(SHAPE, 60 + i // 2, np.uint8)) for i in range(100)]
+    assert not any(passed[1:])
+
+
+def test_replay_reports_savings():
+    frames = _static(90) + [np.full(SHAPE, 200, np.uint8)] * 10
+
+    def detector(frame):
+        time.sleep(0.002)  # stand-in for face detection
+
+    report = replay(frames, MotionGate(SHAPE), detector)
+    assert report["frames"] == 100
+    assert report["skip_ratio"] > 0.8
+    assert report["cpu_saved_ratio"] > 0.5
+    assert report["gate_cost_us"] < report["detector_cost_us"]
@@ -0,0 +1,184 @@
+# Lockam - Unit Tests for outbox.py
+# tests/test_outbox.py
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from lockam.core.db import ConnectionManager
+from lockam.core.outbox import Outbox, OutboxSender
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def outbox(tmp_path, clock):
+    db = ConnectionManager(tmp_path / "local.db")
+    yield Outbox(db, max_attempts=3, base_backoff=10, clock=clock, rng=lambda: 1.0)
+    db.close()
+
+
+class RecordingTransport:
+    def __init__(self, fail_times=0):
+        self.fail_times = fail_times
+        self.batches = []
+
+    def __call__(self, body, headers):
+        if self.fail_times:
+            self.fail_times -= 1
+            raise ConnectionError("offline")
+        self.batches.append(json.loads(gzip.decompress(body))["items"])
+
+
+def test_enqueue_is_durable(tmp_path, clock):
+    db_path = tmp_path / "local.db"
+    db = ConnectionManager(db_path)
+    Outbox(db, clock=clock).enqueue("register_device", {"username": "admin"})
+    db.close()
+
+    reopened = Outbox(ConnectionManager(db_path), clock=clock)
+    assert reopened.pending_count() == 1
+    assert reopened.next_batch()[0][2:] == ("register_device", {"username": "admin"})
+
+
+def test_drains_in_batches(outbox):
+    for i in range(7):
+        outbox.enqueue("event", {"n": i})
+    transport = RecordingTransport()
+    assert OutboxSender(outbox, transport, batch_size=3).drain() == 7
+    assert [len(batch) for batch in transport.batches] == [3, 3, 1]
+    assert [item["payload"]["n"] for batch in transport.batches for item in batch] == list(range(7))
+    assert outbox.pending_count() == 0
+
+
+def test_failed_batch_backs_off_then_parks(outbox, clock):
+    outbox.enqueue("event", {"n": 1})
+    transport = RecordingTransport(fail_times=5)
+    sender = OutboxSender(outbox, transport)
+
+    assert sender.drain() == 0
+    assert sender.drain() == 0 and transport.fail_times == 4  # not due yet: no new attempt
+    clock.now += 10
+    sender.drain()
+    clock.now += 20
+    sender.drain()
+    assert outbox.pending_count() == 0 and outbox.dead_count() == 1
+
+
+def test_background_sender_wakes_on_enqueue(outbox):
+    transport = RecordingTransport()
+    sender = OutboxSender(outbox, transport, interval=60)
+    sender.start()
+    outbox.enqueue("event", {"n": 1})
+    sender.wake()
+    for _ in range(100):
+        if transport.batches:
+            break
+        threading.Event().wait(0.02)
+    sender.stop(timeout=5)
+    assert transport.batches and transport.batches[0][0]["payload"] == {"n": 1}
+
+
+def test_exactly_once_against_stand_in_server(outbox):
+    """A batch whose response is lost is resent; the server dedups by item key."""
+    pytest.importorskip("requests")
+    from lockam.core.outbox import HttpTransport
+    from lockam.core.registration import RegistrationClient
+
+    received, processed = [], {}
+    state = {"drop_next_response": True}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            assert self.headers["Content-Encoding"] == "gzip"
+            items = json.loads(gzip.decompress(body))["items"]
+            received.append(len(items))
+            for item in items:
+                processed.setdefault(item["key"], item["payload"])
+            status = 503 if state.pop("drop_next_response", False) else 200
+            self.send_response(status)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    try:
+        url = f"http://127.0.0.1:{httpd.server_port}/api/sync"
+        transport = HttpTransport(RegistrationClient(url, retries=1))
+        for i in range(5):
+            outbox.enqueue("event", {"n": i})
+
+        sender = OutboxSender(outbox, transport, batch_size=5)
+        assert sender.drain() == 0          # processed server-side, but the ack was lost
+        outbox.clock.now += 60
+        assert sender.drain() == 5          # resent and acknowledged
+        assert received == [5, 5]
+        assert sorted(p["n"] for p in processed.values()) == list(range(5))
+        assert outbox.pending_count() == 0
+        transport.close()
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def test_drain_can_be_cancelled(outbox):
+    for i in range(5):
+        outbox.enqueue("event", {"n": i})
+    cancel = threading.Event()
+
+    def transport(body, headers):
+        cancel.set()  # the user pressed Cancel while the first batch was in flight
+
+    assert OutboxSender(outbox, transport, batch_size=2).drain(cancel) == 2
+    assert outbox.pending_count() == 3
+
+
+def test_cancelled_drain_does_not_wait_for_a_busy_sender(outbox):
+    outbox.enqueue("event", {"n": 1})
+    sender = OutboxSender(outbox, RecordingTransport())
+    cancel = threading.Event()
+    cancel.set()
+    with sender._drain_lock:  # e.g. the background thread is mid-request
+        assert sender.drain(cancel) == 0
+
+
+def test_rejected_item_is_isolated_and_parked(outbox):
+    class Rejected(Exception):
+        response = type("Response", (), {"status_code": 422})()
+
+    for i in range(7):
+        outbox.enqueue("event", {"n": i}, key=f"k{i}")
+    delivered = []
+
+    def transport(body, headers):
+        items = json.loads(gzip.decompress(body))["items"]
+        if any(item["key"] == "k4" for item in items):
+            raise Rejected("422 Unprocessable Entity")
+        delivered.extend(item["payload"]["n"] for item in items)
+
+    assert OutboxSender(outbox, transport).drain() == 6
+    assert sorted(delivered) == [0, 1, 2, 3, 5, 6]
+    assert outbox.pending_count() == 0 and outbox.dead_count() == 1
+    key, attempts = outbox.db.get().execute("SELECT key, attempts FROM outbox WHERE dead = 1").fetchone()
+    assert (key, attempts) == ("k4", 1)
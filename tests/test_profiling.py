@@ -0,0 +1,70 @@
+# Lockam - Unit Tests for profiling.py
+# tests/test_profiling.py
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+import json
+import pstats
+import random
+import tracemalloc
+
+from lockam.core import profiling
+from lockam.core.profiling import Profiler, rotate
+from lockam.core.user_manager import UserManager
+
+
+def test_checkpoint_is_noop_without_profiler():
+    assert profiling.active() is None
+    profiling.checkpoint("anything")  # must not raise or start tracing
+
+
+def test_profile_run_writes_loadable_files(tmp_path):
+    profiler = Profiler(tmp_path / "profiles", sample_rate=1.0).start()
+    try:
+        assert profiling.active() is profiler
+        um = UserManager(tmp_path / "lockam.db")
+        um.save_user("admin", "pw")
+        profiler.stop_startup()
+        profiling.checkpoint("create_app")
+
+        profiler.instrument_user_manager(um)
+        assert um.authenticate("pw")
+        assert not um.authenticate("nope")
+        um.export_user_info()
+    finally:
+        profiler.close()
+    um.close()
+
+    run = profiler.run_dir
+    stats = pstats.Stats(str(run / "startup.prof"))
+    assert any(func[2] == "save_user" for func in stats.stats)
+
+    dumps = sorted(p.name for p in run.glob("*.tracemalloc"))
+    assert dumps == ["01-create_app.tracemalloc", "02-first_auth.tracemalloc"]
+    assert tracemalloc.Snapshot.load(str(run / dumps[0])).traces
+    assert "== first_auth" in (run / "memory.txt").read_text()
+
+    calls = [json.loads(line) for line in (run / "calls.jsonl").read_text().splitlines()]
+    assert [c["method"] for c in calls] == ["authenticate", "authenticate", "export_user_info"]
+    summary = json.loads((run / "summary.json").read_text())
+    assert summary["user_manager_samples"] == 3 and set(summary["checkpoints_s"]) == {"create_app", "first_auth"}
+    assert profiling.active() is None and not tracemalloc.is_tracing()
+
+
+def test_sampling_rate_limits_recorded_calls(tmp_path):
+    profiler = Profiler(tmp_path, sample_rate=0.2, rng=random.Random(1))
+    profiler.run_dir = tmp_path
+    calls = []
+    fn = profiler._wrap("get_user", lambda: calls.append(1))
+    for _ in range(500):
+        fn()
+    assert len(calls) == 500 and profiler.calls == 500
+    assert 60 < profiler.samples < 140
+    profiler.close()
+
+
+def test_rotation_keeps_newest_runs(tmp_path):
+    for name in ("20250101-000000-1", "20250102-000000-1", "20250103-000000-1"):
+        (tmp_path / name).mkdir()
+    rotate(tmp_path, keep=2)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["20250102-000000-1", "20250103-000000-1"]
@@ -0,0 +1,106 @@
+# Lockam - Unit Tests for registration.py
+# tests/test_registration.py
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+requests = pytest.importorskip("requests")
+
+from lockam.core.registration import RegistrationCancelled, RegistrationClient
+
+BODY = json.dumps({"username": "admin"}).encode("utf-8")
+
+
+class StandInServer:
+    """ Local HTTP server that answers with a scripted list of status codes. """
+
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.payloads = []
+        self.client_ports = set()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                server.payloads.append(json.loads(body))
+                server.client_ports.add(self.client_address[1])
+                status = server.statuses.pop(0) if server.statuses else 200
+                self.send_response(status)
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"{}")
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/api/register_device"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def make_server():
+    servers = []
+
+    def factory(statuses=()):
+        server = StandInServer(statuses)
+        servers.append(server)
+        return server
+
+    yield factory
+    for server in servers:
+        server.stop()
+
+
+def test_retries_transient_errors_on_one_connection(make_server):
+    server = make_server([503, 500])
+    client = RegistrationClient(server.url, retries=3, backoff=0.01)
+    messages = []
+
+    client.send(BODY, progress=lambda a, t, m: messages.append(m))
+
+    assert len(server.payloads) == 3
+    assert len(server.client_ports) == 1  # keep-alive connection reused
+    assert messages[-1] == "Contacting server (attempt 3/3)..."
+    client.close()
+
+
+def test_client_errors_are_not_retried(make_server):
+    server = make_server([400])
+    client = RegistrationClient(server.url, retries=3, backoff=0.01)
+    with pytest.raises(requests.HTTPError):
+        client.send(BODY)
+    assert len(server.payloads) == 1
+    client.close()
+
+
+def test_gives_up_after_retries(make_server):
+    server = make_server([503, 503, 503])
+    client = RegistrationClient(server.url, retries=3, backoff=0.01)
+    with pytest.raises(requests.HTTPError):
+        client.send(BODY)
+    assert len(server.payloads) == 3
+    client.close()
+
+
+def test_cancel_during_backoff(make_server):
+    server = make_server([503, 503, 503])
+    client = RegistrationClient(server.url, retries=3, backoff=30, rng=lambda: 1.0)
+    cancel = threading.Event()
+    threading.Timer(0.2, cancel.set).start()
+    with pytest.raises(RegistrationCancelled):
+        client.send(BODY, cancel_event=cancel)
+    assert len(server.payloads) == 1
+    client.close()
@@ -0,0 +1,132 @@
+# Lockam - Unit Tests for scheduler.py
+# tests/test_scheduler.py
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+import sys
+import threading
+import time
+
+import pytest
+from lockam.core.scheduler import (
+    ACTIVE, ALERT, FULL_INTERVAL, IDLE, LOCKED, ManualActivity, SamplingScheduler, SimulatedClock,
+    default_activity_source, logind_idle_source,
+)
+import lockam.core.scheduler as scheduler_module
+
+
+@pytest.fixture
+def setup():
+    clock = SimulatedClock(1000.0)
+    activity = ManualActivity(clock)
+    scheduler = SamplingScheduler([activity], clock=clock, active_interval=5.0, idle_after=10.0, ramp_seconds=60.0)
+    scheduler.set_authenticated(True)
+    activity.touch()
+    return clock, activity, scheduler
+
+
+def test_rate_follows_activity(setup):
+    clock, activity, scheduler = setup
+    assert scheduler.state() == ACTIVE and scheduler.next_interval() == 5.0
+
+    clock.advance(40)  # 30 s into the 60 s ramp
+    assert scheduler.state() == IDLE
+    assert FULL_INTERVAL < scheduler.next_interval() < 5.0
+    halfway = scheduler.next_interval()
+    assert halfway == pytest.approx((5.0 * FULL_INTERVAL) ** 0.5)
+
+    clock.advance(60)
+    assert scheduler.next_interval() == pytest.approx(FULL_INTERVAL)
+
+    activity.touch()
+    assert scheduler.state() == ACTIVE
+
+
+def test_threat_states_override_activity(setup):
+    clock, activity, scheduler = setup
+    scheduler.notify_suspicious()
+    assert scheduler.state() == ALERT and scheduler.next_interval() == FULL_INTERVAL
+    clock.advance(scheduler.alert_hold)
+    activity.touch()
+    assert scheduler.state() == ACTIVE
+
+    scheduler.set_locked(True)
+    activity.touch()
+    assert scheduler.state() == LOCKED and scheduler.next_interval() == FULL_INTERVAL
+
+
+def test_unauthenticated_user_gets_full_rate(setup):
+    clock, activity, scheduler = setup
+    scheduler.set_authenticated(False)
+    assert scheduler.state() == IDLE and scheduler.next_interval() == FULL_INTERVAL
+
+
+def test_most_recent_source_wins(setup):
+    clock, activity, scheduler = setup
+    clock.advance(100)
+    scheduler.add_source(lambda: None)
+    scheduler.add_source(lambda: clock() - 1)
+    assert scheduler.state() == ACTIVE
+
+
+def test_simulated_day_reports_time_and_savings(setup):
+    clock, activity, scheduler = setup
+    typing = [(t, activity.touch) for t in range(0, 3600, 5)]  # an hour of steady typing
+    scheduler.simulate(3600 * 2, events=typing + [(5400, scheduler.notify_suspicious)])
+    stats = scheduler.stats()
+
+    assert stats["elapsed"] == pytest.approx(7200)
+    assert sum(stats["time_in_state"].values()) == pytest.approx(7200)
+    assert stats["time_in_state"][ACTIVE] == pytest.approx(3605, abs=5)
+    assert stats["time_in_state"][ALERT] == pytest.approx(scheduler.alert_hold, abs=0.1)  # to within a frame
+    assert stats["frames_in_state"][ACTIVE] == pytest.approx(3600 / 5, abs=2)
+    assert stats["frames"] == sum(stats["frames_in_state"].values())
+    assert 0.3 < stats["savings"] < 0.6
+    assert stats["frames_per_hour"] < stats["full_rate_frames_per_hour"]
+
+
+def test_run_wakes_early_on_alert():
+    scheduler = SamplingScheduler(active_interval=30.0)
+    scheduler.set_authenticated(True)
+    scheduler.add_source(lambda: time.monotonic())  # always typing
+    frames, stop = [], threading.Event()
+    thread = threading.Thread(target=scheduler.run, args=(lambda: frames.append(1), stop))
+    thread.start()
+    scheduler.notify_suspicious()
+    deadline = time.monotonic() + 5
+    while len(frames) < 3 and time.monotonic() < deadline:
+        stop.wait(0.01)
+    stop.set()
+    thread.join(5)
+    assert len(frames) >= 3
+
+
+def test_default_activity_source_falls_back_to_active_rate(monkeypatch):
+    monkeypatch.setattr(scheduler_module, "system_idle_source", lambda clock: None)
+    monkeypatch.setattr(scheduler_module, "logind_properties", lambda *names: None)
+    clock = SimulatedClock()
+    scheduler = SamplingScheduler([default_activity_source(clock)], clock=clock)
+    scheduler.set_authenticated(True)
+    clock.advance(600)
+    # no way to observe idleness: never ramps to full rate
+    assert scheduler.state() == ACTIVE and scheduler.next_interval() == scheduler.active_interval
+    scheduler.set_locked(True)
+    assert scheduler.next_interval() == scheduler.full_interval
+
+
+def test_logind_idle_hint_drives_the_ramp(monkeypatch):
+    props = {"IdleHint": "yes", "IdleSinceHintMonotonic": str(int((time.monotonic() - 120) * 1e6))}
+    monkeypatch.setattr(sys, "platform", "linux")
+    monkeypatch.setattr(scheduler_module, "logind_properties", lambda *names: dict(props))
+    clock = SimulatedClock(1000.0)
+    source = logind_idle_source(clock, refresh=0)
+    scheduler = SamplingScheduler([source], clock=clock)
+    scheduler.set_authenticated(True)
+    assert 1000.0 - source() == pytest.approx(120, abs=1)
+    assert scheduler.state() == IDLE and scheduler.next_interval() == pytest.approx(scheduler.full_interval)
+
+    props["IdleHint"] = "no"  # the owner is back at the keyboard
+    assert scheduler.state() == ACTIVE
+
+    monkeypatch.setattr(scheduler_module, "logind_properties", lambda *names: None)
+    assert logind_idle_source(clock) is None
@@ -0,0 +1,73 @@
+# Lockam - Unit Tests for session.py
+# tests/test_session.py
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+from lockam.core.session import SessionManager
+from lockam.core.user_manager import UserManager
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_validates_until_ttl():
+    clock = FakeClock()
+    sessions = SessionManager(ttl=60, idle_timeout=30, clock=clock)
+    token = sessions.issue("admin")
+    for _ in range(2):
+        clock.now += 25
+        assert sessions.validate(token) == "admin"
+    clock.now = 61
+    assert sessions.validate(token) is None
+
+
+def test_idle_timeout():
+    clock = FakeClock()
+    sessions = SessionManager(ttl=600, idle_timeout=30, clock=clock)
+    token = sessions.issue("admin")
+    clock.now += 31
+    assert sessions.validate(token) is None
+    assert sessions.active_count() == 0
+
+
+def test_forged_or_revoked_tokens_rejected():
+    sessions = SessionManager()
+    token = sessions.issue("admin")
+    session_id = token.split(".")[0]
+    assert sessions.validate(session_id + ".deadbeef") is None
+    assert sessions.validate(SessionManager().issue("admin")) is None  # other key
+    sessions.revoke(token)
+    assert sessions.validate(token) is None
+
+    for garbage in ("é.abc", "abc.é", "\udcff.x"):
+        assert sessions.validate(garbage) is None
+        sessions.revoke(garbage)
+
+
+def test_expired_sessions_are_pruned_on_issue():
+    clock = FakeClock()
+    sessions = SessionManager(ttl=60, idle_timeout=30, clock=clock)
+    for _ in range(5):
+        sessions.issue("admin")
+    clock.now = 31
+    sessions.issue("admin")
+    assert sessions.active_count() == 1
+
+
+def test_unlock_and_auto_lock(tmp_path):
+    um = UserManager(tmp_path / "local.db")
+    um.save_user("admin", "mypassword")
+    assert um.unlock("wrong") is None
+    assert um.check_session("é.abc") is False
+
+    token = um.unlock("mypassword")
+    assert um.check_session(token) is True
+
+    um.lock()
+    assert um.check_session(token) is False
+    um.close()
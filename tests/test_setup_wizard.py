@@ -10,6 +10,7 @@ Covers:
  - Password validation
  - Date of birth validation
  - Combined validation_inputs()
+ - Batch validation (validate_record / validate_many)
 """
 import pytest
 from datetime import date, timedelta
@@ -19,7 +20,9 @@ from lockam.core.validators import (
     validate_username,
     validate_password,
     validate_dob,
-    validate_inputs
+    validate_inputs,
+    validate_record,
+    validate_many,
 )
 
 # -------------------------------------------------
@@ -136,6 +139,12 @@ def test_validate_inputs_first_failure_fullname():
     assert not valid
     assert "full name" in msg.lower()
 
+def test_validate_inputs_stops_at_first_failure():
+    # dob is never looked at once the full name fails
+    valid, msg = validate_inputs("S!", "", "user1", "password", None)
+    assert not valid
+    assert "full name" in msg.lower()
+
 def test_validate_inputs_failure_email():
     dob = date.today().replace(year=date.today().year - 25)
 
@@ -189,10 +198,54 @@ def test_validate_inputs_failure_dob():
     assert "years" in msg.lower()
 
 
+# ----------------------------------------------------------
+# BATCH VALIDATION TESTS
+# ----------------------------------------------------------
+def _record(**overrides):
+    record = {
+        "fullname": "Valid Name",
+        "email": "sanni@example.com",
+        "username": "sanni123",
+        "password": "password",
+        "dob": date.today().replace(year=date.today().year - 25),
+    }
+    record.update(overrides)
+    return record
+
+def test_validate_record_reports_all_errors():
+    valid, errors = validate_record(_record(fullname="S!", email="bad-email", password="12"))
+    assert not valid
+    assert len(errors) == 3
+    assert "full name" in errors[0].lower()
+    assert "email" in errors[1].lower()
+    assert "password" in errors[2].lower()
 
-
-
-
-
-
-
+def test_validate_record_wrong_types_are_field_errors():
+    valid, errors = validate_record(_record(dob="1990-01-01", password=None))
+    assert not valid
+    assert errors == ["Invalid value for password.", "Invalid value for dob."]
+
+def test_validate_many_survives_bad_records():
+    records = [_record(), _record(dob="not a date"), _record()]
+    for parallel in (False, True):
+        results = list(validate_many(records, parallel=parallel, workers=2, chunk_size=1))
+        assert [ok for ok, _ in results] == [True, False, True]
+
+def test_validate_record_missing_field():
+    record = _record()
+    del record["username"]
+    valid, errors = validate_record(record)
+    assert not valid
+    assert "username" in errors[0]
+
+def test_validate_many_streams_in_order():
+    records = (_record(username="??bad??") if i % 3 == 0 else _record() for i in range(10))
+    results = list(validate_many(records))
+    assert len(results) == 10
+    assert [valid for valid, _ in results] == [i % 3 != 0 for i in range(10)]
+
+def test_validate_many_parallel_matches_serial():
+    records = [_record(username="??bad??") if i % 7 == 0 else _record() for i in range(250)]
+    serial = list(validate_many(records))
+    parallel = list(validate_many(iter(records), parallel=True, workers=2, chunk_size=40))
+    assert parallel == serial
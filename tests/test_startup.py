@@ -0,0 +1,91 @@
+# Lockam - Unit Tests for startup path (run.py, create_app, startup.py)
+# tests/test_startup.py
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from lockam.core.startup import StartupReport
+from lockam.core.user_manager import UserManager
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Cold start (fresh interpreter: import run + create_app) must stay under this
+COLD_START_BUDGET_MS = 500
+# Modules that must not be loaded before the code path that needs them
+HEAVY_MODULES = ("PyQt5", "requests", "asyncio", "gui.setup_wizard")
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import run
+run.boot()
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps({"elapsed_ms": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+""" % (HEAVY_MODULES,)
+
+
+def test_cold_start_budget():
+    """Importing run.py and building the app must be fast and must not pull in the GUI stack."""
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    probe = json.loads(result.stdout.strip().splitlines()[-1])
+    assert probe["loaded"] == []
+    assert probe["elapsed_ms"] < COLD_START_BUDGET_MS, probe
+
+
+def test_user_manager_defers_disk_access(tmp_path):
+    db_path = tmp_path / "storage" / "lockam.db"
+    um = UserManager(db_path)
+    assert not db_path.parent.exists()
+
+    assert um.is_user_registered() is False
+    assert db_path.exists()
+    um.close()
+
+
+def test_startup_report():
+    ticks = iter([0.0, 0.010, 0.025, 0.040])
+    report = StartupReport(clock=lambda: next(ticks))
+    report.timed_import("json")
+    report.checkpoint("ready")
+    data = report.as_dict()
+    assert round(data["imports_ms"]["json"]) == 15
+    assert round(data["time_to_ready_ms"]) == 40
+    assert "import json" in report.format()
+
+
+def test_report_covers_core_imports():
+    """run.py must start its clock before the core is imported, so the report can see it."""
+    probe = (
+        "import json, sys, run; "
+        "early = [m for m in ('lockam.core.user_manager', 'lockam.core.db', 'lockam.core.metrics') if m in sys.modules]; "
+        "run.boot(); "
+        "print(json.dumps({'early': early, 'report': run.startup.as_dict()}))"
+    )
+    result = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, capture_output=True, text=True, check=True)
+    data = json.loads(result.stdout.strip().splitlines()[-1])
+    assert data["early"] == []
+    report = data["report"]
+    assert report["imports_ms"]["lockam.core.user_manager"] > 0
+    assert report["checkpoints_ms"]["create_app"] >= sum(report["imports_ms"].values())
+
+
+def test_startup_report_accepts_earlier_start():
+    report = StartupReport(clock=lambda: 10.0, started=9.5)
+    report.checkpoint("ready")
+    assert report.time_to_ready == 500
+
+
+def test_env_flags(monkeypatch):
+    import run
+
+    for value, expected in (("1", True), ("yes", True), ("0", False), ("false", False), ("OFF", False), ("", False)):
+        monkeypatch.setenv("LOCKAM_PROFILE", value)
+        assert run.env_flag("LOCKAM_PROFILE") is expected
+    monkeypatch.delenv("LOCKAM_PROFILE")
+    assert run.env_flag("LOCKAM_PROFILE") is False
@@ -0,0 +1,87 @@
+# Lockam - Unit Tests for throttle.py
+# tests/test_throttle.py
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+import pytest
+from lockam.core import utils
+from lockam.core.db import ConnectionManager
+from lockam.core.throttle import AttemptLimiter
+from lockam.core.user_manager import UserManager
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def db(tmp_path):
+    manager = ConnectionManager(tmp_path / "local.db")
+    yield manager
+    manager.close()
+
+
+def test_lockout_grows_exponentially(db, clock):
+    limiter = AttemptLimiter(db, capacity=3, refill_seconds=1000, base_delay=2, clock=clock)
+    for _ in range(3):
+        assert limiter.acquire()
+        limiter.record_failure()
+
+    state = limiter.state()
+    assert state.allowed is False
+    assert state.retry_after == pytest.approx(2)
+
+    clock.now += 2
+    assert limiter.acquire() is False  # bucket is empty too; wait for a token
+    clock.now += 1000
+    assert limiter.acquire()
+    limiter.record_failure()
+    assert limiter.state().retry_after == pytest.approx(4)
+
+
+def test_success_resets_state(db, clock):
+    limiter = AttemptLimiter(db, capacity=3, clock=clock)
+    limiter.acquire()
+    limiter.record_failure()
+    limiter.acquire()
+    limiter.record_success()
+    state = limiter.state()
+    assert state.allowed and state.failures == 0 and state.tokens == 3
+
+
+def test_state_survives_restart(db, clock):
+    limiter = AttemptLimiter(db, capacity=2, base_delay=60, clock=clock)
+    for _ in range(2):
+        limiter.acquire()
+        limiter.record_failure()
+
+    restarted = AttemptLimiter(db, capacity=2, base_delay=60, clock=clock)
+    state = restarted.state()
+    assert state.allowed is False
+    assert state.failures == 2
+    assert state.retry_after == pytest.approx(60)
+
+
+def test_authenticate_skips_hash_when_throttled(tmp_path, clock, monkeypatch):
+    um = UserManager(tmp_path / "local.db")
+    um.limiter = AttemptLimiter(um.db, capacity=2, base_delay=30, clock=clock)
+    um.save_user("admin", "mypassword")
+
+    assert um.authenticate("wrong1") is False
+    assert um.authenticate("wrong2") is False
+
+    calls = []
+    monkeypatch.setattr(utils, "verify_password", lambda *a: calls.append(a) or True)
+    assert um.authenticate("mypassword") is False
+    assert calls == []
+    assert um.limiter.state().retry_after == pytest.approx(30)
+    um.close()
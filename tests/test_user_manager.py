@@ -1,4 +1,4 @@
-# Lockam - Unit Tests for single-user user_manager.py
+# Lockam - Unit Tests for user_manager.py
 # tests/test_user_manager.py
 # Copyright (c) 2025 Muhammad Sanni
 # All rights reserved. See LICENSE for details.
@@ -53,3 +53,135 @@ def test_export_user_info_json(user_manager):
 def test_authenticate_without_user(user_manager):
     """Should return False when no user exists."""
     assert user_manager.authenticate("any") is False
+
+
+def test_database_uses_wal_mode(user_manager):
+    """Connections should be persistent and in WAL journal mode."""
+    conn = user_manager._get_conn()
+    assert conn is user_manager._get_conn()
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_reads_are_cached_until_save(user_manager):
+    """Reads should be served from cache and refreshed after save_user."""
+    user_manager.save_user("carol", "pass1")
+    assert user_manager.get_local_username() == "carol"
+
+    # Bypass save_user: the cached row must still be served
+    with user_manager.db.transaction() as conn:
+        conn.execute("UPDATE users SET username = 'mallory'")
+    assert user_manager.get_local_username() == "carol"
+
+    user_manager.save_user("dave", "pass2")
+    assert user_manager.get_local_username() == "dave"
+
+
+def test_concurrent_access_from_threads(tmp_path):
+    """Several threads (and managers) sharing one file should not hit 'database is locked'."""
+    import threading
+
+    db_path = tmp_path / "shared.db"
+    writer = UserManager(db_path)
+    reader = UserManager(db_path)
+    errors = []
+
+    def work(i):
+        try:
+            for n in range(5):
+                with writer.db.transaction() as conn:
+                    conn.execute(
+                        "INSERT INTO users (username, password_hash, created_at) VALUES (?, '', '')",
+                        (f"user{i}-{n}",),
+                    )
+                reader._get_conn().execute("SELECT COUNT(*) FROM users").fetchone()
+        except Exception as e:  # pragma: no cover - failure path
+            errors.append(e)
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    count = reader._get_conn().execute("SELECT COUNT(*) FROM users").fetchone()[0]
+    assert count == 40
+    writer.close()
+    reader.close()
+
+
+def test_multiple_users_with_roles(user_manager):
+    """Additional users live alongside the owner and are looked up by username."""
+    user_manager.save_user("owner", "ownerpass")
+    assert user_manager.add_user("alice", "alicepass", role="guest") is True
+    assert user_manager.add_user("alice", "other") is False  # unique username
+
+    assert user_manager.get_user("alice")["role"] == "guest"
+    assert user_manager.authenticate_user("alice", "alicepass") is True
+    assert user_manager.authenticate_user("alice", "ownerpass") is False
+    assert user_manager.authenticate_user("nobody", "x") is False
+    assert user_manager.get_local_username() == "owner"
+
+    assert user_manager.set_role("alice", "admin") is True
+    assert user_manager.get_user("alice")["role"] == "admin"
+    assert user_manager.delete_user("owner") is False  # owner is only replaced via save_user
+    assert user_manager.delete_user("alice") is True
+    assert user_manager.get_user("alice") is None
+
+    with pytest.raises(ValueError):
+        user_manager.add_user("bob", "pass", role="root")
+
+
+def test_username_lookup_uses_index(user_manager):
+    plan = user_manager._get_conn().execute(
+        "EXPLAIN QUERY PLAN SELECT id FROM users WHERE username = ?", ("x",)
+    ).fetchall()
+    assert "idx_users_username" in " ".join(str(step) for step in plan)
+
+
+def test_bulk_import_and_streaming_export(user_manager):
+    import io
+    import json
+
+    user_manager.set_kdf_policy("pbkdf2-sha256", {"i": 1000})
+    user_manager.save_user("owner", "ownerpass")
+    records = ({"username": f"user{i}", "password": f"pw{i}", "role": "user"} for i in range(300))
+    assert user_manager.import_users(records, workers=4) == 300
+    assert user_manager.authenticate_user("user299", "pw299") is True
+
+    out = io.StringIO()
+    assert user_manager.export_users_jsonl(out) == 301
+    lines = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert lines[0]["username"] == "owner" and lines[0]["owner"] is True
+    assert lines[-1]["username"] == "user299"
+    assert "password_hash" not in lines[-1]
+
+
+def test_bulk_import_is_atomic(user_manager):
+    user_manager.add_user("taken", "pass")
+    records = [{"username": "new1", "password": "p"}, {"username": "taken", "password": "p"}]
+    with pytest.raises(Exception):
+        user_manager.import_users(records)
+    assert user_manager.get_user("new1") is None
+
+
+def test_bulk_import_does_not_hold_write_lock_while_hashing(user_manager):
+    import threading
+    import time
+
+    user_manager.set_kdf_policy("pbkdf2-sha256", {"i": 100000})
+    hashing = threading.Event()
+
+    def records():
+        for i in range(40):
+            hashing.set()
+            yield {"username": f"bulk{i}", "password": "pw"}
+
+    importer = threading.Thread(target=user_manager.import_users, args=(records(),), kwargs={"workers": 1})
+    importer.start()
+    hashing.wait(5)
+    start = time.monotonic()
+    assert user_manager.add_user("concurrent", "pw") is True  # would hit "database is locked" before
+    assert time.monotonic() - start < 0.5  # not queued behind ~1.5 s of hashing
+    importer.join()
+    assert user_manager.get_user("bulk39") is not None
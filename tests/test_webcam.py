@@ -0,0 +1,72 @@
+# Lockam - Unit Tests for webcam.py
+# tests/test_webcam.py
+# Copyright (c) 2025 Muhammad Sanni
+# All rights reserved. See LICENSE for details.
+
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from lockam.core.webcam import DROP_NEWEST, DROP_OLDEST, FrameGrabber, FrameRing, SyntheticSource
+
+SHAPE = (24, 32, 3)
+
+
+def _push(ring, value):
+    buffer = ring.acquire()
+    buffer.fill(value)
+    ring.publish(buffer)
+
+
+def test_latest_policy_skips_to_newest_frame():
+    ring = FrameRing(4, SHAPE, policy=DROP_OLDEST)
+    out = np.empty(SHAPE, np.uint8)
+    for value in range(6):
+        _push(ring, value)
+
+    assert ring.get(out, timeout=1) == 5
+    assert out[0, 0, 0] == 5
+    assert ring.stats.captured == 6 and ring.stats.processed == 1 and ring.stats.dropped == 5
+
+
+def test_fifo_policy_drops_newest_when_full():
+    ring = FrameRing(3, SHAPE, policy=DROP_NEWEST)
+    out = np.empty(SHAPE, np.uint8)
+    for value in range(5):
+        _push(ring, value)
+
+    assert [ring.get(out, timeout=1) for _ in range(3)] == [0, 1, 2]
+    assert out[0, 0, 0] == 2
+    assert ring.get(out, timeout=0.05) is None
+    assert ring.stats.dropped == 2
+
+
+def test_buffers_are_reused():
+    ring = FrameRing(3, SHAPE)
+    slots = set()
+    for value in range(9):
+        buffer = ring.acquire()
+        slots.add(buffer.__array_interface__["data"][0])
+        buffer.fill(value)
+        ring.publish(buffer)
+    assert len(slots) == 3
+
+
+def test_grabber_with_slow_consumer():
+    ring = FrameRing(4, SHAPE)
+    grabber = FrameGrabber(SyntheticSource(SHAPE, fps=500), ring)
+    grabber.start()
+    out = np.empty(SHAPE, np.uint8)
+    seqs = []
+    for _ in range(5):
+        seqs.append(ring.get(out, timeout=2))
+        time.sleep(0.02)  # "recognition" slower than the camera
+    grabber.stop(timeout=2)
+
+    assert seqs == sorted(seqs) and None not in seqs
+    stats = ring.stats
+    assert stats.processed == 5
+    assert stats.dropped > 0
+    assert stats.captured >= stats.processed + stats.dropped - ring.capacity